@@ -3,7 +3,6 @@ app.py — PFIS main application
 Personal Finance Intelligent System
 """
 
-import io
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
@@ -12,12 +11,17 @@ import pandas as pd
 from config import (
     APP_TITLE, APP_SUBTITLE, FOOTER_TEXT,
     DEFAULT_MONTHLY_BUDGET, DEFAULT_CATEGORY_BUDGETS,
-    CHART_COLORS,
+    CHART_COLORS, LEDGER_STORE_ENABLED,
+    BIG_TRANSACTION_MULTIPLIER, LARGE_TXN_BASELINE,
+)
+from utils.multi_loader       import load_statements
+from utils.ledger_store       import append_to_ledger, clear_ledger, ledger_version
+from utils.pipeline           import run_stages, flag_large
+from utils.categorizer        import default_cache
+from utils.aggregator         import (
+    monthly_category_summary, merchant_summary, monthly_cashflow,
+    build_cube, expense_cells, type_total, month_count, category_totals, DateIndex,
 )
-from utils.data_loader        import load_data
-from utils.categorizer        import apply_categorization, assign_transaction_type
-from utils.anomaly_detector   import detect_large_transactions, detect_anomalies
-from utils.aggregator         import add_time_features, monthly_category_summary, merchant_summary, monthly_cashflow
 from utils.health_score       import calculate_financial_health_score, monthly_health_trend
 from utils.forecasting        import forecast_next_months
 from utils.savings_prediction import predict_savings
@@ -164,10 +168,20 @@ with st.sidebar:
     st.caption(APP_SUBTITLE)
     st.divider()
 
-    uploaded_file = st.file_uploader(
-        "Upload Bank Statement",
+    uploaded_files = st.file_uploader(
+        "Upload Bank Statements",
         type=["csv", "xlsx", "xls", "pdf"],
+        accept_multiple_files=True,
+    )
+    keep_history = st.toggle(
+        "Keep history",
+        value=LEDGER_STORE_ENABLED,
+        help="Append uploads to a saved ledger and keep parsed statements on disk; "
+             "only new transactions are processed.",
     )
+    if keep_history and st.button("Clear saved ledger"):
+        clear_ledger()
+        st.cache_data.clear()
 
     st.divider()
 
@@ -178,12 +192,13 @@ with st.sidebar:
     )
 
     st.divider()
+    cache_note = st.empty()
     st.caption(FOOTER_TEXT)
 
 
 # ── Welcome screen ────────────────────────────────────────────────────────────
-if not uploaded_file:
-    st.markdown("## Upload a bank statement to begin")
+if not uploaded_files:
+    st.markdown("## Upload one or more bank statements to begin")
     st.markdown("""
 
 
@@ -200,23 +215,22 @@ if not uploaded_file:
 
 
 # ── Data pipeline ─────────────────────────────────────────────────────────────
-@st.cache_data(show_spinner="Analysing your statement…")
-def run_pipeline(file_bytes: bytes, file_name: str):
-    fake_file      = io.BytesIO(file_bytes)
-    fake_file.name = file_name
-
-    df = load_data(fake_file)
-    df = apply_categorization(df)
-    df = assign_transaction_type(df)
-    df, threshold = detect_large_transactions(df)
-    df = detect_anomalies(df)
-    df = add_time_features(df)
-    return df, threshold
+@st.cache_data(show_spinner="Analysing your statements…")
+def run_pipeline(files: tuple, keep_history: bool, ledger_state: tuple = ()):
+    # ledger_state only keys the cache to the saved ledger's contents
+    df = load_statements(files, use_cache=keep_history)
+    if keep_history:
+        df, threshold = flag_large(append_to_ledger(df), copy=False)
+    else:
+        df, threshold = run_stages(df)
+    return df, threshold, build_cube(df), DateIndex(df)
 
 
 try:
-    file_bytes     = uploaded_file.read()
-    df, large_threshold = run_pipeline(file_bytes, uploaded_file.name)
+    files = tuple((f.getvalue(), f.name) for f in uploaded_files)
+    df, large_threshold, cube, date_index = run_pipeline(
+        files, keep_history, ledger_version() if keep_history else (),
+    )
 except ValueError as e:
     st.error(f"**Could not parse the file.**\n\n{e}")
     st.info(
@@ -231,21 +245,27 @@ except Exception as e:
     st.error(f"Unexpected error: {e}")
     st.stop()
 
+category_cache = default_cache()
+if category_cache is not None and category_cache.hits + category_cache.misses:
+    stats = category_cache.stats()
+    cache_note.caption(f"Category cache: {stats['hits']:,} hits · {stats['misses']:,} misses "
+                       f"({stats['hit_rate']:.0%} hit rate)")
+
 if df.empty:
     st.warning("No transactions found. Check the file format and try again.")
     st.stop()
 
 
 # ── Derived aggregates (computed once, used across all pages) ──────────────────
-total_income  = df[df["transaction_type"] == "Income"]["amount"].sum()
-total_expense = df[df["transaction_type"] == "Expense"]["amount"].sum()
+total_income  = type_total(cube, "Income")
+total_expense = type_total(cube, "Expense")
 net_savings   = total_income - total_expense
 savings_ratio = net_savings / total_income if total_income else 0
 
-score, breakdown  = calculate_financial_health_score(df)
-insights          = generate_insights(df)
-cashflow          = monthly_cashflow(df)
-merchant_totals   = merchant_summary(df, top_n=10)
+score, breakdown  = calculate_financial_health_score(df, cube=cube)
+insights          = generate_insights(df, cube=cube, date_index=date_index)
+cashflow          = monthly_cashflow(df, cube=cube)
+merchant_totals   = merchant_summary(df, top_n=10, cube=cube)
 recurring_df      = detect_recurring(df)
 monthly_committed = monthly_recurring_total(recurring_df)
 
@@ -344,7 +364,7 @@ if page == "Overview":
 
     with right2:
         st.markdown("#### Health Score Trend")
-        trend = monthly_health_trend(df)
+        trend = monthly_health_trend(df, cube=cube)
         if not trend.empty:
             fig_trend = px.line(
                 trend, x="year_month", y="score", markers=True,
@@ -366,7 +386,7 @@ if page == "Overview":
 
     # ── PDF export ────────────────────────────────────────────────
     st.markdown("#### Export Report")
-    pdf = generate_pdf_report(df, score, breakdown, insights)
+    pdf = generate_pdf_report(df, score, breakdown, insights, cube=cube)
     st.download_button(
         label="Download PDF Report",
         data=pdf,
@@ -401,33 +421,35 @@ elif page == "Transactions":
             max_value=df["date"].max().date(),
         )
 
-    # Apply filters
-    filtered = df.copy()
+    # Apply filters: the date window comes from the index, the rest is one
+    # combined mask over that window
+    window = df
+    if len(date_range) == 2:
+        window = df.iloc[date_index.rows(date_range[0], date_range[1])]
+    mask = pd.Series(True, index=window.index)
     if search:
-        mask = (
-            filtered["merchant"].str.contains(search, case=False, na=False) |
-            filtered["description"].str.contains(search, case=False, na=False)
+        mask &= (
+            window["merchant"].str.contains(search, case=False, na=False) |
+            window["description"].str.contains(search, case=False, na=False)
         )
-        filtered = filtered[mask]
     if type_filter != "All":
-        filtered = filtered[filtered["transaction_type"] == type_filter]
+        mask &= window["transaction_type"] == type_filter
     if cat_filter != "All":
-        filtered = filtered[filtered["category"] == cat_filter]
-    if len(date_range) == 2:
-        start = pd.Timestamp(date_range[0])
-        end   = pd.Timestamp(date_range[1])
-        filtered = filtered[(filtered["date"] >= start) & (filtered["date"] <= end)]
+        mask &= window["category"] == cat_filter
+    filtered = window[mask]
 
     # ── Transaction table ─────────────────────────────────────────
     display_cols = [c for c in
                     ["date", "merchant", "category", "amount", "transaction_type", "is_large", "is_anomaly"]
                     if c in filtered.columns]
+    if filtered["source"].nunique() > 1:
+        display_cols.append("source")
     st.markdown(f"**{len(filtered):,} transactions**")
     st.dataframe(
         filtered[display_cols].rename(columns={
             "date": "Date", "merchant": "Merchant", "category": "Category",
             "amount": "Amount (₹)", "transaction_type": "Type",
-            "is_large": "Large?", "is_anomaly": "Anomaly?",
+            "is_large": "Large?", "is_anomaly": "Anomaly?", "source": "Statement",
         }),
         use_container_width=True,
         hide_index=True,
@@ -443,7 +465,12 @@ elif page == "Transactions":
         if large.empty:
             st.info("No large transactions detected.")
         else:
-            st.caption(f"Threshold: ₹ {large_threshold:,.0f}  (mean + 2×std of all expenses)")
+            if LARGE_TXN_BASELINE == "grouped":
+                st.caption("Large relative to the transaction's own category and merchant "
+                           "(median + k×MAD of each group)")
+            else:
+                st.caption(f"Threshold: ₹ {large_threshold:,.0f}  "
+                           f"(mean + {BIG_TRANSACTION_MULTIPLIER:g}×std of all expenses)")
             st.dataframe(
                 large[["date","merchant","category","amount"]].rename(columns={
                     "date":"Date","merchant":"Merchant",
@@ -499,7 +526,7 @@ elif page == "Categories":
 
     # ── Monthly stacked bar ────────────────────────────────────────
     st.markdown("#### Monthly Spend by Category")
-    monthly_cat = monthly_category_summary(df)
+    monthly_cat = monthly_category_summary(df, cube=cube)
 
     if not monthly_cat.empty:
         fig_stack = px.bar(
@@ -514,8 +541,7 @@ elif page == "Categories":
 
     # ── Pie + budget table ─────────────────────────────────────────
     left, right = st.columns(2)
-    cat_totals  = expense_df.groupby("category")["amount"].sum().reset_index()
-    cat_totals  = cat_totals.sort_values("amount", ascending=False)
+    cat_totals  = category_totals(cube).reset_index()
 
     with left:
         st.markdown("#### Spend Distribution")
@@ -530,7 +556,7 @@ elif page == "Categories":
 
     with right:
         st.markdown("#### Budget vs Actual")
-        months_count = df[["year","month_number"]].drop_duplicates().shape[0] or 1
+        months_count = month_count(cube) or 1
 
         budget_rows = []
         for _, row in cat_totals.iterrows():
@@ -566,7 +592,7 @@ elif page == "Categories":
     st.markdown("#### Spending by Day of Week")
     day_order = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
     day_spend = (
-        expense_df.groupby("day_of_week")["amount"].sum()
+        expense_df.groupby("day_of_week", observed=True)["amount"].sum()
         .reindex(day_order, fill_value=0)
         .reset_index()
     )
@@ -589,11 +615,11 @@ elif page == "Forecast":
 
     # ── Expense forecast ───────────────────────────────────────────
     st.markdown("#### Expense Forecast")
-    cats    = ["Total"] + sorted(df[df["transaction_type"] == "Expense"]["category"].unique().tolist())
+    cats    = ["Total"] + sorted(expense_cells(cube)["category"].unique().tolist())
     sel_cat = st.selectbox("Category", cats, key="fc_cat")
     cat_arg = None if sel_cat == "Total" else sel_cat
 
-    fc_result = forecast_next_months(df, category=cat_arg)
+    fc_result = forecast_next_months(df, category=cat_arg, cube=cube)
 
     if fc_result:
         hist, fcast = fc_result
@@ -631,7 +657,7 @@ elif page == "Forecast":
 
     # ── Savings forecast ───────────────────────────────────────────
     st.markdown("#### Savings Forecast")
-    sv_result = predict_savings(df)
+    sv_result = predict_savings(df, cube=cube)
 
     if sv_result:
         sv_hist, sv_fcast = sv_result
@@ -667,7 +693,7 @@ elif page == "Forecast":
         "Monthly Budget (₹)", min_value=0.0,
         value=float(DEFAULT_MONTHLY_BUDGET), step=1000.0,
     )
-    months_count        = df[["year","month_number"]].drop_duplicates().shape[0] or 1
+    months_count        = month_count(cube) or 1
     avg_monthly_expense = total_expense / months_count
 
     b1, b2, b3 = st.columns(3)
@@ -697,7 +723,7 @@ elif page == "Goals":
 
     st.divider()
 
-    months_count        = df[["year","month_number"]].drop_duplicates().shape[0] or 1
+    months_count        = month_count(cube) or 1
     avg_monthly_savings = net_savings / months_count
 
     col1, col2, col3 = st.columns(3)
@@ -735,7 +761,7 @@ elif page == "Goals":
                 f"{goal_months} months. At the current rate, it'll take **{projected_months:.1f} months**."
             )
 
-        sv_result = predict_savings(df)
+        sv_result = predict_savings(df, cube=cube)
         if sv_result:
             _, sv_fcast = sv_result
             st.markdown("#### Forecasted Monthly Savings (Next 3 Months)")
@@ -0,0 +1,93 @@
+"""
+benchmarks/bench_aggregate_cube.py
+==================================
+One page render's worth of analytics consumers on a long history, with
+every consumer regrouping the transactions itself versus all of them
+reading one shared monthly aggregate cube. Full-table scans are counted
+as build_cube() calls on the transaction frame.
+
+    python -m benchmarks.bench_aggregate_cube --rows 2000000 --years 10
+"""
+
+import argparse
+import contextlib
+import io
+import time
+import warnings
+
+import utils.aggregator as aggregator
+import utils.forecasting as forecasting
+import utils.health_score as health_score
+import utils.insights as insights
+import utils.savings_prediction as savings_prediction
+from utils.pipeline import run_stages
+from utils.schema import compact
+from benchmarks.common import make_ledger
+
+_MODULES = [aggregator, forecasting, health_score, insights, savings_prediction]
+
+
+def _render(df, cube):
+    """The consumer calls app.py makes across the Overview / Categories / Forecast pages."""
+    health_score.calculate_financial_health_score(df, cube=cube)
+    health_score.monthly_health_trend(df, cube=cube)
+    insights.generate_insights(df, cube=cube)
+    aggregator.monthly_cashflow(df, cube=cube)
+    aggregator.merchant_summary(df, top_n=10, cube=cube)
+    aggregator.monthly_category_summary(df, cube=cube)
+    forecasting.forecast_next_months(df, cube=cube)
+    forecasting.forecast_next_months(df, category="Food", cube=cube)
+    savings_prediction.predict_savings(df, cube=cube)
+
+
+@contextlib.contextmanager
+def _count_scans():
+    calls    = [0]
+    original = aggregator.build_cube
+
+    def counted(df):
+        calls[0] += 1
+        return original(df)
+
+    for module in _MODULES:
+        module.build_cube = counted
+    try:
+        yield calls
+    finally:
+        for module in _MODULES:
+            module.build_cube = original
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, _ = run_stages(compact(make_ledger(args.rows, years=args.years)))
+    print(f"{len(df):,} rows over {df['year_month'].nunique()} months")
+
+    with _count_scans() as scans:
+        t0 = time.perf_counter()
+        _render(df, None)
+        rescan = time.perf_counter() - t0
+    rescans = scans[0]
+
+    with _count_scans() as scans:
+        t0   = time.perf_counter()
+        cube = aggregator.build_cube(df)
+        build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        _render(df, cube)
+        shared = time.perf_counter() - t0
+    print(f"cube: {len(cube):,} cells, built in {build:.2f}s")
+
+    print(f"\n{'mode':<16} {'scans':>6} {'seconds':>8}")
+    print(f"{'per-consumer':<16} {rescans:>6} {rescan:>8.2f}")
+    print(f"{'shared cube':<16} {scans[0]:>6} {build + shared:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
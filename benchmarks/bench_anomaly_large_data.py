@@ -0,0 +1,91 @@
+"""
+benchmarks/bench_anomaly_large_data.py
+======================================
+anomaly_columns fit + score time and peak RSS on the full-fit path
+(whole feature matrix, sklearn defaults) versus the large-data mode
+(stratified sample, all cores, batched scoring), and how closely the
+two sets of flags agree. Each measurement runs in a fresh subprocess.
+
+    python -m benchmarks.bench_anomaly_large_data --rows 100000 1000000 10000000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import utils.anomaly_detector as anomaly_detector
+from utils.anomaly_detector import anomaly_columns
+from benchmarks.common import peak_rss_kb
+
+_CATEGORIES = ["Food", "Shopping", "Transport", "Bills", "Rent", "Investments",
+               "Entertainment", "Health", "Transfers", "Others"]
+
+
+def _expenses(n: int, seed: int = 0) -> pd.DataFrame:
+    rng   = np.random.default_rng(seed)
+    start = pd.Timestamp("2016-01-01").value
+    stop  = pd.Timestamp("2026-01-01").value
+    date  = pd.to_datetime(np.sort(rng.integers(start, stop, n)))
+    return pd.DataFrame({
+        "date":             date,
+        "category":         pd.Categorical.from_codes(rng.integers(0, len(_CATEGORIES), n), _CATEGORIES),
+        "transaction_type": pd.Categorical.from_codes(np.zeros(n, dtype="int8"), ["Expense", "Income"]),
+        "amount":           rng.lognormal(6.5, 1.2, n).round(2),
+        "day":              date.day.astype("int8"),
+    })
+
+
+def _child(mode: str, n: int, out: str):
+    df = _expenses(n)
+    anomaly_detector.ANOMALY_LARGE_DATA_ROWS = 0 if mode == "large" else float("inf")
+
+    base  = peak_rss_kb()
+    t0    = time.perf_counter()
+    flags = anomaly_columns(df)["is_anomaly"]
+    took  = time.perf_counter() - t0
+    peak  = peak_rss_kb()
+    np.save(out, flags)
+    print(took, peak - base)
+
+
+def _measure(mode: str, n: int, out: str):
+    res = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_anomaly_large_data",
+         "--child", mode, str(n), out],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return np.load(out), float(res[-2]), int(res[-1]) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "ROWS", "OUT"))
+    args = parser.parse_args()
+
+    if args.child:
+        mode, n, out = args.child
+        _child(mode, int(n), out)
+        return
+
+    print(f"{os.cpu_count()} CPU core(s)")
+    print(f"{'rows':>11} {'full s':>8} {'full MB':>8} {'large s':>8} {'large MB':>9} "
+          f"{'agree':>7} {'flag overlap':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.rows:
+            full,  full_s,  full_mb  = _measure("full",  n, os.path.join(tmp, "full.npy"))
+            large, large_s, large_mb = _measure("large", n, os.path.join(tmp, "large.npy"))
+            agree   = (full == large).mean()
+            overlap = (full & large).sum() / max(1, (full | large).sum())
+            print(f"{n:>11,} {full_s:>8.1f} {full_mb:>8.0f} {large_s:>8.1f} {large_mb:>9.0f} "
+                  f"{agree:>7.2%} {overlap:>13.2%}")
+
+
+if __name__ == "__main__":
+    main()
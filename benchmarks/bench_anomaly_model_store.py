@@ -0,0 +1,57 @@
+"""
+benchmarks/bench_anomaly_model_store.py
+=======================================
+Cost of flagging one new month of expenses on a growing history:
+a full refit, the sampled partial fit (rows=...), and scoring only
+against a saved model (state=...). Also how many of the history's
+flags each approach changes.
+
+    python -m benchmarks.bench_anomaly_model_store --history 100000 1000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from config import ANOMALY_PARTIAL_FIT_ROWS
+from utils.anomaly_detector import anomaly_columns, fit_anomaly_model
+from benchmarks.common import timed
+
+
+def _expenses(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "transaction_type": pd.Categorical(["Expense"] * n, categories=["Expense", "Income"]),
+        "amount":           rng.lognormal(6.5, 1.2, n).round(2),
+        "day":              rng.integers(1, 29, n).astype("int8"),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--history", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--month", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'history':>10} {'full s':>8} {'partial s':>10} {'score-only ms':>14} "
+          f"{'full: old flags changed':>24}")
+    for n in args.history:
+        history = _expenses(n, seed=0)
+        history["is_anomaly"] = anomaly_columns(history)["is_anomaly"]
+        state   = fit_anomaly_model(history, ANOMALY_PARTIAL_FIT_ROWS)
+
+        month   = _expenses(args.month, seed=1).assign(is_anomaly=False)
+        ledger  = pd.concat([history, month], ignore_index=True)
+        new     = np.arange(len(ledger)) >= n
+
+        full,    flags = timed(anomaly_columns, ledger)
+        partial, _     = timed(anomaly_columns, ledger, new)
+        scored,  _     = timed(anomaly_columns, ledger, new, state, repeat=5)
+
+        changed = int((flags["is_anomaly"][:n] != history["is_anomaly"].to_numpy()).sum())
+        print(f"{n:>10,} {full:>8.2f} {partial:>10.2f} {scored * 1e3:>14.1f} {changed:>24,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+benchmarks/bench_apply_categorization.py
+========================================
+apply_categorization: legacy row-wise Series.apply versus the
+deduplicated, factorized path.
+
+    python -m benchmarks.bench_apply_categorization --sizes 10000 100000 1000000
+"""
+
+import argparse
+
+import pandas as pd
+
+from utils import schema
+from utils.categorizer import apply_categorization, categorize_transaction
+from benchmarks.common import make_ledger, timed
+
+
+def _legacy_apply_categorization(df: pd.DataFrame) -> pd.DataFrame:
+    results = df["description"].apply(categorize_transaction)
+    df = df.copy()
+    df["merchant"] = results.apply(lambda x: x[0])
+    df["category"] = results.apply(lambda x: x[1])
+    return schema.compact(df)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'unique':>8} {'legacy s':>9} {'dedup s':>9} {'speedup':>8}")
+    for n in args.sizes:
+        df = make_ledger(n)
+        before, expected = timed(_legacy_apply_categorization, df)
+        after,  actual   = timed(apply_categorization, df)
+
+        pd.testing.assert_frame_equal(actual, expected)
+        print(f"{n:>10,} {df['description'].nunique():>8,} "
+              f"{before:>9.2f} {after:>9.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
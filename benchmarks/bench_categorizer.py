@@ -0,0 +1,54 @@
+"""
+benchmarks/bench_categorizer.py
+===============================
+Rows/sec of categorize_transaction with the legacy per-pattern
+re.search loop versus the precompiled anchored matcher.
+
+    python -m benchmarks.bench_categorizer --rows 1000000
+"""
+
+import argparse
+import re
+
+from config import MERCHANT_MAP
+from utils import categorizer
+from benchmarks.common import make_descriptions, timed
+
+
+def _legacy_apply_merchant_map(text: str):
+    lower = text.lower()
+    for pattern, (name, cat) in MERCHANT_MAP.items():
+        if re.search(pattern, lower):
+            return name, cat
+    return None, None
+
+
+def _run(descriptions):
+    return [categorizer.categorize_transaction(d) for d in descriptions]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    descriptions = make_descriptions(args.rows)
+
+    compiled = categorizer._apply_merchant_map
+    categorizer._apply_merchant_map = _legacy_apply_merchant_map
+    try:
+        before, expected = timed(_run, descriptions)
+    finally:
+        categorizer._apply_merchant_map = compiled
+    after, actual = timed(_run, descriptions)
+
+    assert actual == expected, "compiled matcher changed categorization results"
+
+    print(f"rows            : {args.rows:,}")
+    print(f"legacy  re loop : {before:8.2f} s  {args.rows / before:12,.0f} rows/s")
+    print(f"compiled matcher: {after:8.2f} s  {args.rows / after:12,.0f} rows/s")
+    print(f"speedup         : {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
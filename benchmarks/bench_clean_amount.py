@@ -0,0 +1,55 @@
+"""
+benchmarks/bench_clean_amount.py
+================================
+clean_amount: the three-pass regex chain versus parsing each distinct
+string once, at 1M rows of "₹ 1,234.50"-style amounts with some
+"(1,234.50)" debits and blanks mixed in.
+
+    python -m benchmarks.bench_clean_amount --rows 1000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import clean_amount
+from benchmarks.common import timed
+
+
+def _legacy_clean_amount(series):
+    return (
+        series.astype(str)
+        .str.replace(r"[₹,\s]", "", regex=True)
+        .str.replace(r"\((.+?)\)", r"-\1", regex=True)
+        .str.replace(r"[^0-9.\-]", "", regex=True)
+        .replace("", np.nan)
+        .astype(float)
+    )
+
+
+def _column(n: int) -> pd.Series:
+    rng    = np.random.default_rng(0)
+    values = np.round(rng.lognormal(6.5, 1.2, n), 2)
+    text   = np.array([f"₹ {v:,.2f}" for v in values], dtype=object)
+    text[::50] = [f"({v:,.2f})" for v in values[::50]]
+    text[::90] = None
+    return pd.Series(text)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    col = _column(args.rows)
+    print(f"{'input':<14} {'legacy s':>9} {'new s':>9} {'speedup':>8}")
+    for label, series in [("text", col), ("float64", _legacy_clean_amount(col))]:
+        before, old = timed(_legacy_clean_amount, series)
+        after,  new = timed(clean_amount, series)
+        assert np.allclose(old.fillna(0), new.fillna(0)) and (old.isna() == new.isna()).all()
+        print(f"{label:<14} {before:>9.2f} {after:>9.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+benchmarks/bench_column_projection.py
+=====================================
+Time and peak RSS of reading a wide bank export: every column versus
+only the resolved statement columns (load_tabular). Each measurement
+runs in a fresh subprocess; the Excel case needs openpyxl.
+
+    python -m benchmarks.bench_column_projection --rows 1000000 --extra-cols 24
+"""
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.common import make_export, peak_rss_kb
+
+
+def _child(mode: str, path: str):
+    from utils.data_loader import load_tabular, process_tabular
+
+    name = os.path.basename(path)
+    base = peak_rss_kb()
+    t0   = time.perf_counter()
+    if mode == "legacy":
+        raw = pd.read_csv(path) if name.endswith(".csv") else pd.read_excel(path)
+    else:
+        raw = load_tabular(path, name)
+    read = time.perf_counter() - t0
+    df   = process_tabular(raw)
+    print(peak_rss_kb() - base, read, time.perf_counter() - t0, len(df))
+
+
+def _measure(mode: str, path: str) -> tuple[int, float, float]:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_column_projection", "--child", mode, path],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return int(out[-4]), float(out[-3]), float(out[-2])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--excel-rows", type=int, default=50_000)
+    parser.add_argument("--extra-cols", type=int, default=24)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"))
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    cases = [("export.csv", args.rows)]
+    if importlib.util.find_spec("openpyxl"):
+        cases.append(("export.xlsx", args.excel_rows))
+    else:
+        print("openpyxl not installed; skipping the Excel case")
+
+    print(f"{'file':<12} {'rows':>10} {'mode':>9} {'peak MB':>8} {'read s':>7} {'total s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, n in cases:
+            path   = os.path.join(tmp, name)
+            export = make_export(n, extra_cols=args.extra_cols)
+            if name.endswith(".csv"):
+                export.to_csv(path, index=False)
+            else:
+                export.to_excel(path, index=False)
+            del export
+
+            for mode in ("legacy", "projected"):
+                peak, read, total = _measure(mode, path)
+                print(f"{name:<12} {n:>10,} {mode:>9} {peak / 1024:>8.0f} {read:>7.2f} {total:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+benchmarks/bench_compact_dtypes.py
+==================================
+Bytes per row of the enriched pipeline DataFrame in the old layout
+(object strings, int64 calendar fields) versus the compact schema, and
+the groupby-heavy aggregation helpers timed on both.
+
+    python -m benchmarks.bench_compact_dtypes --rows 1000000
+"""
+
+import argparse
+import contextlib
+import io
+
+import pandas as pd
+
+from utils.aggregator import monthly_category_summary, merchant_summary, monthly_cashflow
+from utils.anomaly_detector import detect_large_transactions
+from utils.health_score import calculate_financial_health_score
+from utils.ledger_store import enrich
+from utils.schema import compact
+from benchmarks.common import make_ledger, timed
+
+HELPERS = [monthly_category_summary, merchant_summary, monthly_cashflow,
+           calculate_financial_health_score]
+
+
+# The old pipeline built these three from Python lists (object dtype);
+# the calendar names came from .dt accessors (pandas' default string dtype).
+_OBJECT_COLUMNS = ["merchant", "category", "transaction_type"]
+
+
+def _legacy_layout(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    for col in out.columns:
+        if col in _OBJECT_COLUMNS:
+            out[col] = out[col].astype(object)
+        elif isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype(str)
+        elif out[col].dtype.kind == "i":
+            out[col] = out[col].astype("int64")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        new, _ = detect_large_transactions(enrich(compact(make_ledger(args.rows))))
+        new["is_anomaly"] = False
+    old = _legacy_layout(new)
+
+    old_mem = old.memory_usage(deep=True, index=False)
+    new_mem = new.memory_usage(deep=True, index=False)
+    print(f"{'column':<18} {'old dtype':>10} {'new dtype':>10} {'old B/row':>10} {'new B/row':>10}")
+    for col in new.columns:
+        print(f"{col:<18} {str(old[col].dtype):>10.10} {str(new[col].dtype):>10.10} "
+              f"{old_mem[col] / len(new):>10.1f} {new_mem[col] / len(new):>10.1f}")
+    print(f"{'total':<18} {'':>10} {'':>10} "
+          f"{old_mem.sum() / len(new):>10.1f} {new_mem.sum() / len(new):>10.1f}")
+
+    print(f"\n{'helper':<34} {'old s':>7} {'new s':>7} {'speedup':>8}")
+    for fn in HELPERS:
+        before, _ = timed(fn, old, repeat=3)
+        after,  _ = timed(fn, new, repeat=3)
+        print(f"{fn.__name__:<34} {before:>7.3f} {after:>7.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+benchmarks/bench_csv_memory.py
+==============================
+Peak RSS of CSV ingestion: whole-file read_csv + process_tabular +
+finalize versus the chunked streaming loader, on growing wide exports.
+Each measurement runs in a fresh subprocess.
+
+    python -m benchmarks.bench_csv_memory --rows 250000 500000 1000000 2000000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from benchmarks.common import peak_rss_kb, write_export_csv
+
+
+def _child(mode: str, path: str):
+    from utils.data_loader import finalize, process_tabular, load_csv_streaming
+
+    base = peak_rss_kb()
+    if mode == "legacy":
+        df = finalize(process_tabular(pd.read_csv(path)))
+    else:
+        df = load_csv_streaming(path)
+    peak = peak_rss_kb()
+    print(peak - base, df.memory_usage(deep=True).sum() // 1024)
+
+
+def _measure(mode: str, path: str) -> tuple[int, int]:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_csv_memory", "--child", mode, path],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return int(out[-2]), int(out[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+",
+                        default=[250_000, 500_000, 1_000_000, 2_000_000])
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"))
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    print(f"{'rows':>10} {'file MB':>8} {'result MB':>10} "
+          f"{'legacy MB':>10} {'stream MB':>10} {'legacy/file':>12} {'stream/file':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.rows:
+            path    = write_export_csv(os.path.join(tmp, f"export_{n}.csv"), n)
+            file_mb = os.path.getsize(path) / 2**20
+            legacy, result = _measure("legacy", path)
+            stream, _      = _measure("stream", path)
+            print(f"{n:>10,} {file_mb:>8.0f} {result / 1024:>10.0f} "
+                  f"{legacy / 1024:>10.0f} {stream / 1024:>10.0f} "
+                  f"{legacy / 1024 / file_mb:>12.2f} {stream / 1024 / file_mb:>12.2f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
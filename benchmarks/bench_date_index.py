@@ -0,0 +1,84 @@
+"""
+benchmarks/bench_date_index.py
+==============================
+Date-range totals and row windows on a long ledger: boolean masks over
+the whole frame versus DateIndex (searchsorted + prefix-sum subtraction).
+
+    python -m benchmarks.bench_date_index --rows 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregator import DateIndex
+from benchmarks.common import timed
+
+_CATEGORIES = ["Food", "Shopping", "Transport", "Bills", "Rent", "Investments",
+               "Entertainment", "Health", "Transfers", "Salary"]
+
+
+def _ledger(n: int, seed: int = 0) -> pd.DataFrame:
+    rng   = np.random.default_rng(seed)
+    start = pd.Timestamp("2016-01-01").value
+    stop  = pd.Timestamp("2026-01-01").value
+    return pd.DataFrame({
+        "date":             pd.to_datetime(np.sort(rng.integers(start, stop, n))),
+        "category":         pd.Categorical.from_codes(rng.integers(0, len(_CATEGORIES), n), _CATEGORIES),
+        "transaction_type": pd.Categorical.from_codes((rng.random(n) < 0.2).astype("int8"),
+                                                      ["Expense", "Income"]),
+        "amount":           rng.gamma(2.0, 800.0, n).round(2),
+    })
+
+
+def _ranges(k: int, seed: int = 1):
+    rng    = np.random.default_rng(seed)
+    offset = np.sort(rng.integers(0, 3650, (k, 2)), axis=1)
+    base   = pd.Timestamp("2016-01-01")
+    return [(base + pd.Timedelta(days=int(a)), base + pd.Timedelta(days=int(b))) for a, b in offset]
+
+
+def _mask_total(df, start, end, category):
+    m = (df["date"] >= start) & (df["date"] < end + pd.Timedelta(days=1))
+    m &= df["transaction_type"] == "Expense"
+    if category is not None:
+        m &= df["category"] == category
+    return df["amount"][m].sum()
+
+
+def _per_query(fn, queries) -> float:
+    t0 = time.perf_counter()
+    for q in queries:
+        fn(*q)
+    return (time.perf_counter() - t0) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    df = _ledger(args.rows)
+    build, index = timed(DateIndex, df)
+    print(f"{len(df):,} rows, {len(index.days):,} days; index built in {build:.2f}s")
+
+    queries = [(s, e, c) for (s, e), c in zip(_ranges(args.queries),
+                                              ([None] + _CATEGORIES) * args.queries)]
+    masked  = queries[:20]
+
+    mask_s  = _per_query(lambda s, e, c: _mask_total(df, s, e, c), masked)
+    index_s = _per_query(index.range_total, queries)
+    print(f"\n{'range_total':<14} {'mask ms':>9} {'index ms':>9} {'speedup':>9}")
+    print(f"{'':<14} {mask_s * 1e3:>9.1f} {index_s * 1e3:>9.4f} {mask_s / index_s:>8.0f}x")
+
+    mask_s  = _per_query(lambda s, e, c: df[(df["date"] >= s) & (df["date"] < e + pd.Timedelta(days=1))],
+                         masked)
+    index_s = _per_query(lambda s, e, c: df.iloc[index.rows(s, e)], masked)
+    print(f"{'row window':<14} {mask_s * 1e3:>9.1f} {index_s * 1e3:>9.4f} {mask_s / index_s:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
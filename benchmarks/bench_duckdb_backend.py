@@ -0,0 +1,76 @@
+"""
+benchmarks/bench_duckdb_backend.py
+==================================
+The ledger-wide aggregations on a multi-year, multi-account ledger with
+ANALYTICS_BACKEND = "pandas" versus "duckdb"; stops with an assertion
+error if the backends' frames differ (tests/test_duckdb_backend.py
+covers the edge cases).
+
+    python -m benchmarks.bench_duckdb_backend --rows 10000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from utils import aggregator, duckdb_backend
+from utils.aggregator import time_feature_columns
+from benchmarks.common import timed
+
+_CATEGORIES = ["Food", "Shopping", "Transport", "Bills", "Rent", "Investments",
+               "Entertainment", "Health", "Transfers", "Salary"]
+
+
+def _ledger(n: int, merchants: int, seed: int = 0) -> pd.DataFrame:
+    """An enriched ledger in the compact layout, without the categorization cost."""
+    rng   = np.random.default_rng(seed)
+    start = pd.Timestamp("2016-01-01").value
+    stop  = pd.Timestamp("2026-01-01").value
+    df = pd.DataFrame({
+        "date":             pd.to_datetime(np.sort(rng.integers(start, stop, n))),
+        "merchant":         pd.Categorical.from_codes(rng.zipf(1.3, n) % merchants,
+                                                      [f"Merchant {i:05d}" for i in range(merchants)]),
+        "category":         pd.Categorical.from_codes(rng.integers(0, len(_CATEGORIES), n), _CATEGORIES),
+        "transaction_type": pd.Categorical.from_codes((rng.random(n) < 0.2).astype("int8"),
+                                                      ["Expense", "Income"]),
+        "amount":           rng.gamma(2.0, 800.0, n).round(2),
+        "is_large":         rng.random(n) < 0.02,
+        "is_anomaly":       rng.random(n) < 0.01,
+    })
+    return df.assign(**time_feature_columns(df))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--merchants", type=int, default=5_000)
+    args = parser.parse_args()
+
+    if duckdb_backend.duckdb is None:
+        raise SystemExit("duckdb is not installed (pip install duckdb)")
+
+    df = _ledger(args.rows, args.merchants)
+    print(f"{len(df):,} rows, {df['year_month'].nunique()} months, "
+          f"{df['merchant'].nunique():,} merchants")
+
+    calls = [
+        ("build_cube",               lambda: aggregator.build_cube(df)),
+        ("monthly_cashflow",         lambda: aggregator.monthly_cashflow(df)),
+        ("merchant_summary",         lambda: aggregator.merchant_summary(df, top_n=10)),
+        ("monthly_category_summary", lambda: aggregator.monthly_category_summary(df)),
+    ]
+
+    print(f"\n{'function':<26} {'pandas s':>9} {'duckdb s':>9} {'speedup':>8}")
+    for name, fn in calls:
+        duckdb_backend.ANALYTICS_BACKEND = "pandas"
+        before, expected = timed(fn, repeat=2)
+        duckdb_backend.ANALYTICS_BACKEND = "duckdb"
+        after, got = timed(fn, repeat=2)
+        pd.testing.assert_frame_equal(got.reset_index(drop=True), expected.reset_index(drop=True),
+                                      rtol=1e-9, obj=f"{name} (duckdb vs pandas)")
+        print(f"{name:<26} {before:>9.3f} {after:>9.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
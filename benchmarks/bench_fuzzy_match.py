@@ -0,0 +1,41 @@
+"""
+benchmarks/bench_fuzzy_match.py
+===============================
+Cost of the trigram fuzzy-match stage inside apply_categorization,
+with the on-disk category cache disabled.
+
+    python -m benchmarks.bench_fuzzy_match --rows 1000000
+"""
+
+import argparse
+
+from utils import categorizer
+from benchmarks.common import make_ledger, timed
+
+
+def _categorize(df, fuzzy: bool):
+    categorizer.FUZZY_MATCH_ENABLED = fuzzy
+    categorizer._fuzzy_lookup.cache_clear()
+    return categorizer.apply_categorization(df)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    categorizer.CATEGORY_CACHE_ENABLED = False
+    df = make_ledger(args.rows)
+
+    off, plain = timed(_categorize, df, False)
+    on,  fuzzy = timed(_categorize, df, True)
+
+    changed = (plain["merchant"] != fuzzy["merchant"]).sum()
+    print(f"rows            : {args.rows:,}")
+    print(f"fuzzy disabled  : {off:8.2f} s")
+    print(f"fuzzy enabled   : {on:8.2f} s   ({on / off:.2f}x)")
+    print(f"rows re-resolved: {changed:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+benchmarks/bench_grouped_baselines.py
+=====================================
+Large-transaction flags with the global mean + k·std baseline versus
+grouped per-category / per-merchant robust baselines, over growing row
+counts with thousands of merchants. Time per row should stay flat.
+
+    python -m benchmarks.bench_grouped_baselines --rows 250000 1000000 4000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import utils.anomaly_detector as anomaly_detector
+from utils.anomaly_detector import large_transaction_columns
+from benchmarks.common import timed
+
+_CATEGORIES = ["Food", "Shopping", "Transport", "Bills", "Rent", "Investments",
+               "Entertainment", "Health", "Transfers", "Others"]
+
+
+def _expenses(n: int, merchants: int, seed: int = 0) -> pd.DataFrame:
+    rng  = np.random.default_rng(seed)
+    shop = rng.zipf(1.3, n) % merchants
+    return pd.DataFrame({
+        "merchant":         pd.Categorical.from_codes(shop, [f"Merchant {i:05d}" for i in range(merchants)]),
+        "category":         pd.Categorical.from_codes(shop % len(_CATEGORIES), _CATEGORIES),
+        "transaction_type": pd.Categorical.from_codes((rng.random(n) < 0.2).astype("int8"),
+                                                      ["Expense", "Income"]),
+        "amount":           (rng.lognormal(6.5, 1.0, n) * (1 + shop % 7)).round(2),
+    })
+
+
+def _flags(df: pd.DataFrame, baseline: str):
+    anomaly_detector.LARGE_TXN_BASELINE = baseline
+    return large_transaction_columns(df)[0]["is_large"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000, 1_000_000, 4_000_000])
+    parser.add_argument("--merchants", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'merchants':>10} {'global s':>9} {'grouped s':>10} "
+          f"{'grouped ns/row':>15} {'global flags':>13} {'grouped flags':>14}")
+    for n in args.rows:
+        df = _expenses(n, args.merchants)
+        before, flat    = timed(_flags, df, "global",  repeat=3)
+        after,  grouped = timed(_flags, df, "grouped", repeat=3)
+        print(f"{n:>10,} {df['merchant'].nunique():>10,} {before:>9.3f} {after:>10.3f} "
+              f"{after / n * 1e9:>15.0f} {flat.sum():>13,} {grouped.sum():>14,}")
+
+
+if __name__ == "__main__":
+    main()
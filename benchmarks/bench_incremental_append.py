@@ -0,0 +1,52 @@
+"""
+benchmarks/bench_incremental_append.py
+======================================
+Monthly update cost: re-running the row-level pipeline (categorize,
+type, time features, anomalies, large-transaction flag) over the full
+history versus appending one new month to the ledger store.
+
+    python -m benchmarks.bench_incremental_append --years 1 4 16 --monthly-rows 3000
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+
+import utils.ledger_store as ledger_store
+from utils.anomaly_detector import detect_anomalies, detect_large_transactions
+from benchmarks.common import make_ledger, timed
+
+
+def _full_rerun(df):
+    return detect_large_transactions(detect_anomalies(ledger_store.enrich(df)))
+
+
+def _append(df):
+    return detect_large_transactions(ledger_store.append_to_ledger(df))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--monthly-rows", type=int, default=3_000)
+    args = parser.parse_args()
+
+    print(f"{'history rows':>13} {'new rows':>9} {'full rerun s':>13} {'append s':>9} {'speedup':>8}")
+    for years in args.years:
+        ledger = make_ledger(args.monthly_rows * 12 * years, years=years)
+        cutoff = ledger["date"].max() - ledger["date"].max().replace(day=1)
+        latest = ledger["date"] >= ledger["date"].max() - cutoff
+        history, month = ledger[~latest], ledger[latest]
+
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            ledger_store.LEDGER_STORE_DIR = tmp
+            ledger_store.append_to_ledger(history)
+            full, _ = timed(_full_rerun, ledger)
+            inc,  _ = timed(_append, month)
+
+        print(f"{len(history):>13,} {len(month):>9,} {full:>13.2f} {inc:>9.2f} {full / inc:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+benchmarks/bench_multi_ingest.py
+================================
+Loading a batch of monthly PDF statements: one after another versus the
+load_statements process pool, compared with the slowest single file.
+The batch cycles through the Sample Files PDFs, so later copies also
+exercise the cross-file dedup. The snapshot cache is bypassed.
+
+    python -m benchmarks.bench_multi_ingest --files 36 --workers 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+
+from utils.multi_loader import load_statements
+from benchmarks.common import timed
+
+SAMPLES = [
+    "Sample Files/messy_transactions_200.pdf",
+    "Sample Files/structured_transactions_200.pdf",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=36)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    blobs = {path: open(path, "rb").read() for path in SAMPLES}
+    batch = [(blobs[SAMPLES[i % len(SAMPLES)]], f"statement_{i + 1:02d}.pdf")
+             for i in range(args.files)]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        slowest = max(timed(load_statements, [(blobs[p], p)], use_cache=False)[0]
+                      for p in SAMPLES)
+        serial, expected = timed(load_statements, batch, workers=1, use_cache=False)
+        pooled, actual   = timed(load_statements, batch, workers=args.workers, use_cache=False)
+    assert actual.equals(expected), "pooled load differs from serial"
+
+    print(f"files: {args.files}  workers: {args.workers}  merged rows: {len(actual):,}")
+    print(f"{'slowest file s':>15} {'serial s':>9} {'pool s':>7} {'pool / slowest':>15}")
+    print(f"{slowest:>15.2f} {serial:>9.2f} {pooled:>7.2f} {pooled / slowest:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+benchmarks/bench_parse_date.py
+==============================
+parse_date: format-free day-first pd.to_datetime versus inferred strict
+format on the distinct strings, at 1M rows per date layout.
+
+    python -m benchmarks.bench_parse_date --rows 1000000
+"""
+
+import argparse
+import warnings
+
+import pandas as pd
+
+from utils.data_loader import parse_date
+from benchmarks.common import timed
+
+LAYOUTS = ["%d/%m/%Y", "%d-%b-%y", "%d %b '%y", "mixed"]
+
+
+def _legacy_parse_date(series):
+    return pd.to_datetime(series, errors="coerce", dayfirst=True)
+
+
+def _column(layout: str, n: int) -> pd.Series:
+    days = pd.Series(pd.date_range("2016-01-01", "2025-12-31"))
+    if layout == "mixed":
+        text = pd.concat([days.dt.strftime("%d/%m/%Y"), days.dt.strftime("%d %b %Y")])
+    else:
+        text = days.dt.strftime(layout)
+    return text.sample(n, replace=True, random_state=0).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", UserWarning)
+
+    print(f"{'layout':<10} {'legacy s':>9} {'new s':>9} {'speedup':>8} {'legacy NaT':>11} {'new NaT':>8}")
+    for layout in LAYOUTS:
+        col = _column(layout, args.rows)
+        before, old = timed(_legacy_parse_date, col)
+        after,  new = timed(parse_date, col)
+
+        agree = old.notna()
+        assert (old[agree] == new[agree]).all(), "parsed dates differ"
+        print(f"{layout:<10} {before:>9.2f} {after:>9.3f} {before / after:>7.0f}x "
+              f"{old.isna().sum():>11,} {new.isna().sum():>8,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+benchmarks/bench_pdf_extraction.py
+==================================
+Serial versus process-pool page extraction on the Sample Files PDFs,
+scaled up by repeating their pages. Page duplication uses pypdfium2,
+which pdfplumber already depends on.
+
+    python -m benchmarks.bench_pdf_extraction --pages 120 480 --workers 4
+"""
+
+import argparse
+import os
+import tempfile
+
+import pypdfium2 as pdfium
+
+from utils.data_loader import extract_pdf_rows
+from benchmarks.common import timed
+
+SAMPLES = [
+    "Sample Files/messy_transactions_200.pdf",
+    "Sample Files/sample_transactions_200.pdf",
+    "Sample Files/structured_transactions_200.pdf",
+]
+
+
+def scale_pdf(src_path: str, pages: int, out_path: str) -> str:
+    src = pdfium.PdfDocument(src_path)
+    dst = pdfium.PdfDocument.new()
+    while len(dst) < pages:
+        take = min(len(src), pages - len(dst))
+        dst.import_pages(src, list(range(take)))
+    dst.save(out_path)
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[120, 480])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"workers: {args.workers}")
+    print(f"{'file':<34} {'pages':>6} {'serial s':>9} {'pool s':>9} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for sample in SAMPLES:
+            for pages in args.pages:
+                path = scale_pdf(sample, pages, os.path.join(tmp, "scaled.pdf"))
+                serial, expected = timed(extract_pdf_rows, path, workers=1)
+                pooled, actual   = timed(extract_pdf_rows, path, workers=args.workers)
+                assert actual == expected, "parallel extraction differs from serial"
+                print(f"{os.path.basename(sample):<34} {pages:>6} "
+                      f"{serial:>9.2f} {pooled:>9.2f} {serial / pooled:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
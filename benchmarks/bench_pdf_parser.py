@@ -0,0 +1,44 @@
+"""
+benchmarks/bench_pdf_parser.py
+==============================
+extract_tables on every page versus the fast line parser with
+per-page extract_tables fallback.
+
+    python -m benchmarks.bench_pdf_parser
+"""
+
+import argparse
+from collections import Counter
+
+from utils import data_loader
+from benchmarks.common import timed
+
+FILES = [
+    "Sample Files/messy_transactions_200.pdf",
+    "Sample Files/structured_transactions_200.pdf",
+]
+
+
+def _extract(path: str, fast: bool):
+    data_loader.PDF_FAST_PARSER = fast
+    return data_loader.extract_pdf_rows(path, workers=1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'file':<34} {'tables s':>9} {'fast s':>9} {'speedup':>8}  strategies")
+    for path in FILES:
+        slow, (slow_rows, _)   = timed(_extract, path, False, repeat=args.repeat)
+        fast, (fast_rows, rep) = timed(_extract, path, True,  repeat=args.repeat)
+        assert fast_rows == slow_rows, "fast parser rows differ from extract_tables"
+
+        strategies = Counter(r["strategy"] for r in rep)
+        print(f"{path.split('/')[-1]:<34} {slow:>9.3f} {fast:>9.3f} {slow / fast:>7.2f}x  "
+              + ", ".join(f"{k}={v}" for k, v in sorted(strategies.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+benchmarks/bench_pipeline_memory.py
+===================================
+tracemalloc peak of the pipeline: finalize plus the row-level stages,
+run the old way (every stage copies the whole frame before adding its
+columns) and the copy-free way (utils.pipeline.run_stages on one owned
+frame). Peaks are measured above the memory held before each run.
+Arrow-backed string buffers are not seen by tracemalloc.
+
+    python -m benchmarks.bench_pipeline_memory --rows 1000000
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import time
+import tracemalloc
+
+import pandas as pd
+
+from utils.categorizer import categorization_columns, transaction_type_columns
+from utils.aggregator import time_feature_columns
+from utils.anomaly_detector import anomaly_columns, large_transaction_columns
+from utils.data_loader import finalize
+from utils.pipeline import run_stages
+from utils.schema import compact
+from benchmarks.common import make_ledger
+
+
+def _legacy_finalize(df):
+    df = df.copy()
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date"])
+    df["description"] = df["description"].str.strip()
+    df = df[df["description"] != ""]
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce").abs()
+    df = df[df["amount"] > 0]
+    df["is_credit"] = df["is_credit"].astype(bool)
+    df = df.drop_duplicates(subset=["date", "description", "amount"])
+    return df.sort_values("date").reset_index(drop=True)
+
+
+def _legacy_stages(df):
+    for stage in (categorization_columns, transaction_type_columns,
+                  time_feature_columns, anomaly_columns):
+        columns = stage(df)
+        df = df.copy()
+        for name, values in columns.items():
+            df[name] = values
+    columns, threshold = large_transaction_columns(df)
+    df = df.copy()
+    df["is_large"] = columns["is_large"]
+    return df, threshold
+
+
+def _peak_mb(fn, df):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(df)
+    secs = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return (peak - base) / 2**20, secs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    raw    = make_ledger(args.rows)
+    loaded = compact(finalize(raw))
+
+    cases = [
+        ("finalize",   _legacy_finalize, finalize,   lambda: raw),
+        ("row stages", _legacy_stages,   run_stages, lambda: loaded.copy()),
+    ]
+    print(f"rows: {args.rows:,}")
+    print(f"{'step':<11} {'old peak MB':>12} {'new peak MB':>12} {'old s':>7} {'new s':>7}")
+    for label, old_fn, new_fn, frame in cases:
+        old_mb, old_s = _peak_mb(old_fn, frame())
+        new_mb, new_s = _peak_mb(new_fn, frame())
+        print(f"{label:<11} {old_mb:>12.0f} {new_mb:>12.0f} {old_s:>7.2f} {new_s:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
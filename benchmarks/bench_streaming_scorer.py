@@ -0,0 +1,57 @@
+"""
+benchmarks/bench_streaming_scorer.py
+====================================
+StreamingScorer: seeding cost from a history, score_one() throughput
+on a stream of new transactions, and how its flags line up with the
+batch IsolationForest flags on the same rows.
+
+    python -m benchmarks.bench_streaming_scorer --rows 200000 --stream 50000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+import warnings
+
+import numpy as np
+
+from utils.anomaly_detector import StreamingScorer
+from utils.pipeline import run_stages
+from utils.schema import compact
+from benchmarks.common import make_ledger, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--stream", type=int, default=50_000)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, _ = run_stages(compact(make_ledger(args.rows + args.stream)))
+    history, new = df.iloc[:args.rows], df.iloc[args.rows:]
+
+    seed, scorer = timed(StreamingScorer.from_history, history)
+    print(f"seeded from {len(history):,} rows in {seed * 1e3:.0f} ms "
+          f"({len(scorer.by_category)} category baselines)")
+
+    stream = new[["amount", "category", "transaction_type", "day"]].to_dict("records")
+    t0     = time.perf_counter()
+    flags  = np.array([scorer.score_one(txn)[1] for txn in stream])
+    took   = time.perf_counter() - t0
+    print(f"score_one + update: {len(stream) / took:,.0f} txn/s "
+          f"({took / len(stream) * 1e6:.1f} µs each)")
+
+    batch   = new["is_anomaly"].to_numpy()
+    expense = (new["transaction_type"] == "Expense").to_numpy()
+    both    = (flags & batch).sum()
+    print(f"\nflagged: streaming {flags.sum():,}, IsolationForest {batch.sum():,}, "
+          f"both {both:,} of {expense.sum():,} expenses")
+    print(f"IsolationForest flags also caught by streaming: {both / max(1, batch.sum()):.1%}")
+    print(f"streaming flags also flagged by IsolationForest: {both / max(1, flags.sum()):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+benchmarks/bench_time_features.py
+=================================
+Calendar feature columns via the .dt accessors (month_name / day_name
+strings per row, isocalendar(), then compact()) versus integer datetime
+components with categorical name lookups.
+
+    python -m benchmarks.bench_time_features --rows 1000000 10000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregator import time_feature_columns, iso_week
+from utils.schema import compact
+from benchmarks.common import timed
+
+
+def _legacy_columns(df: pd.DataFrame) -> dict:
+    dt = df["date"].dt
+    cols = pd.DataFrame({
+        "year":         dt.year,
+        "month_number": dt.month,
+        "month_name":   dt.month_name(),
+        "year_month":   dt.to_period("M").astype(str),
+        "week":         dt.isocalendar().week,
+        "day_of_week":  dt.day_name(),
+        "day":          dt.day,
+    }, index=df.index)
+    return dict(compact(cols).items())
+
+
+def _dates(n: int, seed: int = 0) -> pd.DataFrame:
+    rng   = np.random.default_rng(seed)
+    start = pd.Timestamp("2016-01-01").value
+    stop  = pd.Timestamp("2026-01-01").value
+    return pd.DataFrame({"date": pd.to_datetime(np.sort(rng.integers(start, stop, n)))})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>11} {'.dt s':>7} {'int s':>7} {'+week s':>8} {'speedup':>8}")
+    for n in args.rows:
+        df = _dates(n)
+        before, _ = timed(_legacy_columns, df, repeat=2)
+        after,  _ = timed(time_feature_columns, df, repeat=2)
+        week,   _ = timed(iso_week, df, repeat=2)
+        print(f"{n:>11,} {before:>7.2f} {after:>7.2f} {week:>8.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
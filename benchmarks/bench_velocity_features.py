@@ -0,0 +1,89 @@
+"""
+benchmarks/bench_velocity_features.py
+=====================================
+Build time of the anomaly velocity features (per-merchant counts over
+trailing windows, daily spend vs its trailing median, payee gap): pandas
+grouped time-based rolling windows versus the sorted-key searchsorted
+build in velocity_features, with a check that both give the same values.
+Also the same build in ANOMALY_SCORE_BATCH_ROWS batches (as the
+large-data mode scores), the full anomaly feature matrix, and scoring a
+new month only.
+
+    python -m benchmarks.bench_velocity_features --rows 100000 1000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from config import ANOMALY_VELOCITY_WINDOWS, ANOMALY_SPEND_MEDIAN_DAYS, ANOMALY_PAYEE_GAP_DAYS
+from utils.anomaly_detector import _batches, _expense_positions, _features, velocity_features
+from benchmarks.common import timed
+
+
+def _ledger(n: int, merchants: int, seed: int = 0) -> pd.DataFrame:
+    rng   = np.random.default_rng(seed)
+    start = pd.Timestamp("2016-01-01").value
+    stop  = pd.Timestamp("2026-01-01").value
+    shop  = rng.zipf(1.3, n) % merchants
+    date  = pd.to_datetime(np.sort(rng.integers(start, stop, n))).floor("h")
+    return pd.DataFrame({
+        "date":             date,
+        "merchant":         pd.Categorical.from_codes(shop, [f"Merchant {i:05d}" for i in range(merchants)]),
+        "transaction_type": pd.Categorical.from_codes((rng.random(n) < 0.2).astype("int8"),
+                                                      ["Expense", "Income"]),
+        "amount":           rng.lognormal(6.5, 1.0, n).round(2),
+        "day":              date.day.astype("int8"),
+    })
+
+
+def rolling_features(df: pd.DataFrame) -> pd.DataFrame:
+    """The same features with groupby().rolling() over a time index."""
+    expenses = df.iloc[_expense_positions(df)]
+    frame    = expenses[["date", "merchant", "amount"]].sort_values(["merchant", "date"], kind="stable")
+    groups   = frame.groupby("merchant", observed=True, sort=False)
+
+    out = pd.DataFrame(index=frame.index)
+    for window in ANOMALY_VELOCITY_WINDOWS:
+        count = groups.rolling(window, on="date")["amount"].count().to_numpy()
+        # rows at the same timestamp all see each other
+        out[f"merchant_{window}"] = pd.Series(count, index=frame.index).groupby(
+            [frame["merchant"], frame["date"]], observed=True).transform("max")
+
+    daily  = expenses.set_index("date")["amount"].resample("D").sum()
+    median = daily.rolling(f"{ANOMALY_SPEND_MEDIAN_DAYS}D", closed="left").median()
+    ratio  = (np.log1p(daily) - np.log1p(median)).fillna(0.0)
+    out["spend_vs_median"] = ratio.reindex(frame["date"].dt.floor("D")).to_numpy()
+
+    gap = groups["date"].diff().dt.total_seconds() / 86_400
+    out["payee_gap_days"] = gap.fillna(ANOMALY_PAYEE_GAP_DAYS).clip(upper=ANOMALY_PAYEE_GAP_DAYS)
+    return out.loc[expenses.index]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--merchants", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'rolling s':>10} {'searchsorted s':>15} {'batched s':>10} {'all features s':>15} "
+          f"{'last month ms':>14} {'match':>6}")
+    for n in args.rows:
+        df        = _ledger(n, args.merchants)
+        positions = _expense_positions(df)
+        month     = positions[df["date"].to_numpy()[positions] >= np.datetime64("2025-12-01")]
+
+        before, expected = timed(rolling_features, df)
+        after,  velocity = timed(velocity_features, df)
+        batched, parts   = timed(lambda: [velocity_features(df, b) for _, b in _batches(positions)])
+        full,   _        = timed(_features, df, positions)
+        recent, _        = timed(velocity_features, df, month, repeat=5)
+        match = np.allclose(velocity.to_numpy(), expected.to_numpy()) \
+            and np.allclose(pd.concat(parts).to_numpy(), velocity.to_numpy())
+        print(f"{n:>10,} {before:>10.2f} {after:>15.2f} {batched:>10.2f} {full:>15.2f} "
+              f"{recent * 1e3:>14.1f} {str(match):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+benchmarks/common.py
+====================
+Synthetic statement generators, a tiny timer and a peak-RSS probe shared by the benchmarks.
+
+Run any benchmark from the repository root, e.g.
+    python -m benchmarks.bench_categorizer --rows 1000000
+"""
+
+import resource
+import time
+
+import numpy as np
+import pandas as pd
+
+
+# ─────────────────────────────────────────────────────────────
+# SYNTHETIC NARRATIONS
+# ─────────────────────────────────────────────────────────────
+
+_MERCHANT_PAYEES = [
+    ("ZOMATO LIMITED", "zomato-order", "ptbl"),
+    ("SWIGGY", "swiggy.instamart", "icici"),
+    ("NITIN A ZADPE", "amzn0026735883", "apl"),
+    ("FLIPKART INTERNET", "flipkart.payu", "hdfcbank"),
+    ("UBER INDIA", "uber.rides", "axisbank"),
+    ("NETFLIX COM", "netflix", "hdfcbank"),
+    ("BESCOM BANGALORE", "bescom.bbps", "ybl"),
+    ("ZERODHA BROKING", "zerodha.iccl", "hdfcbank"),
+    ("BAJAJ FINSERV", "bajajfinserv", "icici"),
+    ("BIGBASKET", "bigbasket", "ybl"),
+]
+
+_FIRST = ["Rahul", "Priya", "Amit", "Sneha", "Om", "Kiran", "Vikas", "Anjali",
+          "Suresh", "Meera", "Arjun", "Pooja", "Nitin", "Kavya", "Rohan"]
+_LAST  = ["Sharma", "Patil", "Kumar", "Shikare", "Rao", "Iyer", "Gupta",
+          "Deshmukh", "Nair", "Joshi", "Reddy", "Kulkarni"]
+_PSP   = ["okaxis", "ybl", "oksbi", "paytm", "okhdfcbank", "ibl"]
+_NOTES = ["Payment from slice", "UPI", "Sent using Paytm", "groceries", "rent", ""]
+
+_FIXED = [
+    "NEFT CR-SALARY ACME TECHNOLOGIES PVT LTD",
+    "ACH D- HDFC LOAN EMI 0049",
+    "INTEREST CREDIT",
+    "ATM WDL MG ROAD BANGALORE",
+    "IMPS CREDIT FROM SELF",
+    "BILL PAYMENT AIRTEL POSTPAID",
+]
+
+
+def _payee_pool(rng, n_payees: int) -> list[str]:
+    pool = []
+    for name, handle, psp in _MERCHANT_PAYEES:
+        pool.append(f"{name}-{handle}@{psp}")
+    while len(pool) < n_payees:
+        first, last = rng.choice(_FIRST), rng.choice(_LAST)
+        handle = f"{first.lower()}{last.lower()}{rng.integers(10, 9999)}"
+        pool.append(f"{first} {last}-{handle}@{rng.choice(_PSP)}")
+    return pool
+
+
+def make_descriptions(n: int, n_payees: int = 2_000, seed: int = 0) -> list[str]:
+    """
+    UPI-heavy narrations with a realistic long tail: a few payees dominate,
+    and only some rows carry a unique reference number.
+    """
+    rng   = np.random.default_rng(seed)
+    pool  = _payee_pool(rng, n_payees)
+    ranks = np.minimum(rng.zipf(1.3, n) - 1, n_payees - 1)
+    kinds = rng.random(n)
+    refs  = rng.integers(10**11, 10**12, n)
+    notes = rng.integers(0, len(_NOTES), n)
+    fixed = rng.integers(0, len(_FIXED), n)
+
+    out = []
+    for i in range(n):
+        if kinds[i] < 0.10:
+            out.append(_FIXED[fixed[i]])
+        elif kinds[i] < 0.30:
+            out.append(f"UPI Debit-{pool[ranks[i]]}-{refs[i]}-{_NOTES[notes[i]]}")
+        elif kinds[i] < 0.35:
+            out.append(f"UPI Credit-{pool[ranks[i]]}")
+        else:
+            out.append(f"UPI Debit-{pool[ranks[i]]}")
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# SYNTHETIC LEDGER (shape of load_data output)
+# ─────────────────────────────────────────────────────────────
+
+def make_ledger(n: int, years: int = 5, seed: int = 0, **kwargs) -> pd.DataFrame:
+    """date / description / is_credit / amount / balance, sorted by date."""
+    rng   = np.random.default_rng(seed)
+    start = pd.Timestamp("2026-01-01") - pd.DateOffset(years=years)
+    span  = int((pd.Timestamp("2026-01-01") - start).total_seconds())
+    dates = start + pd.to_timedelta(np.sort(rng.integers(0, span, n)), unit="s")
+
+    desc      = make_descriptions(n, seed=seed, **kwargs)
+    is_credit = np.array([d.startswith(("UPI Credit", "NEFT CR", "INTEREST", "IMPS CREDIT"))
+                          for d in desc])
+    amount    = np.round(rng.lognormal(6.5, 1.2, n), 2)
+    amount[is_credit] *= 4
+
+    df = pd.DataFrame({
+        "date":        dates.normalize(),
+        "description": desc,
+        "is_credit":   is_credit,
+        "amount":      amount,
+    })
+    df["balance"] = np.round(
+        100_000 + np.where(df["is_credit"], df["amount"], -df["amount"]).cumsum(), 2,
+    )
+    return df
+
+
+# ─────────────────────────────────────────────────────────────
+# SYNTHETIC BANK EXPORT (wide CSV, as a core banking system emits it)
+# ─────────────────────────────────────────────────────────────
+
+def make_export(n: int, extra_cols: int = 12, seed: int = 0, **kwargs) -> pd.DataFrame:
+    """
+    Raw statement rows with string dates and formatted debit/credit
+    amounts, plus `extra_cols` long reference-number style columns.
+    """
+    rng    = np.random.default_rng(seed)
+    ledger = make_ledger(n, seed=seed, **kwargs)
+    fmt    = ledger["amount"].map("{:,.2f}".format)
+
+    df = pd.DataFrame({
+        "Txn Date":             ledger["date"].dt.strftime("%d/%m/%Y"),
+        "Value Date":           ledger["date"].dt.strftime("%d/%m/%Y"),
+        "Narration":            ledger["description"],
+        "Ref No":               rng.integers(10**15, 10**16, n).astype(str),
+        "Withdrawal Amt (INR)": fmt.where(~ledger["is_credit"], ""),
+        "Deposit Amt (INR)":    fmt.where(ledger["is_credit"], ""),
+        "Closing Balance":      ledger["balance"].map("{:,.2f}".format),
+    })
+    for i in range(extra_cols):
+        df[f"Field {i + 1}"] = "REF" + rng.integers(10**17, 10**18, n).astype(str)
+    return df
+
+
+def write_export_csv(path, n: int, **kwargs) -> str:
+    make_export(n, **kwargs).to_csv(path, index=False)
+    return str(path)
+
+
+# ─────────────────────────────────────────────────────────────
+# TIMING / MEMORY
+# ─────────────────────────────────────────────────────────────
+
+def timed(fn, *args, repeat: int = 1, **kwargs):
+    """Best-of-`repeat` wall time in seconds, plus the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0     = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best   = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def peak_rss_kb() -> int:
+    # ru_maxrss survives fork+exec and would report the parent's peak;
+    # VmHWM belongs to the fresh address space.
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
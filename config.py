@@ -9,7 +9,26 @@ FOOTER_TEXT  = "Copyright 2026 PFIS"
 
 # ── Anomaly / large-transaction thresholds ──────────────────────
 BIG_TRANSACTION_MULTIPLIER = 2.0    # threshold = mean + k*std
+LARGE_TXN_BASELINE         = "global"  # "grouped": large relative to own category and merchant
+LARGE_TXN_MAD_MULTIPLIER   = 8.0    # grouped threshold = median + k·1.4826·MAD of the group…
+LARGE_TXN_GROUP_QUANTILE   = 0.95   # …never below its quantile (k is high: amounts are right-skewed)
+LARGE_TXN_MIN_GROUP_ROWS   = 10     # merchants with fewer expenses are judged by category alone
 ANOMALY_CONTAMINATION      = 0.05   # Isolation Forest contamination
+ANOMALY_LARGE_DATA_ROWS    = 500_000  # more expenses than this → large-data mode:
+ANOMALY_SAMPLE_ROWS        = 100_000  #   fit on a month × category stratified sample of this size,
+ANOMALY_SCORE_BATCH_ROWS   = 250_000  #   score in batches of this many rows,
+ANOMALY_N_JOBS             = -1       #   on this many cores (-1 → all)
+ANOMALY_PARTIAL_FIT_ROWS   = 50_000 # expenses sampled for the fit when only some rows are re-scored
+ANOMALY_VELOCITY_WINDOWS   = ("24h", "7D")  # velocity features: expenses to the same merchant in these trailing windows,
+ANOMALY_SPEND_MEDIAN_DAYS  = 30     #   the day's spend against the median daily spend of this many prior days,
+ANOMALY_PAYEE_GAP_DAYS     = 90     #   days since the last expense to the same merchant, capped here
+ANOMALY_REFIT_DAYS         = 90     # saved ledger model is refitted once it is this old…
+ANOMALY_REFIT_GROWTH       = 2.0    # …or the ledger has this many times the expenses it was fitted on…
+ANOMALY_DRIFT_THRESHOLD    = 0.5    # …or new rows' mean feature moved this many stds from the fit
+ANOMALY_STREAM_Z           = 6.0    # streaming scorer flags robust z (vs category median/MAD) above this;
+                                    #   amounts are right-skewed, so ~5% of expenses sit past 6
+ANOMALY_STREAM_RATE        = 0.01   # step of the streaming median / MAD updates, in MADs
+ANOMALY_STREAM_MIN_ROWS    = 20     # categories seeded with fewer rows start from the global baseline
 
 # ── Health score weights ────────────────────────────────────────
 BASE_HEALTH_SCORE         = 60
@@ -35,11 +54,60 @@ DEFAULT_CATEGORY_BUDGETS = {
     "Investments":   25_000.0,
 }
 
+# ── Categorization cache ────────────────────────────────────────
+CATEGORY_CACHE_ENABLED     = True
+CATEGORY_CACHE_PATH        = ".pfis_cache/categories.sqlite3"
+CATEGORY_CACHE_MAX_ENTRIES = 500_000   # LRU-evicted beyond this
+CATEGORIZER_VERSION        = 2         # bump when categorizer.py's matching logic changes
+
+# ── Parallel categorization (opt-in via apply_categorization(parallel=True))
+CATEGORIZATION_WORKERS           = None       # None → os.cpu_count()
+PARALLEL_CATEGORIZATION_MIN_ROWS = 250_000    # smaller ledgers stay serial
+
+# ── Fuzzy merchant matching (after the exact MERCHANT_MAP passes) ──
+FUZZY_MATCH_ENABLED   = True
+FUZZY_MATCH_THRESHOLD = 0.75   # trigram Dice similarity, 0-1, accepted outright for long names
+FUZZY_MATCH_CANDIDATE = 0.6    # weaker candidates ("netflx") are accepted when one edit away
+FUZZY_MATCH_SHORT_LEN = 6      # names this short are only accepted when one edit away
+FUZZY_MATCH_MAX_TERMS = 8      # words (+ joined pairs) tried per description
+FUZZY_MATCH_GENERIC = {        # MERCHANT_MAP names that are plain keywords, not brands
+    "electricity", "insurance", "cashback", "salary", "dividend", "refund",
+}
+FUZZY_MATCH_STOPWORDS = {      # ordinary words one edit from a brand name
+    "rapid", "tomato", "aroma", "chroma", "grow", "grown", "grows", "user",
+}
+
 # ── Recurring-detection parameters ──────────────────────────────
 RECURRING_AMOUNT_TOLERANCE = 0.05   # 5% variation is still "same"
 RECURRING_MIN_OCCURRENCES  = 2
 RECURRING_DAY_WINDOW       = 5      # ±5 days counts as "same date"
 
+# ── Ingestion ───────────────────────────────────────────────────
+CSV_CHUNK_ROWS         = 100_000   # rows per chunk when streaming CSV uploads
+PDF_WORKERS            = None      # PDF page-extraction processes; None → os.cpu_count()
+PDF_PARALLEL_MIN_PAGES = 8         # shorter PDFs are extracted serially
+PDF_FAST_PARSER        = True      # line parser first, extract_tables per-page fallback
+INGEST_WORKERS         = None      # statements parsed at once; None → os.cpu_count()
+
+# ── Parsed-statement snapshot cache (Parquet, keyed by SHA-256 of the upload)
+STATEMENT_CACHE_ENABLED        = True          # only used when "Keep history" is on
+STATEMENT_CACHE_DIR            = ".pfis_cache/statements"
+STATEMENT_CACHE_MAX_BYTES      = 512 * 2**20   # LRU-evicted beyond this
+STATEMENT_CACHE_SCHEMA_VERSION = 1             # bump when load_data output changes
+
+# ── Persistent ledger (incremental append mode) ─────────────────
+LEDGER_STORE_ENABLED  = False                  # sidebar default for "Keep history"
+LEDGER_STORE_DIR      = ".pfis_cache/ledger"
+LEDGER_SCHEMA_VERSION = 3                      # bump when enriched columns change
+LEDGER_LOCK_TIMEOUT   = 60                     # seconds to wait for another session's append
+LEDGER_LOCK_STALE     = 600                    # older lock files are left over from a crash
+ANOMALY_MODEL_DIR     = ".pfis_cache/models"   # fitted anomaly model per ledger
+ANOMALY_MODEL_VERSION = 2                      # bump when the anomaly features change
+
+# ── Analytics backend ───────────────────────────────────────────
+ANALYTICS_BACKEND = "pandas"     # "duckdb" runs the ledger-wide aggregations as SQL (pip install duckdb)
+ANALYTICS_DB_PATH = ":memory:"   # or a file path, letting DuckDB spill very large ledgers to disk
+
 # ================================================================
 # CSV / EXCEL COLUMN ALIAS MAPS
 # Handles the many ways banks name their columns.
@@ -96,6 +164,15 @@ BALANCE_ALIASES = {
     "current balance", "avl balance", "bal",
 }
 
+# Date formats seen on Indian bank statements, day-first.
+# parse_date samples a column and picks the one that fits best.
+DATE_FORMATS = [
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y", "%d-%m-%y",
+    "%d-%b-%Y", "%d-%b-%y", "%d %b %Y", "%d %b %y", "%d/%b/%Y", "%d/%b/%y",
+    "%d %b '%y", "%d %b ’%y", "%d %B %Y", "%d-%B-%Y",
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S", "%d-%m-%Y %H:%M:%S",
+]
+
 # ================================================================
 # MERCHANT NORMALISATION MAP
 # key  : regex pattern matched against lower-cased raw description
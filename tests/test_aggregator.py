@@ -0,0 +1,82 @@
+"""DateIndex range totals and row windows against boolean date masks."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.aggregator import DateIndex
+
+_CATEGORIES = ["Food", "Shopping", "Transport", "Bills", "Salary"]
+
+
+def _ledger(n: int = 2_000, seed: int = 0, shuffled: bool = False) -> pd.DataFrame:
+    """Two years with a gap in March 2023 and times of day on every row."""
+    rng  = np.random.default_rng(seed)
+    days = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 730, n), unit="D")
+    days = days[(days < "2023-03-01") | (days >= "2023-04-01")]
+    date = days + pd.to_timedelta(rng.integers(0, 86_400, len(days)), unit="s")
+
+    category = pd.Categorical.from_codes(rng.integers(-1, len(_CATEGORIES), len(days)), _CATEGORIES)
+    df = pd.DataFrame({
+        "date":             date,
+        "category":         category,
+        "transaction_type": pd.Categorical.from_codes((rng.random(len(days)) < 0.2).astype("int8"),
+                                                      ["Expense", "Income"]),
+        "amount":           rng.gamma(2.0, 800.0, len(days)).round(2),
+    })
+    df = df.sort_values("date", kind="stable") if not shuffled else df
+    return df.reset_index(drop=True)
+
+
+_RANGES = [
+    (None,                  None),
+    (None,                  "2023-06-30"),
+    ("2024-06-01",          None),
+    ("2023-05-10",          "2023-05-10"),          # one day, both ends inclusive
+    ("2023-03-01",          "2023-03-31"),          # the gap: no rows
+    ("2023-06-30",          "2023-06-01"),          # start after end
+    ("2020-01-01",          "2020-12-31"),          # before the data
+    ("2026-01-01",          None),                  # after the data
+    (pd.Timestamp("2023-02-27 18:00"), pd.Timestamp("2023-04-02 06:00")),
+]
+
+
+def _mask(df, start, end) -> np.ndarray:
+    day  = df["date"].dt.normalize()
+    keep = pd.Series(True, index=df.index)
+    if start is not None:
+        keep &= day >= pd.Timestamp(start).normalize()
+    if end is not None:
+        keep &= day <= pd.Timestamp(end).normalize()
+    return keep.to_numpy()
+
+
+@pytest.fixture(params=[False, True], ids=["sorted", "shuffled"])
+def ledger(request):
+    return _ledger(shuffled=request.param)
+
+
+@pytest.mark.parametrize("start, end", _RANGES)
+def test_rows_match_the_mask(ledger, start, end):
+    rows = DateIndex(ledger).rows(start, end)
+    np.testing.assert_array_equal(np.arange(len(ledger))[rows], np.flatnonzero(_mask(ledger, start, end)))
+
+
+@pytest.mark.parametrize("start, end", _RANGES)
+@pytest.mark.parametrize("transaction_type", ["Expense", "Income"])
+def test_range_total_matches_the_mask(ledger, start, end, transaction_type):
+    index = DateIndex(ledger)
+    rows  = ledger[_mask(ledger, start, end) & (ledger["transaction_type"] == transaction_type)]
+
+    assert index.range_total(start, end, transaction_type=transaction_type) \
+        == pytest.approx(rows["amount"].sum())
+    for category in _CATEGORIES:
+        expected = rows.loc[rows["category"] == category, "amount"].sum()
+        assert index.range_total(start, end, category, transaction_type) == pytest.approx(expected)
+    assert index.range_total(start, end, "Not a category", transaction_type) == 0.0
+
+
+def test_empty_ledger():
+    index = DateIndex(_ledger().iloc[:0])
+    assert index.range_total(None, None) == 0.0
+    assert np.arange(0)[index.rows("2023-01-01", "2023-12-31")].size == 0
@@ -0,0 +1,35 @@
+"""Velocity features read only the expenses a batch needs, with the same values."""
+
+import numpy as np
+import pandas as pd
+
+from utils.anomaly_detector import _expense_positions, velocity_features
+
+
+def _ledger(n: int = 20_000, seed: int = 0) -> pd.DataFrame:
+    rng  = np.random.default_rng(seed)
+    date = pd.to_datetime(np.sort(rng.integers(pd.Timestamp("2023-01-01").value,
+                                               pd.Timestamp("2025-01-01").value, n))).floor("h")
+    return pd.DataFrame({
+        "date":             date,
+        "merchant":         pd.Categorical.from_codes(rng.zipf(1.4, n) % 200, [f"M{i}" for i in range(200)]),
+        "transaction_type": pd.Categorical.from_codes((rng.random(n) < 0.2).astype("int8"),
+                                                      ["Expense", "Income"]),
+        "amount":           rng.lognormal(6.0, 1.0, n).round(2),
+    })
+
+
+def test_batches_match_a_single_pass():
+    df        = _ledger()
+    positions = _expense_positions(df)
+    whole     = velocity_features(df, positions)
+    parts     = pd.concat([velocity_features(df, batch) for batch in np.array_split(positions, 7)])
+    pd.testing.assert_frame_equal(parts, whole)
+
+
+def test_later_expenses_do_not_change_earlier_features():
+    df     = _ledger()
+    cutoff = df["date"].iloc[len(df) // 2].normalize()
+    early  = _expense_positions(df)[df["date"].to_numpy()[_expense_positions(df)] < cutoff]
+    pd.testing.assert_frame_equal(velocity_features(df.iloc[:len(df) // 2 + 500], early),
+                                  velocity_features(df, early))
@@ -0,0 +1,106 @@
+"""Fuzzy merchant matching, and categorization through the on-disk cache."""
+
+import pandas as pd
+import pytest
+
+from config import FUZZY_MATCH_GENERIC
+from utils.categorizer import _FUZZY_TARGETS, categorization_columns, categorize_transaction, rules_fingerprint
+from utils import categorizer
+from utils.category_cache import CategoryCache
+
+
+def test_fuzzy_targets_are_brands_only():
+    keys = {key for key, _, _ in _FUZZY_TARGETS}
+    assert not keys & FUZZY_MATCH_GENERIC
+    assert {"swiggy", "bigbasket", "zerodha"} <= keys
+
+
+@pytest.mark.parametrize("description, expected", [
+    ("BIGBASKETT ORDER",  ("BigBasket",  "Food")),
+    ("MAKEMYTRP BOOKING", ("MakeMyTrip", "Travel")),
+    ("FLIPKARTT",         ("Flipkart",   "Shopping")),
+    ("SWIGGYY",           ("Swiggy",     "Food")),
+    ("SWIGY BANGALOR",    ("Swiggy",     "Food")),
+    ("AMZN MKTP",         ("Amazon",     "Shopping")),
+    ("FLIPKRT",           ("Flipkart",   "Shopping")),
+    ("NETFLX",            ("Netflix",    "Entertainment")),
+    ("MYNTR",             ("Myntra",     "Shopping")),
+    ("MESHO",             ("Meesho",     "Shopping")),
+    ("BLINKT",            ("Blinkit",    "Food")),
+    ("ZOMAT",             ("Zomato",     "Food")),
+])
+def test_brand_typos_still_match(description, expected):
+    assert categorize_transaction(description) == expected
+
+
+@pytest.mark.parametrize("description, wrong", [
+    ("RAPID TRADERS",                 "Rapido"),
+    ("UPI/9876/ELECTRICALS SHOP/pay", "Electricity"),
+    ("DIVIDENT PAID",                 "Dividend"),
+    ("SALARI CREDIT",                 "Salary"),
+    ("AMAZING STORE",                 "Amazon"),
+    ("TOMATO WHOLESALE",              "Zomato"),
+    ("GROW MORE NURSERY",             "Groww"),
+])
+def test_near_miss_words_do_not_fuzzy_match(description, wrong):
+    name, _ = categorize_transaction(description)
+    assert name != wrong
+
+
+def test_cache_counts_are_kept_quietly(tmp_path, capsys):
+    cache = CategoryCache(str(tmp_path / "categories.sqlite"), 1_000, rules_fingerprint())
+    df    = pd.DataFrame({"description": ["UPI-SWIGGY-PAY", "NETFLIX.COM", "UPI-SWIGGY-PAY"]})
+
+    first  = categorization_columns(df, cache)
+    second = categorization_columns(df, cache)
+
+    assert capsys.readouterr().out == ""
+    assert cache.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5}
+    assert first["category"].tolist() == second["category"].tolist() == ["Food", "Entertainment", "Food"]
+
+
+def test_categorizer_version_changes_the_fingerprint(monkeypatch):
+    before = rules_fingerprint()
+    monkeypatch.setattr(categorizer, "CATEGORIZER_VERSION", categorizer.CATEGORIZER_VERSION + 1)
+    assert rules_fingerprint() != before
+
+
+_PARITY_DESCRIPTIONS = [
+    "UPI Debit-ZOMATO LIMITED-zomato-order@ptbl-YESB0PTMUPI-155524826119-Zomato Payment",
+    "UPI Debit-NITIN A ZADPE-amzn0026735883@apl-604291961603",
+    "UPI Debit-Mr Om Sanjay Shikare-omshikare7077@okaxis-603568388030-Payment from slice",
+    "UPI Credit-RAHUL SHARMA-rahul.s@okicici-512345678901-rent share",
+    "NEFT CR-ACME TECHNOLOGIES PVT LTD-SALARY FEB",
+    "INTEREST CREDIT",
+    "ACH D- ZERODHA BROKING-1234567",
+    "POS 4321XXXX SWIGY BANGALOR",
+    "NETFLX.COM SUBSCRIPTION",
+    "UPI/9876/ELECTRICALS SHOP/pay",
+    "RAPID TRADERS",
+    "  netflix.com  ",
+    "ATM WDL 12345 MG ROAD",
+    "",
+    "   ",
+    None,
+    float("nan"),
+]
+
+
+def test_unique_path_matches_row_wise():
+    expected = [categorize_transaction(d) for d in _PARITY_DESCRIPTIONS]
+    merchants, categories = categorizer.categorize_unique(_PARITY_DESCRIPTIONS)
+    assert list(zip(merchants, categories)) == expected
+
+    merchants, categories = categorizer.categorize_unique_parallel(_PARITY_DESCRIPTIONS, workers=2)
+    assert list(zip(merchants, categories)) == expected
+
+
+def test_apply_categorization_matches_row_wise(tmp_path):
+    rows  = [_PARITY_DESCRIPTIONS[i % len(_PARITY_DESCRIPTIONS)] for i in range(5 * len(_PARITY_DESCRIPTIONS))]
+    df    = pd.DataFrame({"description": rows})
+    cache = CategoryCache(str(tmp_path / "categories.sqlite"), 1_000, rules_fingerprint())
+    expected = [categorize_transaction(d) for d in rows]
+
+    for _ in range(2):                  # computed, then served from the cache
+        out = categorizer.apply_categorization(df, cache)
+        assert list(zip(out["merchant"].astype(str), out["category"].astype(str))) == expected
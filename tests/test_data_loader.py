@@ -0,0 +1,226 @@
+"""
+Amount and date cleaners, CSV projection and streaming dedup, and
+serial / parallel parity of PDF page extraction.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_loader import (
+    _SeenKeys, clean_amount, extract_pdf_rows, finalize, infer_date_format,
+    load_csv_streaming, load_tabular, parse_date, process_tabular,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1,200 Dr",    -1200.0),
+    ("1,200 Cr",     1200.0),
+    ("500 Dr.",      -500.0),
+    ("Rs.500",        500.0),
+    ("rs 500",        500.0),
+    ("INR 75.25",      75.25),
+    ("₹ 1,234.50",   1234.5),
+    ("(1,200)",     -1200.0),
+    ("1200-",       -1200.0),
+    ("-40",           -40.0),
+    ("",             np.nan),
+    ("   ",          np.nan),
+    ("n/a",          np.nan),
+])
+def test_clean_amount_formats(text, expected):
+    for dtype in (object, "string"):
+        out = clean_amount(pd.Series([text, "0", text], dtype=dtype))
+        np.testing.assert_array_equal(out.to_numpy(), [expected, 0.0, expected])
+
+
+def test_clean_amount_blank_cells_and_numeric_columns():
+    out = clean_amount(pd.Series(["1,200 Dr", None, np.nan, "Rs.500"], dtype=object))
+    np.testing.assert_array_equal(out.to_numpy(), [-1200.0, np.nan, np.nan, 500.0])
+    assert clean_amount(pd.Series([1, 2])).dtype == float
+
+
+@pytest.mark.parametrize("dates, expected", [
+    (["04 Feb '26", "13 Mar '26"],  "%d %b '%y"),
+    (["13/01/2025", "02/03/2025"],  "%d/%m/%Y"),
+    (["2025-01-13", "2025-03-02"],  "%Y-%m-%d"),
+    (["13-Jan-25", "02-Mar-25"],    "%d-%b-%y"),
+    (["garbage", ""],               None),
+])
+def test_infer_date_format(dates, expected):
+    assert infer_date_format(pd.Series(dates * 3)) == expected
+
+
+def test_parse_date_mixed_formats_and_blanks():
+    text = pd.Series(["13/01/2025", "02/03/2025", "2025-03-04", "04 Feb '26", "05 Feb ’26",
+                      "2025-03-04 10:11:12", "", None, "garbage"] + ["13/01/2025"] * 5)
+    out  = parse_date(text)
+    assert out.tolist()[:9] == [
+        pd.Timestamp("2025-01-13"), pd.Timestamp("2025-03-02"), pd.Timestamp("2025-03-04"),
+        pd.Timestamp("2026-02-04"), pd.Timestamp("2026-02-05"), pd.Timestamp("2025-03-04 10:11:12"),
+        pd.NaT, pd.NaT, pd.NaT,
+    ]
+    assert (out.iloc[9:] == pd.Timestamp("2025-01-13")).all()
+    pd.testing.assert_series_equal(parse_date(text.astype("string")), out)
+
+
+def test_csv_projection_keeps_numeric_amounts(tmp_path):
+    path = tmp_path / "statement.csv"
+    path.write_text("Ref,Date,Description,Amount,Balance\n"
+                    "1,20240131,UPI-SWIGGY,250.5,1000\n"
+                    "2,20240201,0042,1200,-200.25\n")
+    raw = load_tabular(str(path), "statement.csv")
+
+    assert raw.columns.tolist() == ["Date", "Description", "Amount", "Balance"]
+    assert raw["Amount"].dtype.kind in "fi"
+    assert raw["Balance"].dtype.kind == "f"
+    assert raw["Description"].tolist() == ["UPI-SWIGGY", "0042"]
+    assert raw["Date"].tolist() == ["20240131", "20240201"]
+
+
+def _whole_file(path) -> pd.DataFrame:
+    return finalize(process_tabular(load_tabular(str(path), path.name)))
+
+
+def test_streaming_dedup_across_chunk_boundaries(tmp_path):
+    path = tmp_path / "statement.csv"
+    path.write_text("Date,Description,Amount\n"
+                    "01/01/2025,UPI-SWIGGY,-250\n"        # chunk 0
+                    "02/01/2025,UPI-UBER,-120\n"
+                    "03/01/2025,NEFT-SALARY,50000\n"
+                    "03/01/2025,NEFT-SALARY,50000\n"      # chunk 1, repeats the row before the boundary
+                    "04/01/2025,  UPI-UBER  ,-120\n"      # padded, and another day: kept
+                    "02/01/2025,UPI-UBER,-120\n"          # repeats a chunk 0 row
+                    "05/01/2025,ATM WDL,0\n"              # chunk 2, zero amount
+                    "01/01/2025,UPI-SWIGGY,-250\n"        # repeats the first row
+                    "06/01/2025,UPI-ZOMATO,-300\n")
+    streamed = load_csv_streaming(str(path), chunksize=3)
+
+    pd.testing.assert_frame_equal(streamed, _whole_file(path))
+    assert streamed["description"].tolist() == ["UPI-SWIGGY", "UPI-UBER", "NEFT-SALARY",
+                                              "UPI-UBER", "UPI-ZOMATO"]
+
+
+def test_streaming_matches_finalize_on_a_large_file(tmp_path):
+    rng  = np.random.default_rng(0)
+    n    = 1_000
+    rows = pd.DataFrame({
+        "Date":        (pd.Timestamp("2025-01-01")
+                        + pd.to_timedelta(rng.integers(0, 30, n), unit="D")).strftime("%d/%m/%Y"),
+        "Description": [f"UPI-PAYEE{k}" for k in rng.integers(0, 50, n)],
+        "Amount":      rng.choice([100, 250.5, -99, 1200, -40], n),
+    })
+    rows = pd.concat([rows, rows.iloc[rng.integers(0, n, 200)]]).sample(frac=1, random_state=1)
+    path = tmp_path / "statement.csv"
+    rows.to_csv(path, index=False)
+
+    pd.testing.assert_frame_equal(load_csv_streaming(str(path), chunksize=97), _whole_file(path))
+
+
+def test_seen_keys_matches_a_set():
+    rng, seen, expected = np.random.default_rng(0), _SeenKeys(), set()
+    for size in rng.integers(0, 200, 40):
+        keys = rng.integers(0, 5_000, size).astype(np.uint64)
+        assert seen.contains(keys).tolist() == [k in expected for k in keys.tolist()]
+        seen.add(keys)
+        expected.update(keys.tolist())
+
+
+def _text_pdf(pages) -> bytes:
+    """Minimal PDF, one Helvetica text line per (x, y, text) item on each page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for items in pages:
+        stream = "".join(f"BT /F1 9 Tf {x} {y} Td ({text}) Tj ET\n" for x, y, text in items)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}endstream")
+        objects.append("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = "%PDF-1.4\n", []
+    for n, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{n} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def _row(y, day, desc, amount):
+    return [(50, y, f"{day:02d}/01/2024"), (150, y, desc), (400, y, f"{amount:.2f}")]
+
+
+def _statement(n_pages, rows_per_page=5):
+    """Column header on the first page only; later pages continue headerless."""
+    pages = []
+    for p in range(n_pages):
+        items = [(50, 740, "Date"), (150, 740, "Description"), (400, 740, "Amount")] if p == 0 else []
+        for r in range(rows_per_page):
+            items += _row(700 - 20 * r, r + 1, f"UPI PAYMENT REF{p}N{r}", 100 + 10 * p + r)
+        pages.append(items)
+    return _text_pdf(pages)
+
+
+def test_parallel_matches_serial_on_headerless_continuation_pages(tmp_path):
+    path = tmp_path / "statement.pdf"
+    path.write_bytes(_statement(12))
+
+    serial   = extract_pdf_rows(str(path), workers=1)
+    parallel = extract_pdf_rows(str(path), workers=4)
+
+    assert parallel == serial
+    rows, report = serial
+    assert len(rows) == 1 + 12 * 5
+    assert {r["strategy"] for r in report} == {"text"}
+
+
+def test_parallel_follows_a_header_change_mid_statement(tmp_path):
+    pages = []
+    for p in range(12):
+        amount_x = 400 if p < 7 else 300
+        items = [(50, 740, "Date"), (150, 740, "Narration"), (amount_x, 740, "Amount")] if p in (0, 7) else []
+        for r in range(4):
+            items += [(50, 700 - 20 * r, f"{r + 1:02d}/02/2024"), (150, 700 - 20 * r, f"NEFT REF{p}N{r}"),
+                      (amount_x, 700 - 20 * r, f"{50 + p + r:.2f}")]
+        pages.append(items)
+    path = tmp_path / "statement.pdf"
+    path.write_bytes(_text_pdf(pages))
+
+    assert extract_pdf_rows(str(path), workers=4) == extract_pdf_rows(str(path), workers=1)
+
+
+_DEBIT_CREDIT_HEADER = [(50, 740, "Date"), (150, 740, "Description"), (300, 740, "Debit"),
+                        (400, 740, "Credit"), (480, 740, "Balance")]
+
+
+def test_right_aligned_amounts_under_left_aligned_headers(tmp_path):
+    # 12,345.00 ends around x 392: inside Debit, but nearer Credit's header centre
+    page = _DEBIT_CREDIT_HEADER + [
+        (50, 700, "05/01/2024"), (150, 700, "RENT TRANSFER"), (350, 700, "12,345.00"), (480, 700, "50,000.00"),
+        (50, 680, "06/01/2024"), (150, 680, "SALARY"), (430, 680, "90,000.00"), (480, 680, "140,000.00"),
+    ]
+    path = tmp_path / "statement.pdf"
+    path.write_bytes(_text_pdf([page]))
+
+    rows, report = extract_pdf_rows(str(path), workers=1)
+    assert report[0]["strategy"] == "text"
+    assert rows[1] == ["05/01/2024", "RENT TRANSFER", "12,345.00", "", "50,000.00"]
+    assert rows[2] == ["06/01/2024", "SALARY", "", "90,000.00", "140,000.00"]
+
+    df = process_tabular(pd.DataFrame(rows[1:], columns=rows[0]))
+    assert df["is_credit"].tolist() == [False, True]
+
+
+def test_amount_straddling_two_columns_falls_back_to_tables(tmp_path):
+    page = _DEBIT_CREDIT_HEADER + [
+        (50, 700, "05/01/2024"), (150, 700, "RENT TRANSFER"), (375, 700, "12,345.00"), (480, 700, "50,000.00"),
+    ]
+    path = tmp_path / "statement.pdf"
+    path.write_bytes(_text_pdf([page]))
+
+    _, report = extract_pdf_rows(str(path), workers=1)
+    assert report[0]["strategy"] == "tables"
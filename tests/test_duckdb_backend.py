@@ -0,0 +1,61 @@
+"""The DuckDB backend returns the same frames as the pandas path."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import aggregator, duckdb_backend
+from utils.aggregator import time_feature_columns
+
+pytest.importorskip("duckdb")
+
+_CATEGORIES = ["Food", "Shopping", "Transport", "Bills", "Salary"]
+
+
+def _ledger(n: int = 5_000, seed: int = 0) -> pd.DataFrame:
+    rng   = np.random.default_rng(seed)
+    start = pd.Timestamp("2022-01-01").value
+    stop  = pd.Timestamp("2025-01-01").value
+    df = pd.DataFrame({
+        "date":             pd.to_datetime(np.sort(rng.integers(start, stop, n))),
+        "merchant":         pd.Categorical.from_codes(rng.zipf(1.5, n) % 40,
+                                                      [f"Merchant {i:02d}" for i in range(40)]),
+        "category":         pd.Categorical.from_codes(rng.integers(0, len(_CATEGORIES), n), _CATEGORIES),
+        "transaction_type": pd.Categorical.from_codes((rng.random(n) < 0.2).astype("int8"),
+                                                      ["Expense", "Income"]),
+        "amount":           rng.gamma(2.0, 800.0, n).round(2),
+        "is_large":         rng.random(n) < 0.02,
+        "is_anomaly":       rng.random(n) < 0.01,
+    })
+    return df.assign(**time_feature_columns(df))
+
+
+_CALLS = {
+    "build_cube":               aggregator.build_cube,
+    "monthly_cashflow":         aggregator.monthly_cashflow,
+    "merchant_summary":         lambda df: aggregator.merchant_summary(df, top_n=10),
+    "monthly_category_summary": aggregator.monthly_category_summary,
+}
+
+_FRAMES = {
+    "ledger":        lambda: _ledger(),
+    "empty":         lambda: _ledger().iloc[:0],
+    "no flags":      lambda: _ledger().drop(columns=["is_large", "is_anomaly"]),
+    "no year_month": lambda: _ledger().drop(columns=["year_month"]),
+    "expenses only": lambda: _ledger().query("transaction_type == 'Expense'"),
+    "income only":   lambda: _ledger().query("transaction_type == 'Income'"),
+}
+
+
+@pytest.mark.parametrize("frame", _FRAMES)
+@pytest.mark.parametrize("call", _CALLS)
+def test_duckdb_matches_pandas(monkeypatch, frame, call):
+    df = _FRAMES[frame]()
+
+    monkeypatch.setattr(duckdb_backend, "ANALYTICS_BACKEND", "pandas")
+    expected = _CALLS[call](df)
+    monkeypatch.setattr(duckdb_backend, "ANALYTICS_BACKEND", "duckdb")
+    got = _CALLS[call](df)
+
+    pd.testing.assert_frame_equal(got.reset_index(drop=True), expected.reset_index(drop=True),
+                                  rtol=1e-9)
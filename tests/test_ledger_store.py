@@ -0,0 +1,101 @@
+"""Concurrent sessions share the ledger through its lock file."""
+
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.ledger_store as ledger_store
+import utils.model_store as model_store
+
+_MERCHANTS = ["ZOMATO LIMITED", "SWIGGY", "UBER INDIA", "NETFLIX", "AMAZON PAY"]
+
+
+@pytest.fixture(autouse=True)
+def _store(tmp_path, monkeypatch):
+    monkeypatch.setattr(ledger_store, "LEDGER_STORE_DIR", str(tmp_path / "ledger"))
+    monkeypatch.setattr(model_store, "ANOMALY_MODEL_DIR", str(tmp_path / "models"))
+
+
+def _statement(month: str, n: int = 60, seed: int = 0) -> pd.DataFrame:
+    """A month of load_data-shaped rows."""
+    rng  = np.random.default_rng(seed)
+    date = pd.Timestamp(month) + pd.to_timedelta(np.sort(rng.integers(0, 28, n)), unit="D")
+    desc = [f"UPI Debit-{_MERCHANTS[i % len(_MERCHANTS)]}-pay{seed}x{i}@ybl-{seed:03d}{i:06d}"
+            for i in range(n)]
+    amount = np.round(rng.lognormal(6.0, 0.8, n), 2)
+    return pd.DataFrame({
+        "date":        date,
+        "description": desc,
+        "is_credit":   np.zeros(n, dtype=bool),
+        "amount":      amount,
+        "balance":     np.round(200_000 - amount.cumsum(), 2),
+    })
+
+
+def _parts():
+    return [name for name in os.listdir(ledger_store.LEDGER_STORE_DIR) if name.endswith(".parquet")]
+
+
+def test_concurrent_appends_keep_every_row(capsys):
+    statements = [_statement(f"2025-{m:02d}-01", seed=m) for m in range(1, 5)]
+    threads    = [threading.Thread(target=ledger_store.append_to_ledger, args=(s,))
+                  for s in statements]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(_parts()) == len(statements)
+    assert len(ledger_store.load_ledger()) == sum(len(s) for s in statements)
+    assert capsys.readouterr().out == ""
+
+
+def test_append_waits_for_another_session():
+    thread = threading.Thread(target=ledger_store.append_to_ledger, args=(_statement("2025-01-01"),))
+    with ledger_store._locked():
+        thread.start()
+        time.sleep(0.3)
+        assert thread.is_alive()
+        assert _parts() == []
+    thread.join()
+    assert len(_parts()) == 1
+
+
+def test_stale_lock_is_taken_over():
+    os.makedirs(ledger_store.LEDGER_STORE_DIR)
+    lock = os.path.join(ledger_store.LEDGER_STORE_DIR, ledger_store._LOCK_NAME)
+    open(lock, "w").close()
+    old = time.time() - ledger_store.LEDGER_LOCK_STALE - 1
+    os.utime(lock, (old, old))
+
+    ledger_store.append_to_ledger(_statement("2025-01-01"))
+    assert len(_parts()) == 1
+    assert not os.path.exists(lock)
+
+
+def test_moved_ledger_keeps_its_model(tmp_path, monkeypatch):
+    ledger_store.append_to_ledger(_statement("2025-01-01"))
+    moved = str(tmp_path / "moved")
+    os.rename(ledger_store.LEDGER_STORE_DIR, moved)
+    monkeypatch.setattr(ledger_store, "LEDGER_STORE_DIR", moved)
+
+    with ledger_store._locked():
+        key = model_store.model_key(ledger_store._ledger_id())
+    assert model_store.load_model(key) is not None
+
+
+def test_cleared_ledger_gets_a_new_identity():
+    ledger_store.append_to_ledger(_statement("2025-01-01"))
+    with ledger_store._locked():
+        before = ledger_store._ledger_id()
+
+    ledger_store.clear_ledger()
+    assert os.listdir(model_store.ANOMALY_MODEL_DIR) == []
+
+    ledger_store.append_to_ledger(_statement("2025-02-01", seed=1))
+    with ledger_store._locked():
+        assert ledger_store._ledger_id() != before
@@ -5,44 +5,174 @@ Adds time-based features to a transaction DataFrame and provides
 aggregation helpers consumed by app.py and other modules.
 """
 
+import numpy as np
 import pandas as pd
 
+from utils import duckdb_backend
+from utils.schema import MONTH_NAMES, DAY_NAMES
+
+_MONTH_DTYPE = pd.CategoricalDtype(MONTH_NAMES, ordered=True)
+_DAY_DTYPE   = pd.CategoricalDtype(DAY_NAMES, ordered=True)
+
+
+def _calendar(date: pd.Series):
+    """Day / month / year counts since the epoch as datetime64 arrays."""
+    days   = date.to_numpy().astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    return days, months, months.astype("datetime64[Y]")
+
+
+def _year_month(months: np.ndarray) -> pd.Categorical:
+    distinct, codes = np.unique(months, return_inverse=True)
+    return pd.Categorical.from_codes(codes, distinct.astype(str))
+
+
+def year_month_column(date: pd.Series) -> pd.Categorical:
+    """'YYYY-MM' per row, labelled once per distinct month."""
+    return _year_month(_calendar(date)[1])
+
+
+def time_feature_columns(df: pd.DataFrame) -> dict:
+    """
+    year / month / day-of-week columns for `df`, in the compact layout.
+    Everything comes from integer datetime components; the name columns
+    are codes into the 12- and 7-entry tables. ISO week is left out —
+    call iso_week() where it is needed.
+    """
+    days, months, years = _calendar(df["date"])
+    month0 = months.astype("int64") % 12
+    dow    = (days.astype("int64") + 3) % 7        # 1970-01-01 was a Thursday
+
+    return {
+        "year":         pd.Series(years.astype("int64") + 1970, index=df.index, dtype="int16"),
+        "month_number": pd.Series(month0 + 1, index=df.index, dtype="int8"),
+        "month_name":   pd.Categorical.from_codes(month0, dtype=_MONTH_DTYPE),
+        "year_month":   _year_month(months),
+        "day_of_week":  pd.Categorical.from_codes(dow, dtype=_DAY_DTYPE),
+        "day":          pd.Series((days - months).astype("int64") + 1, index=df.index, dtype="int8"),
+    }
+
+
+def iso_week(df: pd.DataFrame) -> pd.Series:
+    """ISO week number, from `df["week"]` if present, else derived from the dates."""
+    if "week" in df.columns:
+        return df["week"]
+    days, _, _ = _calendar(df["date"])
+    dow      = (days.astype("int64") + 3) % 7
+    thursday = days - dow + 3                       # ISO weeks belong to their Thursday's year
+    jan1     = thursday.astype("datetime64[Y]").astype("datetime64[D]")
+    week     = (thursday - jan1).astype("int64") // 7 + 1
+    return pd.Series(week, index=df.index, dtype="int8", name="week")
+
 
 def add_time_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Attach year / month / week / day-of-week columns."""
-    df = df.copy()
-    df["year"]         = df["date"].dt.year
-    df["month_number"] = df["date"].dt.month
-    df["month_name"]   = df["date"].dt.month_name()
-    df["year_month"]   = df["date"].dt.to_period("M").astype(str)
-    df["week"]         = df["date"].dt.isocalendar().week.astype(int)
-    df["day_of_week"]  = df["date"].dt.day_name()
-    df["day"]          = df["date"].dt.day
-    return df
-
-
-def monthly_category_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """Attach year / month / day-of-week columns."""
+    return df.assign(**time_feature_columns(df))
+
+
+# ─────────────────────────────────────────────────────────────
+# MONTHLY AGGREGATE CUBE
+# ─────────────────────────────────────────────────────────────
+
+CUBE_KEYS    = ["year_month", "transaction_type", "category", "merchant"]
+CUBE_COLUMNS = CUBE_KEYS + ["amount", "count", "min", "max", "large", "anomalies",
+                            "year", "month_number"]
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per observed (year_month, transaction_type, category,
+    merchant) with the amount sum / count / min / max and the number of
+    large and anomalous rows. Built once per pipeline run; the summary
+    helpers, health score, insights, forecasts and PDF report read it
+    instead of rescanning the transactions.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+    if duckdb_backend.enabled():
+        return _with_calendar(duckdb_backend.cube(df))
+
+    frame = df[["transaction_type", "category", "merchant", "amount"]]
+    frame = frame.assign(
+        year_month=df["year_month"] if "year_month" in df.columns
+        else year_month_column(df["date"]),
+        large=df["is_large"] if "is_large" in df.columns else False,
+        anomalies=df["is_anomaly"] if "is_anomaly" in df.columns else False,
+    )
+
+    cube = (
+        frame.groupby(CUBE_KEYS, observed=True)
+        .agg(
+            amount=("amount", "sum"), count=("amount", "count"),
+            min=("amount", "min"), max=("amount", "max"),
+            large=("large", "sum"), anomalies=("anomalies", "sum"),
+        )
+        .reset_index()
+    )
+    return _with_calendar(cube)
+
+
+def _with_calendar(cube: pd.DataFrame) -> pd.DataFrame:
+    ym     = pd.Categorical(cube["year_month"])
+    labels = ym.categories.astype(str)
+    cube["year"]         = labels.str[:4].astype("int16").to_numpy()[ym.codes]
+    cube["month_number"] = labels.str[5:7].astype("int8").to_numpy()[ym.codes]
+    return cube
+
+
+def _cube(df, cube):
+    return build_cube(df) if cube is None else cube
+
+
+def expense_cells(cube: pd.DataFrame) -> pd.DataFrame:
+    return cube[cube["transaction_type"] == "Expense"]
+
+
+def type_total(cube: pd.DataFrame, transaction_type: str) -> float:
+    return float(cube.loc[cube["transaction_type"] == transaction_type, "amount"].sum())
+
+
+def month_count(cube: pd.DataFrame) -> int:
+    """Distinct calendar months with at least one transaction."""
+    return int(cube["year_month"].nunique())
+
+
+def category_totals(cube: pd.DataFrame) -> pd.Series:
+    """Expense total per category, largest first."""
+    return (
+        expense_cells(cube).groupby("category", observed=True)["amount"]
+        .sum()
+        .sort_values(ascending=False)
+    )
+
+
+def monthly_category_summary(df: pd.DataFrame, cube: pd.DataFrame | None = None) -> pd.DataFrame:
     """Monthly spend per category (expenses only)."""
-    expenses = df[df["transaction_type"] == "Expense"]
+    if cube is None and not df.empty and duckdb_backend.enabled():
+        return duckdb_backend.monthly_category_summary(df)
+    expenses = expense_cells(_cube(df, cube))
     if expenses.empty:
         return pd.DataFrame(columns=["year_month", "category", "amount"])
     return (
         expenses
-        .groupby(["year_month", "category"])["amount"]
+        .groupby(["year_month", "category"], observed=True)["amount"]
         .sum()
         .reset_index()
-        .sort_values("year_month")
+        .sort_values("year_month", kind="stable")
     )
 
 
-def merchant_summary(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
+def merchant_summary(df: pd.DataFrame, top_n: int = 10,
+                     cube: pd.DataFrame | None = None) -> pd.DataFrame:
     """Top N merchants by total spend (expenses only)."""
-    expenses = df[df["transaction_type"] == "Expense"]
+    if cube is None and not df.empty and duckdb_backend.enabled():
+        return duckdb_backend.merchant_summary(df, top_n)
+    expenses = expense_cells(_cube(df, cube))
     if expenses.empty:
         return pd.DataFrame(columns=["merchant", "amount"])
     return (
         expenses
-        .groupby("merchant")["amount"]
+        .groupby("merchant", observed=True)["amount"]
         .sum()
         .reset_index()
         .sort_values("amount", ascending=False)
@@ -50,12 +180,15 @@ def merchant_summary(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
     )
 
 
-def monthly_cashflow(df: pd.DataFrame) -> pd.DataFrame:
+def monthly_cashflow(df: pd.DataFrame, cube: pd.DataFrame | None = None) -> pd.DataFrame:
     """Monthly income and expense totals, with net savings."""
-    if df.empty:
+    if cube is None and not df.empty and duckdb_backend.enabled():
+        return duckdb_backend.monthly_cashflow(df)
+    cube = _cube(df, cube)
+    if cube.empty:
         return pd.DataFrame(columns=["year_month", "Income", "Expense", "Savings"])
     pivot = (
-        df.groupby(["year_month", "transaction_type"])["amount"]
+        cube.groupby(["year_month", "transaction_type"], observed=True)["amount"]
         .sum()
         .unstack(fill_value=0)
         .reset_index()
@@ -63,4 +196,70 @@ def monthly_cashflow(df: pd.DataFrame) -> pd.DataFrame:
     pivot["Income"]  = pivot.get("Income",  pd.Series(0, index=pivot.index))
     pivot["Expense"] = pivot.get("Expense", pd.Series(0, index=pivot.index))
     pivot["Savings"] = pivot["Income"] - pivot["Expense"]
-    return pivot.sort_values("year_month")
\ No newline at end of file
+    return pivot.sort_values("year_month")
+
+
+# ─────────────────────────────────────────────────────────────
+# DATE INDEX
+# ─────────────────────────────────────────────────────────────
+
+_TYPES = ["Expense", "Income"]
+
+
+def _day(value) -> np.datetime64:
+    return np.datetime64(value, "D")
+
+
+class DateIndex:
+    """
+    Row dates sorted once, plus per-day cumulative expense / income
+    totals by category. A date-range total or row window is then a
+    searchsorted and a subtraction rather than a scan of the frame.
+    Both ends of a range are inclusive calendar days; None is open.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        dates = df["date"].to_numpy().astype("datetime64[D]")
+        self.order = None
+        if len(dates) and not (dates[1:] >= dates[:-1]).all():
+            self.order = np.argsort(dates, kind="stable")
+            dates = dates[self.order]
+        self.row_days = dates
+        self.days, day_codes = np.unique(dates, return_inverse=True)
+
+        category = pd.Categorical(df["category"])
+        self.categories = {name: i for i, name in enumerate(category.categories)}
+        width    = len(self.categories) + 1             # last column: uncategorized
+        cat_codes = np.where(category.codes < 0, width - 1, category.codes)
+        income    = (df["transaction_type"] == "Income").to_numpy()
+        amount    = df["amount"].to_numpy(dtype="float64")
+        if self.order is not None:
+            cat_codes, income, amount = cat_codes[self.order], income[self.order], amount[self.order]
+
+        cells = day_codes * width + cat_codes
+        self._cum = np.zeros((len(_TYPES), len(self.days) + 1, width))
+        for t, rows in enumerate([~income, income]):
+            daily = np.bincount(cells[rows], weights=amount[rows], minlength=len(self.days) * width)
+            self._cum[t, 1:] = daily.reshape(len(self.days), width).cumsum(axis=0)
+        self._cum_all = self._cum.sum(axis=2)
+
+    def _bounds(self, keys, start, end):
+        lo = 0 if start is None else keys.searchsorted(_day(start), "left")
+        hi = len(keys) if end is None else keys.searchsorted(_day(end), "right")
+        return lo, max(lo, hi)
+
+    def range_total(self, start, end, category=None, transaction_type: str = "Expense") -> float:
+        """Sum of `transaction_type` amounts dated start..end, optionally for one category."""
+        lo, hi = self._bounds(self.days, start, end)
+        t = _TYPES.index(transaction_type)
+        if category is None:
+            return float(self._cum_all[t, hi] - self._cum_all[t, lo])
+        col = self.categories.get(category)
+        if col is None:
+            return 0.0
+        return float(self._cum[t, hi, col] - self._cum[t, lo, col])
+
+    def rows(self, start, end):
+        """Positions of the rows dated start..end: a slice when the frame is date-sorted."""
+        lo, hi = self._bounds(self.row_days, start, end)
+        return slice(lo, hi) if self.order is None else np.sort(self.order[lo:hi])
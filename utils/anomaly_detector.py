@@ -7,84 +7,467 @@ Improved anomaly detection using better feature engineering.
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import IsolationForest
-from config import BIG_TRANSACTION_MULTIPLIER, ANOMALY_CONTAMINATION
+from config import (
+    BIG_TRANSACTION_MULTIPLIER, LARGE_TXN_BASELINE, LARGE_TXN_MAD_MULTIPLIER,
+    LARGE_TXN_GROUP_QUANTILE, LARGE_TXN_MIN_GROUP_ROWS, ANOMALY_CONTAMINATION, ANOMALY_PARTIAL_FIT_ROWS,
+    ANOMALY_LARGE_DATA_ROWS, ANOMALY_SAMPLE_ROWS, ANOMALY_SCORE_BATCH_ROWS, ANOMALY_N_JOBS,
+    ANOMALY_STREAM_Z, ANOMALY_STREAM_RATE, ANOMALY_STREAM_MIN_ROWS,
+    ANOMALY_VELOCITY_WINDOWS, ANOMALY_SPEND_MEDIAN_DAYS, ANOMALY_PAYEE_GAP_DAYS,
+)
+import math
 
 
 # ─────────────────────────────────────────────────────────────
 # LARGE TRANSACTION DETECTION (same but cleaner)
 # ─────────────────────────────────────────────────────────────
 
-def detect_large_transactions(df: pd.DataFrame):
+def large_transaction_columns(df: pd.DataFrame):
     """
-    Flag transactions larger than mean + k * std
+    Flag transactions larger than mean + k * std.
+    Returns ({"is_large": mask}, threshold) without touching df.
+    With LARGE_TXN_BASELINE = "grouped" see grouped_large_columns.
     """
-    df = df.copy()
-    expenses = df[df["transaction_type"] == "Expense"]["amount"]
+    if LARGE_TXN_BASELINE == "grouped":
+        return grouped_large_columns(df), float("nan")
+
+    is_expense = df["transaction_type"] == "Expense"
+    expenses = df["amount"][is_expense]
 
     if expenses.empty or expenses.std() == 0:
-        df["is_large"] = False
-        return df, 0.0
+        return {"is_large": np.zeros(len(df), dtype=bool)}, 0.0
 
     mean = expenses.mean()
     std = expenses.std()
 
     threshold = mean + BIG_TRANSACTION_MULTIPLIER * std
 
-    df["is_large"] = (
-        (df["transaction_type"] == "Expense") &
-        (df["amount"] > threshold)
-    )
+    is_large = is_expense & (df["amount"] > threshold)
+
+    return {"is_large": is_large.to_numpy()}, float(threshold)
+
+
+def _group_thresholds(amount: pd.Series, key: pd.Series):
+    """Per-row robust threshold of the row's group, and the group's size."""
+    groups = amount.groupby(key, observed=True)
+    median = groups.transform("median")
+    mad    = (amount - median).abs().groupby(key, observed=True).transform("median")
+    robust = median + LARGE_TXN_MAD_MULTIPLIER * 1.4826 * mad
+    floor  = groups.transform("quantile", LARGE_TXN_GROUP_QUANTILE)
+    return np.maximum(robust, floor).to_numpy(), groups.transform("size").to_numpy()
+
+
+def grouped_large_columns(df: pd.DataFrame) -> dict:
+    """
+    {"is_large": mask} relative to each expense's own group: above its
+    category's threshold and, when the merchant has at least
+    LARGE_TXN_MIN_GROUP_ROWS expenses, above the merchant's too. A
+    group's threshold is median + k·1.4826·MAD, floored at its
+    LARGE_TXN_GROUP_QUANTILE quantile, so a ₹40,000 rent does not set
+    the bar for Food.
+    """
+    flags     = np.zeros(len(df), dtype=bool)
+    positions = _expense_positions(df)
+    if not len(positions):
+        return {"is_large": flags}
+
+    amount   = pd.Series(df["amount"].to_numpy()[positions])
+    category = (pd.Series(df["category"].to_numpy()[positions]) if "category" in df.columns
+                else pd.Series(np.zeros(len(positions), dtype="int8")))
+    threshold, _ = _group_thresholds(amount, category)
+    large = amount.to_numpy() > threshold
+
+    if "merchant" in df.columns:
+        threshold, size = _group_thresholds(amount, pd.Series(df["merchant"].to_numpy()[positions]))
+        large &= (size < LARGE_TXN_MIN_GROUP_ROWS) | (amount.to_numpy() > threshold)
+
+    flags[positions] = large
+    return {"is_large": flags}
 
-    return df, float(threshold)
+
+def detect_large_transactions(df: pd.DataFrame):
+    """Copy of `df` with is_large, plus the threshold used."""
+    columns, threshold = large_transaction_columns(df)
+    return df.assign(**columns), threshold
 
 
 # ─────────────────────────────────────────────────────────────
-# ANOMALY DETECTION (UPGRADED 🔥)
+# VELOCITY FEATURES
 # ─────────────────────────────────────────────────────────────
+# Expenses are sorted by (merchant, time) once; every trailing-window
+# count is then one searchsorted over a merchant-major time key, the
+# same lookup DateIndex uses for date ranges.
+
+_DAY = 86_400
+
+
+def _payees(df: pd.DataFrame, rows: np.ndarray) -> np.ndarray:
+    """Merchant codes for `rows`; rows without a merchant each count as their own payee."""
+    if "merchant" not in df.columns:
+        return np.arange(len(rows), dtype="int64")
+    codes = pd.Categorical(df["merchant"]).codes[rows].astype("int64")
+    missing = codes < 0
+    codes[missing] = codes.max(initial=0) + 1 + np.arange(missing.sum())
+    return codes
+
 
-def detect_anomalies(df: pd.DataFrame):
+def velocity_features(df: pd.DataFrame, positions: np.ndarray | None = None) -> pd.DataFrame:
     """
-    Improved anomaly detection using:
-    - amount
-    - log(amount)
-    - day of month
+    Time-based features for the expenses at `positions` (all expenses
+    by default), read off the expenses around them:
+    - merchant_<window>: expenses to the same merchant in each trailing
+      ANOMALY_VELOCITY_WINDOWS window, up to and including this one
+    - spend_vs_median: log of the day's total spend over the median
+      daily spend of the ANOMALY_SPEND_MEDIAN_DAYS days before it
+    - payee_gap_days: days since the previous expense to the same
+      merchant, capped at ANOMALY_PAYEE_GAP_DAYS
+
+    Only expenses from the look-back before the earliest position to
+    the end of the latest position's day are read. The features only
+    look backward, so a new month or a scoring batch does not walk the
+    rest of the history.
     """
+    expenses  = _expense_positions(df)
+    positions = expenses if positions is None else np.asarray(positions)
+    features  = pd.DataFrame(index=positions)
+    if "date" not in df.columns or len(positions) == 0:
+        for window in ANOMALY_VELOCITY_WINDOWS:
+            features[f"merchant_{window}"] = 1.0
+        features["spend_vs_median"] = 0.0
+        features["payee_gap_days"]  = float(ANOMALY_PAYEE_GAP_DAYS)
+        return features
 
-    df = df.copy()
-    expense_df = df[df["transaction_type"] == "Expense"]
+    date     = df["date"].to_numpy()
+    lookback = np.timedelta64(max(ANOMALY_PAYEE_GAP_DAYS, ANOMALY_SPEND_MEDIAN_DAYS), "D")
+    first    = date[positions].min() - lookback
+    last     = date[positions].max().astype("datetime64[D]") + np.timedelta64(1, "D")
+    within   = date[expenses]
+    context  = expenses[(within >= first) & (within < last)]
+    at       = np.searchsorted(context, positions)
 
-    # Not enough data → skip
-    if len(expense_df) < 10:
-        df["is_anomaly"] = False
-        return df
+    when  = date[context]
+    secs  = (when - when.min()) // np.timedelta64(1, "s")
+    payee = _payees(df, context)
+    spans = {w: pd.Timedelta(w) // pd.Timedelta(seconds=1) for w in ANOMALY_VELOCITY_WINDOWS}
+    order = np.lexsort((secs, payee))
+    key   = payee[order] * (secs.max() + 1 + max(spans.values())) + secs[order]
 
-    features = pd.DataFrame(index=expense_df.index)
+    def unsort(values: np.ndarray) -> np.ndarray:
+        out = np.empty(len(values))
+        out[order] = values
+        return out[at]
+
+    # Per-merchant counts: rows with key in (t - window, t]
+    upto = np.searchsorted(key, key, side="right")
+    for window, span in spans.items():
+        features[f"merchant_{window}"] = unsort(upto - np.searchsorted(key, key - span, side="right"))
+
+    # Daily spend against the trailing median, zero-spend days included
+    days   = when.astype("datetime64[D]")
+    index  = (days - days.min()).astype("int64")
+    daily  = pd.Series(np.bincount(index, weights=df["amount"].to_numpy()[context]),
+                       index=pd.date_range(days.min(), periods=index.max() + 1, freq="D"))
+    median = daily.rolling(f"{ANOMALY_SPEND_MEDIAN_DAYS}D", closed="left").median()
+    ratio  = (np.log1p(daily) - np.log1p(median)).fillna(0.0).to_numpy()
+    features["spend_vs_median"] = ratio[index[at]]
+
+    # Gap to the previous expense to the same payee
+    gap = np.full(len(key), float(ANOMALY_PAYEE_GAP_DAYS))
+    same = payee[order][1:] == payee[order][:-1]
+    gap[1:][same] = np.diff(secs[order])[same] / _DAY
+    features["payee_gap_days"] = unsort(np.minimum(gap, ANOMALY_PAYEE_GAP_DAYS))
+
+    return features
+
+
+# ─────────────────────────────────────────────────────────────
+# ANOMALY DETECTION (UPGRADED 🔥)
+# ─────────────────────────────────────────────────────────────
+
+def _features(df: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+    """Raw (un-normalized) model features for the rows at `positions`."""
+    features = pd.DataFrame(index=positions)
 
     # Feature 1: amount
-    features["amount"] = expense_df["amount"]
+    features["amount"] = df["amount"].to_numpy()[positions]
 
     # Feature 2: log amount (VERY IMPORTANT)
     features["log_amount"] = np.log1p(features["amount"])
 
     # Feature 3: day of month (behavior pattern)
-    if "day" in expense_df.columns:
-        features["day"] = expense_df["day"].astype(float)
+    if "day" in df.columns:
+        features["day"] = df["day"].to_numpy()[positions].astype(float)
     else:
         features["day"] = 0
 
-    # Optional normalization (makes model stable)
-    features = (features - features.mean()) / (features.std() + 1e-6)
+    # Features 4+: merchant velocity, daily spend burst, payee gap
+    velocity = velocity_features(df, positions)
+    for name in velocity.columns:
+        features[name] = velocity[name].to_numpy()
+
+    return features
+
+
+def _expense_positions(df: pd.DataFrame) -> np.ndarray:
+    return np.flatnonzero((df["transaction_type"] == "Expense").to_numpy())
+
+
+def _batches(positions: np.ndarray):
+    for start in range(0, len(positions), ANOMALY_SCORE_BATCH_ROWS):
+        yield start, positions[start:start + ANOMALY_SCORE_BATCH_ROWS]
+
+
+def _batched_stats(df: pd.DataFrame, positions: np.ndarray):
+    """Feature mean / std accumulated batch by batch, never holding the full feature frame."""
+    total = squares = 0
+    for _, batch in _batches(positions):
+        features = _features(df, batch)
+        total   += features.sum()
+        squares += (features ** 2).sum()
+    n    = len(positions)
+    mean = total / n
+    var  = ((squares - n * mean ** 2) / (n - 1)).clip(lower=0)
+    return mean, np.sqrt(var) + 1e-6
+
+
+def _stratified_sample(df: pd.DataFrame, positions: np.ndarray, size: int) -> np.ndarray:
+    """
+    About `size` of `positions`, drawn proportionally from every
+    calendar month × category stratum; each stratum keeps at least one
+    row so rare months and categories still shape the trees.
+    """
+    months = df["date"].to_numpy()[positions].astype("datetime64[M]").astype("int64")
+    months -= months.min()
+    if "category" in df.columns:
+        codes = pd.Categorical(df["category"]).codes[positions].astype("int64") + 1
+    else:
+        codes = np.zeros(len(positions), dtype="int64")
+    strata = months * (codes.max() + 1) + codes
+
+    # Rank rows within their stratum in a random order, keep the first quota
+    order  = np.random.default_rng(42).permutation(len(positions))
+    by_str = np.argsort(strata[order], kind="stable")
+    sorted_strata = strata[order][by_str]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_strata)) + 1]
+    counts = np.diff(np.r_[starts, len(positions)])
+    rank   = np.arange(len(positions)) - np.repeat(starts, counts)
+    quota  = np.maximum(1, np.round(counts * size / len(positions))).astype("int64")
+    keep   = order[by_str[rank < np.repeat(quota, counts)]]
+    return positions[np.sort(keep)]
+
+
+def fit_anomaly_model(df: pd.DataFrame, max_rows: int | None = None) -> dict | None:
+    """
+    IsolationForest over df's expenses, with the normalization stats it
+    was trained under. Fits on at most `max_rows` sampled expenses.
+    None when there are fewer than 10 expenses.
+
+    Past ANOMALY_LARGE_DATA_ROWS expenses the fit switches to the
+    large-data mode: stats accumulated in batches, a stratified
+    ANOMALY_SAMPLE_ROWS training sample and ANOMALY_N_JOBS cores.
+    """
+    positions = _expense_positions(df)
+    if len(positions) < 10:
+        return None
+
+    large = len(positions) > ANOMALY_LARGE_DATA_ROWS
+    if large:
+        mean, std = _batched_stats(df, positions)
+        sample    = _stratified_sample(df, positions, min(max_rows or ANOMALY_SAMPLE_ROWS,
+                                                          ANOMALY_SAMPLE_ROWS))
+        features  = (_features(df, sample) - mean) / std
+    else:
+        features = _features(df, positions)
+
+        # Optional normalization (makes model stable)
+        mean, std = features.mean(), features.std() + 1e-6
+        features  = (features - mean) / std
+
+        if max_rows is not None and len(features) > max_rows:
+            features = features.sample(max_rows, random_state=42)
 
     # Model
     model = IsolationForest(
         n_estimators=150,                 # slightly higher → better detection
         contamination=ANOMALY_CONTAMINATION,
         random_state=42,
+        n_jobs=ANOMALY_N_JOBS if large else None,
     )
+    model.fit(features)
+
+    return {
+        "model":      model,
+        "mean":       mean,
+        "std":        std,
+        "n_expenses": len(positions),
+        "fitted_at":  pd.Timestamp.now().isoformat(),
+    }
+
+
+def score_anomalies(state: dict, df: pd.DataFrame, positions: np.ndarray) -> np.ndarray:
+    """Anomaly flags for the rows at `positions` under a fitted `state`, in batches."""
+    flags = np.zeros(len(positions), dtype=bool)
+    for start, batch in _batches(positions):
+        features = (_features(df, batch) - state["mean"]) / state["std"]
+        flags[start:start + len(batch)] = state["model"].predict(features) == -1
+    return flags
+
+
+def feature_drift(state: dict, df: pd.DataFrame, rows) -> float:
+    """
+    Largest shift of the mean feature of `rows`' expenses from the
+    fitted mean, in fitted standard deviations. 0.0 below 30 expenses,
+    where the mean is too noisy to tell.
+    """
+    positions = _expense_positions(df)
+    positions = positions[np.asarray(rows, dtype=bool)[positions]]
+    if len(positions) < 30:
+        return 0.0
+    shift = (_features(df, positions).mean() - state["mean"]) / state["std"]
+    return float(shift.abs().max())
+
+
+def anomaly_columns(df: pd.DataFrame, rows=None, state: dict | None = None) -> dict:
+    """
+    Improved anomaly detection using:
+    - amount
+    - log(amount)
+    - day of month
+    - per-merchant velocity, daily spend burst and payee gap
+      (velocity_features)
+
+    Returns {"is_anomaly": mask} without touching df.
+    `rows` (boolean mask over df) limits scoring to those rows; the
+    other rows keep their existing is_anomaly flag. The model is then
+    fitted on at most ANOMALY_PARTIAL_FIT_ROWS sampled expenses, so
+    scoring a few new rows does not cost a full-history fit. With a
+    saved `state` (fit_anomaly_model) nothing is fitted; rows are
+    only scored.
+    """
+
+    if rows is None or "is_anomaly" not in df.columns:
+        flags = np.zeros(len(df), dtype=bool)
+    else:
+        flags = df["is_anomaly"].fillna(False).to_numpy(dtype=bool, copy=True)
+        flags[np.asarray(rows, dtype=bool)] = False
+
+    if state is None:
+        state = fit_anomaly_model(df, ANOMALY_PARTIAL_FIT_ROWS if rows is not None else None)
+
+    # Not enough data → skip
+    if state is None:
+        return {"is_anomaly": flags}
+
+    target = _expense_positions(df)
+    if rows is not None:
+        target = target[np.asarray(rows, dtype=bool)[target]]
+    flags[target] = score_anomalies(state, df, target)
+
+    return {"is_anomaly": flags}
+
+
+def detect_anomalies(df: pd.DataFrame, rows=None, state: dict | None = None):
+    """Copy of `df` with is_anomaly (see anomaly_columns)."""
+    return df.assign(**anomaly_columns(df, rows, state))
+
+
+# ─────────────────────────────────────────────────────────────
+# STREAMING SCORER
+# ─────────────────────────────────────────────────────────────
+
+_STREAM_FEATURES = ["amount", "log_amount", "day"]
+_MAD_TO_STD      = 1.4826
+
+
+def _txn_features(txn) -> tuple:
+    amount = float(txn["amount"])
+    day    = txn["day"] if "day" in txn else txn["date"].day
+    return amount, math.log1p(amount), float(day)
+
+
+class StreamingScorer:
+    """
+    Per-transaction anomaly check on the detect_anomalies features
+    (amount, log amount, day of month). Each category keeps a running
+    median and MAD per feature; a transaction's score is its largest
+    robust z-score against its category, flagged above ANOMALY_STREAM_Z.
+
+    Seeded from history in one groupby pass (from_history); after that
+    score_one() and update() are O(1). The running estimates step by
+    ANOMALY_STREAM_RATE MADs toward each new value, so they follow
+    gradual change but barely move on a single outlier.
+    """
+
+    def __init__(self, baseline: list, by_category: dict | None = None):
+        self.baseline    = baseline          # [median, mad] × features, all expenses
+        self.by_category = by_category or {}
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame) -> "StreamingScorer":
+        positions = _expense_positions(df)
+        if not len(positions):
+            return cls([0.0, 1.0] * len(_STREAM_FEATURES))
+
+        features = _features(df, positions)[_STREAM_FEATURES]
+        median   = features.median()
+        baseline = _median_mad(median, (features - median).abs().median())
+
+        by_category = {}
+        if "category" in df.columns:
+            category = pd.Series(df["category"].to_numpy()[positions], index=positions)
+            groups   = features.groupby(category, observed=True)
+            medians  = groups.median()
+            mads     = (features - groups.transform("median")).abs().groupby(category, observed=True).median()
+            sizes    = groups.size()
+            for name in medians.index:
+                if sizes[name] >= ANOMALY_STREAM_MIN_ROWS:
+                    by_category[name] = _median_mad(medians.loc[name], mads.loc[name])
+        return cls(baseline, by_category)
+
+    def _state(self, txn) -> list:
+        category = txn.get("category")
+        state    = self.by_category.get(category)
+        if state is None:
+            state = self.by_category[category] = list(self.baseline)
+        return state
+
+    def score_one(self, txn, update: bool = True) -> tuple[float, bool]:
+        """
+        (robust z-score, is_anomaly) for one transaction — a dict or row
+        with amount, category, transaction_type and day (or date).
+        Income is never flagged. The category's estimates are then
+        updated with it unless update=False.
+        """
+        if txn.get("transaction_type", "Expense") != "Expense":
+            return 0.0, False
+
+        state = self._state(txn)
+        score = 0.0
+        for i, x in enumerate(_txn_features(txn)):
+            median, mad = state[2 * i], state[2 * i + 1]
+            z = abs(x - median) / (_MAD_TO_STD * mad)
+            if z > score:
+                score = z
+        if update:
+            self._step(state, txn)
+        return score, score > ANOMALY_STREAM_Z
+
+    def update(self, txn):
+        """Fold one expense into its category's running median / MAD."""
+        if txn.get("transaction_type", "Expense") == "Expense":
+            self._step(self._state(txn), txn)
 
-    preds = model.fit_predict(features)
+    def _step(self, state: list, txn):
+        for i, x in enumerate(_txn_features(txn)):
+            median, mad = state[2 * i], state[2 * i + 1]
+            step  = ANOMALY_STREAM_RATE * mad
+            dev   = x - median
+            state[2 * i]     = median + (step if dev > 0 else -step if dev < 0 else 0.0)
+            state[2 * i + 1] = mad + (step if abs(dev) > mad else -step)
 
-    df["is_anomaly"] = False
-    df.loc[expense_df.index, "is_anomaly"] = (preds == -1)
 
-    return df
\ No newline at end of file
+def _median_mad(median: pd.Series, mad: pd.Series) -> list:
+    """[median, mad] per stream feature; a zero MAD is floored so scores stay finite."""
+    out = []
+    for col in _STREAM_FEATURES:
+        out += [float(median[col]), max(float(mad[col]), 1e-6 + 1e-3 * abs(float(median[col])))]
+    return out
@@ -4,15 +4,34 @@ utils/categorizer.py
 Improved transaction categorization with robust text cleaning.
 """
 
+import hashlib
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 import pandas as pd
-from config import MERCHANT_MAP
+from config import (
+    MERCHANT_MAP,
+    CATEGORY_CACHE_ENABLED, CATEGORY_CACHE_PATH, CATEGORY_CACHE_MAX_ENTRIES, CATEGORIZER_VERSION,
+    CATEGORIZATION_WORKERS, PARALLEL_CATEGORIZATION_MIN_ROWS,
+    FUZZY_MATCH_ENABLED, FUZZY_MATCH_THRESHOLD, FUZZY_MATCH_CANDIDATE,
+    FUZZY_MATCH_SHORT_LEN, FUZZY_MATCH_MAX_TERMS, FUZZY_MATCH_GENERIC, FUZZY_MATCH_STOPWORDS,
+)
+from utils.category_cache import CategoryCache
+from utils.trigram_index import TrigramIndex
+from utils.schema import broadcast_categorical
 
 
 # ─────────────────────────────────────────────────────────────
 # NEW: Normalization layer (BIG upgrade)
 # ─────────────────────────────────────────────────────────────
 
+_HANDLE_STRIP_RE = re.compile(r"[\w\.-]+@[\w]+")
+_NON_ALPHA_RE    = re.compile(r"[^a-z\s]")
+_SPACES_RE       = re.compile(r"\s+")
+
+
 def normalize_description(desc: str) -> str:
     """
     Clean messy transaction strings like:
@@ -25,17 +44,28 @@ def normalize_description(desc: str) -> str:
     desc = str(desc).lower()
 
     # Remove UPI handles
-    desc = re.sub(r"[\w\.-]+@[\w]+", " ", desc)
+    desc = _HANDLE_STRIP_RE.sub(" ", desc)
 
     # Replace special chars with space
-    desc = re.sub(r"[^a-z\s]", " ", desc)
+    desc = _NON_ALPHA_RE.sub(" ", desc)
 
     # Remove extra spaces
-    desc = re.sub(r"\s+", " ", desc)
+    desc = _SPACES_RE.sub(" ", desc)
 
     return desc.strip()
 
 
+def _normalize_series(s: pd.Series) -> pd.Series:
+    """Vectorized normalize_description for an object Series of strings."""
+    return (
+        s.str.lower()
+        .str.replace(_HANDLE_STRIP_RE, " ", regex=True)
+        .str.replace(_NON_ALPHA_RE, " ", regex=True)
+        .str.replace(_SPACES_RE, " ", regex=True)
+        .str.strip()
+    )
+
+
 # ─────────────────────────────────────────────────────────────
 # EXISTING REGEX (kept, slightly improved)
 # ─────────────────────────────────────────────────────────────
@@ -55,18 +85,164 @@ def _extract_entity_name(description: str) -> str:
     return description
 
 
+def _extract_entity_series(s: pd.Series) -> pd.Series:
+    """Vectorized _extract_entity_name."""
+    return s.str.extract(_UPI_RE, expand=False).str.strip().fillna(s)
+
+
 # ─────────────────────────────────────────────────────────────
 # MERCHANT MAP MATCHING
 # ─────────────────────────────────────────────────────────────
 
+def _literal_anchors(pattern: str):
+    """
+    One literal substring per top-level branch that any match of the
+    branch must contain, e.g. r"burger\\s*king|bk" → ("burger", "bk").
+    Returns None when the pattern is too complex to analyse safely.
+    """
+    if any(ch in pattern for ch in "()[]{}^$+") or "\\|" in pattern:
+        return None
+
+    anchors = []
+    for branch in pattern.split("|"):
+        runs, cur, i = [], "", 0
+        while i < len(branch):
+            ch = branch[i]
+            if ch == "\\" and i + 1 < len(branch):
+                nxt = branch[i + 1]
+                i += 2
+                if nxt.isalnum():           # \s, \b, \d … are not literals
+                    runs.append(cur)
+                    cur = ""
+                else:                       # \. \- … are
+                    cur += nxt
+                continue
+            if ch in "*?":                  # preceding char is optional
+                runs.append(cur[:-1])
+                cur = ""
+            elif ch == ".":
+                runs.append(cur)
+                cur = ""
+            else:
+                cur += ch
+            i += 1
+        runs.append(cur)
+
+        best = max(runs, key=len)
+        if not best:
+            return None
+        anchors.append(best)
+
+    return tuple(dict.fromkeys(anchors))
+
+
+def _compile_merchant_map(merchant_map: dict) -> list:
+    """
+    Build the matcher table once: (anchors, compiled search, name, category)
+    in MERCHANT_MAP order. An empty-string anchor means "always confirm".
+    """
+    table = []
+    for pattern, (name, cat) in merchant_map.items():
+        anchors = _literal_anchors(pattern) or ("",)
+        table.append((anchors, re.compile(pattern).search, name, cat))
+    return table
+
+
+_MERCHANT_TABLE = _compile_merchant_map(MERCHANT_MAP)
+
+
 def _apply_merchant_map(text: str):
+    """
+    First MERCHANT_MAP entry whose pattern matches wins.
+    A cheap substring check on each pattern's literal anchors skips the
+    regex for entries that cannot possibly match.
+    """
     lower = text.lower()
-    for pattern, (name, cat) in MERCHANT_MAP.items():
-        if re.search(pattern, lower):
-            return name, cat
+    for anchors, search, name, cat in _MERCHANT_TABLE:
+        for anchor in anchors:
+            if anchor in lower:
+                if search(lower):
+                    return name, cat
+                break
     return None, None
 
 
+# ─────────────────────────────────────────────────────────────
+# FUZZY MERCHANT MATCHING (typos / truncations)
+# ─────────────────────────────────────────────────────────────
+
+def _fuzzy_targets(table: list) -> list:
+    """
+    Single-word brand names that are also a literal anchor of their own
+    pattern (Swiggy, BigBasket, Zerodha …). Generic entries such as
+    "Bill Payment", "Fuel" or the FUZZY_MATCH_GENERIC keywords (Salary,
+    Refund …) are left out so everyday words in a narration cannot
+    fuzzy-match them.
+    """
+    targets, seen = [], set()
+    for anchors, _, name, cat in table:
+        key = name.lower()
+        if (name.isalnum() and len(key) >= 4 and key in anchors
+                and key not in FUZZY_MATCH_GENERIC and key not in seen):
+            seen.add(key)
+            targets.append((key, name, cat))
+    return targets
+
+
+_FUZZY_TARGETS = _fuzzy_targets(_MERCHANT_TABLE)
+_FUZZY_INDEX   = TrigramIndex(key for key, _, _ in _FUZZY_TARGETS)
+
+
+def _one_edit(a: str, b: str) -> bool:
+    """True if `a` becomes `b` with at most one insertion, deletion, substitution or swap."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    return (a[i + 1:] == b[i + 1:] or a[i:] == b[i + 1:] or a[i + 1:] == b[i:]
+            or a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:])
+
+
+@lru_cache(maxsize=65_536)
+def _fuzzy_lookup(term: str):
+    # Trigram similarity finds the candidate; on short names a dropped
+    # letter costs most of the trigrams, so "swigy" and "rapid" both score
+    # ~0.77. Short names, and long ones below FUZZY_MATCH_THRESHOLD, are
+    # confirmed by edit distance instead, with ordinary words excluded.
+    if term in FUZZY_MATCH_STOPWORDS:
+        return None, 0.0
+    tid, score = _FUZZY_INDEX.best_match(term, FUZZY_MATCH_CANDIDATE)
+    if tid is None:
+        return None, 0.0
+    target = _FUZZY_INDEX.terms[tid]
+    if (len(target) > FUZZY_MATCH_SHORT_LEN and score >= FUZZY_MATCH_THRESHOLD) \
+            or _one_edit(term, target):
+        return tid, score
+    return None, 0.0
+
+
+def _fuzzy_merchant(clean_desc: str):
+    """
+    Best trigram match of any word, or adjacent word pair joined
+    ("big basket" → "bigbasket"), against the known brand names.
+    """
+    words = clean_desc.split()
+    terms = [w for w in words if len(w) >= 4]
+    terms += [a + b for a, b in zip(words, words[1:]) if len(a + b) >= 4]
+
+    best, best_score = None, 0.0
+    for term in terms[:FUZZY_MATCH_MAX_TERMS]:
+        tid, score = _fuzzy_lookup(term)
+        if tid is not None and (score > best_score or (score == best_score and tid < best)):
+            best, best_score = tid, score
+
+    if best is None:
+        return None, None
+    _, name, cat = _FUZZY_TARGETS[best]
+    return name, cat
+
+
 # ─────────────────────────────────────────────────────────────
 # NEW: Fallback keyword-based categorization
 # ─────────────────────────────────────────────────────────────
@@ -90,8 +266,40 @@ def fallback_category(desc: str):
 # MAIN FUNCTION
 # ─────────────────────────────────────────────────────────────
 
+def _is_blank(description) -> bool:
+    return not description or str(description).strip().lower() in ("", "nan", "-")
+
+
+def _resolve_unmatched(clean_desc: str, handle):
+    """Steps 4-7 for text the raw merchant-map pass did not match."""
+    # 4. Try merchant map again
+    name, cat = _apply_merchant_map(clean_desc)
+    if name:
+        return name, cat
+
+    # 5. Try UPI handle
+    if handle is not None:
+        name, cat = _apply_merchant_map(handle)
+        if name:
+            return name, cat
+
+    # 5b. Fuzzy match against known brand names
+    if FUZZY_MATCH_ENABLED and clean_desc:
+        name, cat = _fuzzy_merchant(clean_desc)
+        if name:
+            return name, cat
+
+    # 6. Fallback keyword categorization
+    fallback_cat = fallback_category(clean_desc)
+
+    # 7. Final fallback name
+    cleaned_name = clean_desc.title()[:40] if clean_desc else "Unknown"
+
+    return cleaned_name, fallback_cat
+
+
 def categorize_transaction(description: str):
-    if not description or str(description).strip().lower() in ("", "nan", "-"):
+    if _is_blank(description):
         return "Unknown", "Others"
 
     raw_desc = str(description).strip()
@@ -107,44 +315,156 @@ def categorize_transaction(description: str):
     # 3. Normalize (NEW STEP 🔥)
     clean_desc = normalize_description(entity)
 
-    # 4. Try merchant map again
-    name, cat = _apply_merchant_map(clean_desc)
-    if name:
-        return name, cat
-
-    # 5. Try UPI handle
     handle_match = _UPI_HANDLE_RE.search(raw_desc)
-    if handle_match:
-        handle = normalize_description(handle_match.group(1))
-        name, cat = _apply_merchant_map(handle)
+    handle = normalize_description(handle_match.group(1)) if handle_match else None
+
+    return _resolve_unmatched(clean_desc, handle)
+
+
+def categorize_unique(descriptions) -> tuple[list, list]:
+    """
+    Categorize a sequence of distinct descriptions.
+    Same results as categorize_transaction, but steps 2-3 and the handle
+    extraction run as pandas .str ops over everything step 1 missed.
+    Returns (merchants, categories) aligned with the input.
+    """
+    descriptions = list(descriptions)
+    merchants    = ["Unknown"] * len(descriptions)
+    categories   = ["Others"]  * len(descriptions)
+
+    # 1. Try full raw description
+    pending, pending_raw = [], []
+    for i, desc in enumerate(descriptions):
+        if _is_blank(desc):
+            continue
+        raw_desc  = str(desc).strip()
+        name, cat = _apply_merchant_map(raw_desc)
         if name:
-            return name, cat
+            merchants[i], categories[i] = name, cat
+        else:
+            pending.append(i)
+            pending_raw.append(raw_desc)
 
-    # 6. Fallback keyword categorization
-    fallback_cat = fallback_category(clean_desc)
+    if not pending:
+        return merchants, categories
 
-    # 7. Final fallback name
-    cleaned_name = clean_desc.title()[:40] if clean_desc else "Unknown"
+    # 2-3. Extract entity + normalize, vectorized.
+    # object dtype keeps Python `re` semantics for the .str regex calls.
+    raw     = pd.Series(pending_raw, dtype=object)
+    clean   = _normalize_series(_extract_entity_series(raw))
+    handles = raw.str.extract(_UPI_HANDLE_RE, expand=False)
+    handles = _normalize_series(handles).where(handles.notna(), None)
 
-    return cleaned_name, fallback_cat
+    # 4-7. Per-description merchant map + fallback
+    for i, clean_desc, handle in zip(pending, clean, handles):
+        merchants[i], categories[i] = _resolve_unmatched(clean_desc, handle)
+
+    return merchants, categories
 
 
 # ─────────────────────────────────────────────────────────────
 # APPLY FUNCTIONS
 # ─────────────────────────────────────────────────────────────
 
-def apply_categorization(df: pd.DataFrame) -> pd.DataFrame:
-    results = df["description"].apply(categorize_transaction)
-    df = df.copy()
-    df["merchant"] = results.apply(lambda x: x[0])
-    df["category"] = results.apply(lambda x: x[1])
-    return df
+def categorize_unique_parallel(descriptions, workers: int | None = None) -> tuple[list, list]:
+    """
+    categorize_unique across a process pool.
+    Contiguous chunks are mapped in order, so the output is identical to
+    the serial path. Workers import this module once and therefore
+    compile the merchant table once each.
+    """
+    descriptions = list(descriptions)
+    workers = workers or CATEGORIZATION_WORKERS or os.cpu_count() or 1
+    if workers < 2 or len(descriptions) < 2:
+        return categorize_unique(descriptions)
+
+    size   = -(-len(descriptions) // (workers * 4))
+    chunks = [descriptions[i:i + size] for i in range(0, len(descriptions), size)]
+
+    merchants, categories = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_m, chunk_c in pool.map(categorize_unique, chunks):
+            merchants.extend(chunk_m)
+            categories.extend(chunk_c)
+    return merchants, categories
+
+
+def rules_fingerprint() -> str:
+    """
+    Hash of everything that decides a categorization result: the maps and
+    tuneables, plus CATEGORIZER_VERSION for changes to the code itself.
+    """
+    rules = repr((
+        CATEGORIZER_VERSION, list(MERCHANT_MAP.items()), list(KEYWORDS.items()),
+        FUZZY_MATCH_ENABLED, FUZZY_MATCH_THRESHOLD, FUZZY_MATCH_CANDIDATE, FUZZY_MATCH_SHORT_LEN,
+        FUZZY_MATCH_MAX_TERMS, sorted(FUZZY_MATCH_GENERIC), sorted(FUZZY_MATCH_STOPWORDS),
+    ))
+    return hashlib.sha256(rules.encode("utf-8")).hexdigest()
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Process-wide CategoryCache from config, or None when disabled."""
+    global _default_cache
+    if not CATEGORY_CACHE_ENABLED:
+        return None
+    fingerprint = rules_fingerprint()
+    if _default_cache is None or _default_cache.fingerprint != fingerprint:
+        _default_cache = CategoryCache(
+            CATEGORY_CACHE_PATH, CATEGORY_CACHE_MAX_ENTRIES, fingerprint,
+        )
+    return _default_cache
+
+
+def categorization_columns(
+    df: pd.DataFrame,
+    cache: CategoryCache | None = None,
+    parallel: bool = False,
+) -> dict:
+    """
+    merchant / category columns for `df`. Each distinct description is
+    categorized once and the results are broadcast back to every row
+    through the factorized codes. Distinct descriptions are looked up
+    in the on-disk cache first; its hit / miss counts are in
+    cache.stats(). With parallel=True, ledgers of at least
+    PARALLEL_CATEGORIZATION_MIN_ROWS rows categorize their cache misses
+    across a process pool.
+    """
+    codes, uniques = pd.factorize(df["description"], use_na_sentinel=False)
+
+    if parallel and len(df) >= PARALLEL_CATEGORIZATION_MIN_ROWS:
+        compute = categorize_unique_parallel
+    else:
+        compute = categorize_unique
+
+    cache = cache or default_cache()
+    if cache is None:
+        merchants, categories = compute(uniques)
+    else:
+        merchants, categories = cache.categorize(uniques, compute)
+
+    return {
+        "merchant": broadcast_categorical(merchants, codes),
+        "category": broadcast_categorical(categories, codes),
+    }
+
+
+def apply_categorization(
+    df: pd.DataFrame,
+    cache: CategoryCache | None = None,
+    parallel: bool = False,
+) -> pd.DataFrame:
+    """Copy of `df` with merchant / category columns (see categorization_columns)."""
+    return df.assign(**categorization_columns(df, cache, parallel))
+
+
+def transaction_type_columns(df: pd.DataFrame) -> dict:
+    return {"transaction_type": pd.Categorical.from_codes(
+        df["is_credit"].astype("int8"), ["Expense", "Income"],
+    )}
 
 
 def assign_transaction_type(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["transaction_type"] = df["is_credit"].map({
-        True: "Income",
-        False: "Expense"
-    })
-    return df
\ No newline at end of file
+    return df.assign(**transaction_type_columns(df))
@@ -0,0 +1,167 @@
+"""
+utils/category_cache.py
+=======================
+Persistent description → (merchant, category) cache backed by SQLite.
+
+Entries are keyed by a 16-byte BLAKE2b hash of the raw description.
+The cache is capped at `max_entries` with least-recently-used eviction.
+It is wiped automatically when the rules fingerprint changes, i.e. when
+MERCHANT_MAP or the keyword table is edited.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+# Recency is only refreshed when older than this, so repeat uploads of
+# the same statement are read-only. LRU order is accurate to one hour.
+_TOUCH_RESOLUTION_NS = 3600 * 10**9
+
+
+def _key(description: str) -> bytes:
+    return hashlib.blake2b(
+        description.encode("utf-8", "surrogatepass"), digest_size=16,
+    ).digest()
+
+
+class CategoryCache:
+    """
+    Bulk look-up / store of categorization results.
+
+    hits / misses accumulate over the lifetime of the object; see stats().
+    """
+
+    def __init__(self, path: str, max_entries: int, fingerprint: str):
+        self.path        = path
+        self.max_entries = max_entries
+        self.fingerprint = fingerprint
+        self.hits        = 0
+        self.misses      = 0
+
+    # ── connection + invalidation ────────────────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS categories ("
+            " hash BLOB PRIMARY KEY, merchant TEXT, category TEXT, last_used INTEGER"
+            ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON categories(last_used)")
+
+        row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != self.fingerprint:
+            with conn:
+                conn.execute("DELETE FROM categories")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)",
+                    (self.fingerprint,),
+                )
+        return conn
+
+    # ── bulk API ─────────────────────────────────────────────────
+
+    def categorize(self, descriptions, compute) -> tuple[list, list]:
+        """
+        (merchants, categories) for `descriptions`, calling
+        compute(missing) -> (merchants, categories) only for cache misses.
+        Non-string values are never cached.
+        """
+        descriptions = list(descriptions)
+        merchants    = [None] * len(descriptions)
+        categories   = [None] * len(descriptions)
+
+        keyed = {i: _key(d) for i, d in enumerate(descriptions) if isinstance(d, str)}
+
+        try:
+            conn = self._connect()
+        except sqlite3.Error:
+            return compute(descriptions)
+
+        try:
+            found = self._lookup(conn, list(keyed.values()))
+
+            missing = []
+            for i in range(len(descriptions)):
+                hit = found.get(keyed.get(i))
+                if hit is None:
+                    missing.append(i)
+                else:
+                    merchants[i], categories[i] = hit
+
+            self.hits   += len(descriptions) - len(missing)
+            self.misses += len(missing)
+
+            if missing:
+                new_m, new_c = compute([descriptions[i] for i in missing])
+                for i, m, c in zip(missing, new_m, new_c):
+                    merchants[i], categories[i] = m, c
+
+            now = time.time_ns()
+            with conn:
+                self._touch(conn, now)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO categories VALUES (?, ?, ?, ?)",
+                    ((keyed[i], merchants[i], categories[i], now)
+                     for i in missing if i in keyed),
+                )
+                self._evict(conn)
+        except sqlite3.Error:
+            return compute(descriptions)
+        finally:
+            conn.close()
+
+        return merchants, categories
+
+    def _lookup(self, conn: sqlite3.Connection, keys: list) -> dict:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (hash BLOB PRIMARY KEY)")
+        conn.execute("DELETE FROM wanted")
+        conn.executemany("INSERT OR IGNORE INTO wanted VALUES (?)", ((k,) for k in keys))
+        rows = conn.execute(
+            "SELECT c.hash, c.merchant, c.category "
+            "FROM wanted w JOIN categories c ON c.hash = w.hash"
+        )
+        return {h: (merchant, category) for h, merchant, category in rows}
+
+    def _touch(self, conn: sqlite3.Connection, now: int):
+        """Refresh recency of everything looked up by the last _lookup."""
+        conn.execute(
+            "UPDATE categories SET last_used = ? "
+            "WHERE hash IN (SELECT hash FROM wanted) AND last_used < ?",
+            (now, now - _TOUCH_RESOLUTION_NS),
+        )
+
+    def _evict(self, conn: sqlite3.Connection):
+        excess = conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM categories WHERE hash IN "
+                "(SELECT hash FROM categories ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+
+    # ── reporting ────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits":     self.hits,
+            "misses":   self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM categories")
+        finally:
+            conn.close()
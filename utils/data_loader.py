@@ -4,6 +4,10 @@ utils/data_loader.py
 Clean and debuggable data loader for CSV, Excel, and PDF files.
 """
 
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 import pdfplumber
@@ -11,27 +15,113 @@ import re
 
 from config import (
     DATE_ALIASES, DESCRIPTION_ALIASES, AMOUNT_ALIASES,
-    DEBIT_ALIASES, CREDIT_ALIASES, BALANCE_ALIASES,
+    DEBIT_ALIASES, CREDIT_ALIASES, BALANCE_ALIASES, DATE_FORMATS,
+    CSV_CHUNK_ROWS, PDF_WORKERS, PDF_PARALLEL_MIN_PAGES, PDF_FAST_PARSER,
 )
+from utils.schema import compact
 
 
 # ─────────────────────────────────────────────────────────────
 # BASIC CLEANERS
 # ─────────────────────────────────────────────────────────────
 
+# Slow path for anything plain float() rejects: "(1,200)", "1,200 Dr",
+# "Rs.500", "1200-". Debit markers make the value negative.
+_AMOUNT_RE = re.compile(
+    r"^\s*(\()?\s*([-+])?\s*(?:₹|rs\.?|inr)?\s*(\d[\d,]*(?:\.\d*)?|\.\d+)"
+    r"\s*(-)?\s*(\))?\s*(dr|cr)?\.?\s*$",
+    re.IGNORECASE,
+)
+_AMOUNT_JUNK_RE = re.compile(r"[^0-9.\-]")
+
+
+def _parse_amount(text: str) -> float:
+    try:
+        return float(text.replace(",", "").replace("₹", ""))
+    except ValueError:
+        pass
+
+    match = _AMOUNT_RE.match(text)
+    if match:
+        opening, sign, digits, trailing, closing, suffix = match.groups()
+        value = float(digits.replace(",", ""))
+        if (opening and closing) or sign == "-" or trailing or (suffix or "").lower() == "dr":
+            value = -value
+        return value
+
+    try:
+        return float(_AMOUNT_JUNK_RE.sub("", text))
+    except ValueError:
+        return np.nan
+
+
 def clean_amount(series):
-    return (
-        series.astype(str)
-        .str.replace(r"[₹,\s]", "", regex=True)
-        .str.replace(r"\((.+?)\)", r"-\1", regex=True)
-        .str.replace(r"[^0-9.\-]", "", regex=True)
-        .replace("", np.nan)
-        .astype(float)
+    """Parse an amount column to float; each distinct string is parsed once."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype(float)
+
+    codes, uniques = pd.factorize(series)
+    values = np.fromiter(
+        (_parse_amount(str(u)) for u in np.asarray(uniques, dtype=object)),
+        dtype=float, count=len(uniques),
     )
+    # code -1 (missing) indexes the trailing NaN
+    return pd.Series(np.append(values, np.nan)[codes], index=series.index, name=series.name)
+
+
+_DATE_SAMPLE_SIZE = 500
+
+
+def infer_date_format(text: pd.Series):
+    """The DATE_FORMATS entry that parses most of a sample of `text`, or None."""
+    step   = max(1, len(text) // _DATE_SAMPLE_SIZE)
+    sample = text.iloc[::step][:_DATE_SAMPLE_SIZE]
+
+    best, best_ok = None, 0
+    for fmt in DATE_FORMATS:
+        ok = pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum()
+        if ok > best_ok:
+            best, best_ok = fmt, ok
+            if ok == len(sample):
+                break
+    return best
 
 
 def parse_date(series):
-    return pd.to_datetime(series, errors="coerce", dayfirst=True)
+    """
+    Statements repeat the same few thousand date strings, so each distinct
+    string is parsed once with a strict, inferred format. Strings that do
+    not fit it are tried against the other DATE_FORMATS, then fall back
+    to per-element day-first parsing.
+    """
+    if not (series.dtype == object or pd.api.types.is_string_dtype(series)) or series.empty:
+        return pd.to_datetime(series, errors="coerce", dayfirst=True)
+
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+
+    fmt = infer_date_format(text)
+    if fmt:
+        parsed = pd.to_datetime(text, format=fmt, errors="coerce")
+    else:
+        parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[us]")
+
+    for other in DATE_FORMATS:
+        failed = parsed.isna()
+        if not failed.any():
+            break
+        if other != fmt:
+            parsed[failed] = pd.to_datetime(text[failed], format=other, errors="coerce")
+
+    failed = parsed.isna()
+    if failed.any():
+        parsed[failed] = pd.to_datetime(
+            text[failed], errors="coerce", dayfirst=True, format="mixed",
+        )
+
+    # code -1 (missing) picks the trailing NaT
+    values = np.append(parsed.to_numpy(), np.datetime64("NaT"))
+    return pd.Series(values[codes], index=series.index, name=series.name)
 
 
 def normalize_col(name):
@@ -49,35 +139,116 @@ def find_column(cols, aliases):
     return None
 
 
+def detect_columns(cols):
+    """
+    Resolve the statement columns once from the (normalized) header.
+    Returns a dict with keys date/desc/amount/debit/credit/balance.
+    """
+    found = {
+        "date":    find_column(cols, DATE_ALIASES),
+        "desc":    find_column(cols, DESCRIPTION_ALIASES),
+        "amount":  find_column(cols, AMOUNT_ALIASES),
+        "debit":   find_column(cols, DEBIT_ALIASES),
+        "credit":  find_column(cols, CREDIT_ALIASES),
+        "balance": find_column(cols, BALANCE_ALIASES),
+    }
+
+    if not found["date"] or not found["desc"]:
+        raise ValueError("Missing required columns (date/description)")
+
+    if not (found["debit"] and found["credit"]) and not found["amount"]:
+        raise ValueError("No amount column found")
+
+    return found
+
+
 # ─────────────────────────────────────────────────────────────
 # CSV / EXCEL LOADER
 # ─────────────────────────────────────────────────────────────
 
+def _rewind(file):
+    if hasattr(file, "seek"):
+        file.seek(0)
+
+
+def project_columns(header):
+    """
+    Resolve the statement columns from a raw header.
+    Returns a dict with the detect_columns keys mapped to the original
+    (un-normalized) column names, or None where absent.
+    """
+    normalized = [normalize_col(c) for c in header]
+    found = detect_columns(normalized)
+    raw = {}
+    for key, col in found.items():
+        raw[key] = header[normalized.index(col)] if col else None
+    return raw
+
+
+def _usecols(header, fields):
+    wanted = {c for c in fields.values() if c is not None}
+    return [c for c in header if c in wanted]
+
+
+def _csv_projection(file):
+    """(usecols, dtype) for read_csv, from the header line alone."""
+    header = pd.read_csv(file, nrows=0).columns.tolist()
+    _rewind(file)
+    fields  = project_columns(header)
+    # Pin the narration (and the date, so 20240131-style dates are not
+    # read as integers) to text; amount columns keep read_csv's numeric
+    # dtype, which clean_amount takes without re-parsing.
+    return _usecols(header, fields), {fields["desc"]: str, fields["date"]: str}
+
+
+def _excel_projection(file):
+    """(sheet, usecols, dtype) for the first worksheet that looks like a statement."""
+    sheets = pd.read_excel(file, sheet_name=None, nrows=0)
+    _rewind(file)
+
+    first_error = None
+    for sheet, head in sheets.items():
+        header = head.columns.tolist()
+        try:
+            fields = project_columns(header)
+        except ValueError as exc:
+            first_error = first_error or exc
+            continue
+        if len(sheets) > 1:
+            print("Using sheet:", sheet)
+        # Excel cells are already typed; only pin the narration to text.
+        return sheet, _usecols(header, fields), {fields["desc"]: str}
+
+    raise first_error or ValueError("Workbook has no sheets")
+
+
 def load_tabular(file, name):
+    """Read only the statement columns of a CSV or Excel file."""
     if name.endswith(".csv"):
-        return pd.read_csv(file)
+        usecols, dtype = _csv_projection(file)
+        return pd.read_csv(file, usecols=usecols, dtype=dtype)
 
     elif name.endswith((".xlsx", ".xls")):
-        return pd.read_excel(file)
+        sheet, usecols, dtype = _excel_projection(file)
+        return pd.read_excel(file, sheet_name=sheet, usecols=usecols, dtype=dtype)
 
     else:
         raise ValueError("Unsupported file")
 
 
-def process_tabular(df):
+def process_tabular(df, columns=None):
     df.columns = [normalize_col(c) for c in df.columns]
 
-    print("Detected columns:", df.columns.tolist())
+    if columns is None:
+        print("Detected columns:", df.columns.tolist())
+        columns = detect_columns(df.columns)
 
-    date_col = find_column(df.columns, DATE_ALIASES)
-    desc_col = find_column(df.columns, DESCRIPTION_ALIASES)
-    amt_col = find_column(df.columns, AMOUNT_ALIASES)
-    debit_col = find_column(df.columns, DEBIT_ALIASES)
-    credit_col = find_column(df.columns, CREDIT_ALIASES)
-    bal_col = find_column(df.columns, BALANCE_ALIASES)
-
-    if not date_col or not desc_col:
-        raise ValueError("Missing required columns (date/description)")
+    date_col   = columns["date"]
+    desc_col   = columns["desc"]
+    amt_col    = columns["amount"]
+    debit_col  = columns["debit"]
+    credit_col = columns["credit"]
+    bal_col    = columns["balance"]
 
     result = pd.DataFrame()
 
@@ -92,36 +263,329 @@ def process_tabular(df):
         result["is_credit"] = credit > 0
         result["amount"] = credit.where(credit > 0, debit)
 
-    elif amt_col:
+    else:
         raw = clean_amount(df[amt_col])
         result["is_credit"] = raw > 0
         result["amount"] = raw.abs()
 
-    else:
-        raise ValueError("No amount column found")
-
     result["balance"] = clean_amount(df[bal_col]) if bal_col else np.nan
 
     return result
 
 
+# ─────────────────────────────────────────────────────────────
+# STREAMING CSV LOADER (bounded memory)
+# ─────────────────────────────────────────────────────────────
+
+class _SeenKeys:
+    """
+    Append-only set of uint64 row hashes stored as sorted numpy runs,
+    merged like a binary counter: 8 bytes per row, O(log n) runs.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        mask = np.zeros(len(keys), dtype=bool)
+        for run in self._runs:
+            idx = np.searchsorted(run, keys).clip(max=len(run) - 1)
+            mask |= run[idx] == keys
+        return mask
+
+    def add(self, keys: np.ndarray):
+        if not len(keys):
+            return
+        self._runs.append(np.unique(keys))
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            top = self._runs.pop()
+            self._runs[-1] = np.union1d(self._runs[-1], top)
+
+
+def iter_csv_chunks(file, chunksize=None):
+    """
+    Yield cleaned, de-duplicated chunks of a CSV statement.
+    Only the statement columns are read, detected once from the header;
+    rows duplicated in an earlier chunk (same date, description and amount) are dropped.
+    """
+    seen = _SeenKeys()
+    columns = None
+    usecols, dtype = _csv_projection(file)
+
+    for chunk in pd.read_csv(file, usecols=usecols, dtype=dtype,
+                             chunksize=chunksize or CSV_CHUNK_ROWS):
+        if columns is None:
+            chunk.columns = [normalize_col(c) for c in chunk.columns]
+            print("Detected columns:", chunk.columns.tolist())
+            columns = detect_columns(chunk.columns)
+
+        part = clean_rows(process_tabular(chunk, columns))
+
+        keys = pd.util.hash_pandas_object(
+            part[["date", "description", "amount"]], index=False,
+        ).to_numpy()
+        fresh = ~pd.Series(keys).duplicated().to_numpy() & ~seen.contains(keys)
+        seen.add(keys[fresh])
+
+        yield part[fresh]
+
+
+def load_csv_streaming(file, chunksize=None):
+    """Chunked CSV load; same result as finalize(process_tabular(read_csv))."""
+    parts = list(iter_csv_chunks(file, chunksize))
+    df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(
+        columns=["date", "description", "is_credit", "amount", "balance"],
+    )
+    del parts
+    return df.sort_values("date").reset_index(drop=True)
+
+
 # ─────────────────────────────────────────────────────────────
 # SIMPLE PDF LOADER (CLEAN VERSION)
 # ─────────────────────────────────────────────────────────────
 
-def load_pdf(file):
+def _read_bytes(file) -> bytes:
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as fh:
+            return fh.read()
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return file.read()
+
+
+def _extract_table_rows(page):
     rows = []
+    for table in page.extract_tables():
+        for row in table:
+            if len(row) < 3:
+                continue
+
+            rows.append(row)
+    return rows
 
-    with pdfplumber.open(file) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
 
-            for table in tables:
-                for row in table:
-                    if len(row) < 3:
-                        continue
+# ─────────────────────────────────────────────────────────────
+# FAST LINE-BASED PDF PARSER
+# One statement line = date, narration, amounts. Works from word
+# positions under the header instead of full table/ruling analysis.
+# ─────────────────────────────────────────────────────────────
+
+_PDF_DATE_RE = re.compile(
+    r"^(?:\d{1,2}[-/.\s](?:\d{1,2}|[A-Za-z]{3,9})[-/.\s]+['’]?\d{2,4}|\d{4}-\d{2}-\d{2})$"
+)
+_PDF_AMOUNT_RE = re.compile(
+    r"^[-+]?₹?\s*\(?[\d,]*\d(?:\.\d+)?\)?(?:\s*(?:cr|dr)\.?)?$", re.IGNORECASE,
+)
 
-                    rows.append(row)
+_LINE_TOLERANCE    = 3  # pt; words whose tops differ less share a line
+_HEADER_GAP        = 4  # pt; header words closer than this form one label
+_HEADER_SCAN_PAGES = 3  # leading pages searched for the header before a parallel split
+
+
+def _group_lines(words):
+    lines, current, top = [], [], None
+    for w in sorted(words, key=lambda w: (round(w["top"]), w["x0"])):
+        if top is not None and abs(w["top"] - top) > _LINE_TOLERANCE:
+            lines.append(sorted(current, key=lambda w: w["x0"]))
+            current = []
+        if not current:
+            top = w["top"]
+        current.append(w)
+    if current:
+        lines.append(sorted(current, key=lambda w: w["x0"]))
+    return lines
+
+
+def _header_layout(line):
+    """Column labels + x-extents if `line` is a statement header, else None."""
+    labels = []
+    for w in line:
+        if labels and w["x0"] - labels[-1]["x1"] < _HEADER_GAP:
+            labels[-1]["text"] += " " + w["text"]
+            labels[-1]["x1"] = w["x1"]
+        else:
+            labels.append({"text": w["text"], "x0": w["x0"], "x1": w["x1"]})
+
+    if len(labels) < 3:
+        return None
+    try:
+        found = detect_columns([normalize_col(lb["text"]) for lb in labels])
+    except ValueError:
+        return None
+
+    names = [normalize_col(lb["text"]) for lb in labels]
+    return {
+        "labels":  [lb["text"] for lb in labels],
+        "x0":      [lb["x0"] for lb in labels],
+        "date":    names.index(found["date"]),
+        "desc":    names.index(found["desc"]),
+        "amounts": [names.index(found[k]) for k in ("amount", "debit", "credit", "balance")
+                    if found[k]],
+    }
+
+
+def _assign_column(word, layout):
+    """
+    Column index for `word`. A column spans from its header's left edge
+    to the next header's. Text goes to the column its left edge falls
+    in; a number goes to the column it overlaps most, since amounts may
+    be right-aligned under left-aligned headers. None when a number
+    overlaps two amount columns, i.e. it cannot be attributed safely.
+    """
+    starts = [x0 - _HEADER_GAP for x0 in layout["x0"]]
+    if not _PDF_AMOUNT_RE.match(word["text"]):
+        col = 0
+        for i, start in enumerate(starts):
+            if word["x0"] >= start:
+                col = i
+        return col
+
+    ends    = starts[1:] + [float("inf")]
+    overlap = [max(0.0, min(word["x1"], end) - max(word["x0"], start))
+               for start, end in zip(starts, ends)]
+    if sum(overlap[i] > 0 for i in layout["amounts"]) > 1:
+        return None
+    return max(range(len(overlap)), key=overlap.__getitem__)
+
+
+def _parse_page_lines(page, layout):
+    """
+    (rows, layout) from the page text lines, or (None, layout) when the
+    page does not look like one-line-per-transaction text.
+    """
+    rows, data_rows = [], 0
+
+    for line in _group_lines(page.extract_words()):
+        header = _header_layout(line)
+        if header:
+            layout = header
+            rows.append(list(layout["labels"]))
+            continue
+        if layout is None:
+            continue                        # title text above the table
+
+        cells = [[] for _ in layout["labels"]]
+        for w in line:
+            col = _assign_column(w, layout)
+            if col is None:
+                return None, layout         # number straddles two amount columns
+            cells[col].append(w["text"])
+        cells = [" ".join(c) for c in cells]
+
+        has_amount = any(cells[i] for i in layout["amounts"])
+        if _PDF_DATE_RE.match(cells[layout["date"]]):
+            if not has_amount or any(
+                cells[i] and not _PDF_AMOUNT_RE.match(cells[i]) for i in layout["amounts"]
+            ):
+                return None, layout
+            rows.append(cells)
+            data_rows += 1
+        elif has_amount:
+            return None, layout             # amounts without a date → layout mismatch
+        elif data_rows and all(not c for i, c in enumerate(cells) if i != layout["desc"]):
+            rows[-1][layout["desc"]] += "\n" + cells[layout["desc"]]   # wrapped narration
+
+    if not data_rows:
+        return None, layout
+    return rows, layout
+
+
+def _extract_pages(pdf, page_numbers, layout=None):
+    """
+    Rows of the given pages plus a per-page report of the strategy used:
+    "text" for the fast line parser, "tables" for extract_tables. The
+    header `layout` carries over from page to page, so headerless
+    continuation pages parse under the last header seen; it is returned
+    third, to seed the next page range.
+    """
+    rows, report = [], []
+    for i in page_numbers:
+        page = pdf.pages[i]
+        page_rows = None
+        if PDF_FAST_PARSER:
+            page_rows, layout = _parse_page_lines(page, layout)
+
+        strategy = "text"
+        if page_rows is None:
+            strategy, page_rows = "tables", _extract_table_rows(page)
+
+        rows.extend(page_rows)
+        report.append({"page": i + 1, "strategy": strategy, "rows": len(page_rows)})
+    return rows, report, layout
+
+
+def _first_header(pdf, page_numbers):
+    """(page index, layout) of the first statement header on `page_numbers`, else (None, None)."""
+    if PDF_FAST_PARSER:
+        for i in page_numbers:
+            for line in _group_lines(pdf.pages[i].extract_words()):
+                layout = _header_layout(line)
+                if layout:
+                    return i, layout
+    return None, None
+
+
+# Set once per worker process by the pool initializer, so the PDF bytes
+# are shipped to each worker once rather than with every page range.
+_worker_pdf_bytes = None
+
+
+def _init_pdf_worker(data: bytes):
+    global _worker_pdf_bytes
+    _worker_pdf_bytes = data
+
+
+def _extract_page_range(bounds):
+    start, end, layout = bounds
+    with pdfplumber.open(io.BytesIO(_worker_pdf_bytes)) as pdf:
+        return _extract_pages(pdf, range(start, end), layout)
+
+
+def extract_pdf_rows(file, workers=None):
+    """
+    (rows, report) for every page, in page order; report holds one
+    {"page", "strategy", "rows"} dict per page.
+    Statements with at least PDF_PARALLEL_MIN_PAGES pages are split into
+    contiguous page ranges and extracted across a process pool; each
+    worker opens the PDF itself. Output is identical to the serial walk.
+
+    The header layout is found once up front and seeds every range after
+    it, so headerless continuation pages parse as they would serially.
+    A range whose seed turns out to differ from the layout the previous
+    range ended with (a new header mid-statement) is redone in order.
+    """
+    data = _read_bytes(file)
+
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        n_pages = len(pdf.pages)
+        workers = min(workers or PDF_WORKERS or os.cpu_count() or 1, n_pages)
+        if workers < 2 or n_pages < PDF_PARALLEL_MIN_PAGES:
+            return _extract_pages(pdf, range(n_pages))[:2]
+
+        step = -(-n_pages // (workers * 2))
+        first, layout = _first_header(pdf, range(min(step, _HEADER_SCAN_PAGES)))
+
+    ranges = [(i, min(i + step, n_pages), layout if first is not None and i > first else None)
+              for i in range(0, n_pages, step)]
+
+    rows, report, incoming = [], [], None
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_pdf_worker, initargs=(data,),
+    ) as pool:
+        for (start, end, seed), part in zip(ranges, pool.map(_extract_page_range, ranges)):
+            if seed != incoming:
+                with pdfplumber.open(io.BytesIO(data)) as pdf:
+                    part = _extract_pages(pdf, range(start, end), incoming)
+            part_rows, part_report, incoming = part
+            rows.extend(part_rows)
+            report.extend(part_report)
+    return rows, report
+
+
+def load_pdf(file, workers=None):
+    rows, report = extract_pdf_rows(file, workers)
+
+    print("PDF pages:", ", ".join(f"{r['page']}:{r['strategy']}" for r in report))
 
     if not rows:
         raise ValueError("Could not extract data from PDF")
@@ -139,23 +603,36 @@ def load_pdf(file):
 # FINAL CLEANING
 # ─────────────────────────────────────────────────────────────
 
-def finalize(df):
-    df = df.copy()
+def clean_rows(df):
+    """
+    Row-level cleaning of finalize (everything except dedup + sort).
+    Cleaned columns and the keep-mask are computed first, so surviving
+    rows are copied once.
+    """
+    date        = pd.to_datetime(df["date"], errors="coerce")
+    description = df["description"].str.strip()
+    amount      = pd.to_numeric(df["amount"], errors="coerce").abs()
 
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df = df.dropna(subset=["date"])
+    keep = date.notna() & (description != "") & (amount > 0)
 
-    df["description"] = df["description"].str.strip()
-    df = df[df["description"] != ""]
+    cleaned = {
+        "date": date, "description": description, "amount": amount,
+        "is_credit": df["is_credit"].astype(bool),
+    }
+    return pd.DataFrame({
+        col: cleaned[col][keep] if col in cleaned else df[col][keep]
+        for col in df.columns
+    })
 
-    df["amount"] = pd.to_numeric(df["amount"], errors="coerce").abs()
-    df = df[df["amount"] > 0]
 
-    df["is_credit"] = df["is_credit"].astype(bool)
+def finalize(df):
+    df = clean_rows(df)
 
-    df = df.drop_duplicates(subset=["date", "description", "amount"])
-    df = df.sort_values("date").reset_index(drop=True)
+    keep  = np.flatnonzero(~df.duplicated(subset=["date", "description", "amount"]).to_numpy())
+    order = keep[np.argsort(df["date"].to_numpy()[keep], kind="quicksort")]
 
+    df = df.take(order)
+    df.index = pd.RangeIndex(len(df))
     return df
 
 
@@ -163,17 +640,20 @@ def finalize(df):
 # MAIN FUNCTION
 # ─────────────────────────────────────────────────────────────
 
-def load_data(file):
+def load_data(file, pdf_workers=None):
     name = file.name.lower()
 
     if name.endswith(".pdf"):
-        df = load_pdf(file)
+        df = load_pdf(file, pdf_workers)
+
+    elif name.endswith(".csv"):
+        return compact(load_csv_streaming(file))
 
-    elif name.endswith((".csv", ".xlsx", ".xls")):
+    elif name.endswith((".xlsx", ".xls")):
         raw = load_tabular(file, name)
         df = process_tabular(raw)
 
     else:
         raise ValueError("Unsupported file format")
 
-    return finalize(df)
\ No newline at end of file
+    return compact(finalize(df))
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+utils/duckdb_backend.py
+=======================
+Optional DuckDB engine for the ledger-wide aggregations.
+
+With ANALYTICS_BACKEND = "duckdb" the monthly cube and the summary
+helpers in utils/aggregator.py run as SQL over the pipeline DataFrame,
+registered with DuckDB rather than copied. Results come back in the same
+columns, order and dtypes as the pandas path. Without the duckdb package
+everything stays on pandas.
+"""
+
+import pandas as pd
+
+from config import ANALYTICS_BACKEND, ANALYTICS_DB_PATH
+from utils.schema import compact
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+_TYPES = ["Expense", "Income"]
+
+
+def enabled() -> bool:
+    return ANALYTICS_BACKEND == "duckdb" and duckdb is not None
+
+
+def _query(df: pd.DataFrame, sql: str) -> pd.DataFrame:
+    con = duckdb.connect(ANALYTICS_DB_PATH)
+    try:
+        con.register("ledger", df)
+        return con.execute(sql).df()
+    finally:
+        con.close()
+
+
+def _flag_sum(df: pd.DataFrame, col: str) -> str:
+    return f"SUM(CAST({col} AS INTEGER))::BIGINT" if col in df.columns else "0::BIGINT"
+
+
+# ─────────────────────────────────────────────────────────────
+# QUERIES
+# ─────────────────────────────────────────────────────────────
+# Categorical columns are registered as ENUMs: they group and sort by
+# category code like pandas' groupby, and come back as Categoricals with the
+# original categories, so no per-row text is built on either side.
+
+def _select(df: pd.DataFrame, keys: list[str], aggregates: str, where: str,
+            order: str | None = None, limit: int | None = None) -> pd.DataFrame:
+    ym    = "year_month" if "year_month" in df.columns else "strftime(date, '%Y-%m')"
+    cols  = ", ".join(f"{ym} AS year_month" if k == "year_month" else k for k in keys)
+    nulls = [f"{k} IS NOT NULL" for k in keys if k != "year_month"]
+    out = _query(df, f"""
+        SELECT {cols}, {aggregates}
+        FROM ledger
+        WHERE {" AND ".join(filter(None, [where] + nulls)) or "TRUE"}
+        GROUP BY ALL
+        ORDER BY {order or ", ".join(keys)}
+        {f"LIMIT {int(limit)}" if limit is not None else ""}
+    """)
+    # ENUMs come back as ordered Categoricals; keys keep the input column's dtype
+    for k in keys:
+        if k in df.columns and isinstance(df[k].dtype, pd.CategoricalDtype):
+            out[k] = out[k].astype(df[k].dtype)
+    return compact(out)
+
+
+def cube(df: pd.DataFrame) -> pd.DataFrame:
+    """build_cube() as one GROUP BY; year / month_number are added by the caller."""
+    return _select(df, ["year_month", "transaction_type", "category", "merchant"], f"""
+        SUM(amount) AS amount, COUNT(amount) AS count,
+        MIN(amount) AS min,    MAX(amount)   AS max,
+        {_flag_sum(df, "is_large")}   AS large,
+        {_flag_sum(df, "is_anomaly")} AS anomalies
+    """, where="")
+
+
+def _or_placeholder(out: pd.DataFrame) -> pd.DataFrame:
+    # the pandas path answers "no expenses" with an untyped empty frame
+    return out if not out.empty else pd.DataFrame(columns=out.columns)
+
+
+def monthly_category_summary(df: pd.DataFrame) -> pd.DataFrame:
+    return _or_placeholder(_select(df, ["year_month", "category"], "SUM(amount) AS amount",
+                                   where="transaction_type = 'Expense'"))
+
+
+def merchant_summary(df: pd.DataFrame, top_n: int) -> pd.DataFrame:
+    return _or_placeholder(_select(df, ["merchant"], "SUM(amount) AS amount",
+                                   where="transaction_type = 'Expense'",
+                                   order="amount DESC, merchant", limit=top_n))
+
+
+def monthly_cashflow(df: pd.DataFrame) -> pd.DataFrame:
+    out = _select(df, ["year_month"], """
+        COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'Expense'), 0) AS Expense,
+        COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'Income'),  0) AS Income,
+        COUNT(*) FILTER (WHERE transaction_type = 'Expense') AS n_expense,
+        COUNT(*) FILTER (WHERE transaction_type = 'Income')  AS n_income
+    """, where="transaction_type IS NOT NULL")
+    # pandas' unstack lists the observed types first, the filled-in one
+    # after, as integer zeros
+    seen = [t for t, n in zip(_TYPES, ["n_expense", "n_income"]) if out[n].any()]
+    out  = out[["year_month"] + seen].assign(**{t: 0 for t in _TYPES if t not in seen})
+    out["Savings"] = out["Income"] - out["Expense"]
+    out.columns.name = "transaction_type"
+    return out
@@ -8,14 +8,17 @@ import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from config import FORECAST_PERIODS, CONFIDENCE_MULTIPLIER
+from utils.aggregator import build_cube, expense_cells
 
 
 # ─────────────────────────────────────────────────────────────
 # BUILD MONTHLY SERIES
 # ─────────────────────────────────────────────────────────────
 
-def build_monthly_series(df, category=None):
-    data = df[df["transaction_type"] == "Expense"].copy()
+def build_monthly_series(df, category=None, cube=None):
+    if cube is None:
+        cube = build_cube(df)
+    data = expense_cells(cube)
 
     if category:
         data = data[data["category"] == category]
@@ -66,12 +69,12 @@ def get_future_months(last_year, last_month, periods):
 # MAIN FORECAST FUNCTION
 # ─────────────────────────────────────────────────────────────
 
-def forecast_next_months(df, periods=None, category=None):
+def forecast_next_months(df, periods=None, category=None, cube=None):
 
     if periods is None:
         periods = FORECAST_PERIODS
 
-    monthly = build_monthly_series(df, category)
+    monthly = build_monthly_series(df, category, cube=cube)
 
     if len(monthly) < 2:
         return None
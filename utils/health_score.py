@@ -19,15 +19,20 @@ from config import (
     MAX_ANOMALY_PENALTY,
     MAX_CONCENTRATION_PENALTY,
 )
+from utils.aggregator import build_cube, expense_cells, type_total, category_totals
 
 
-def calculate_financial_health_score(df: pd.DataFrame) -> tuple[int, dict]:
+def calculate_financial_health_score(df: pd.DataFrame | None,
+                                     cube: pd.DataFrame | None = None) -> tuple[int, dict]:
     """
     Returns (score: int, breakdown: dict).
     score is clamped to [0, 100].
+    Reads the monthly aggregate cube (built from df when not given).
     """
-    income  = df[df["transaction_type"] == "Income"]["amount"].sum()
-    expense = df[df["transaction_type"] == "Expense"]["amount"].sum()
+    if cube is None:
+        cube = build_cube(df)
+    income  = type_total(cube, "Income")
+    expense = type_total(cube, "Expense")
 
     if income == 0:
         return 0, {"note": "No income detected — score cannot be computed."}
@@ -40,18 +45,18 @@ def calculate_financial_health_score(df: pd.DataFrame) -> tuple[int, dict]:
     )
 
     # ── large transaction penalty ─────────────────────────────────
-    expense_txns = df[df["transaction_type"] == "Expense"]
-    n_expense    = len(expense_txns)
-    large_ratio  = df.get("is_large", pd.Series(False, index=df.index)).sum() / n_expense if n_expense else 0
+    expense_cube = expense_cells(cube)
+    n_expense    = int(expense_cube["count"].sum())
+    large_ratio  = cube["large"].sum() / n_expense if n_expense else 0
     large_penalty= min(MAX_LARGE_TXN_PENALTY, large_ratio * MAX_LARGE_TXN_PENALTY)
 
     # ── anomaly penalty ───────────────────────────────────────────
-    anomaly_ratio  = df.get("is_anomaly", pd.Series(False, index=df.index)).sum() / n_expense if n_expense else 0
+    anomaly_ratio  = cube["anomalies"].sum() / n_expense if n_expense else 0
     anomaly_penalty= min(MAX_ANOMALY_PENALTY, anomaly_ratio * MAX_ANOMALY_PENALTY)
 
     # ── concentration penalty ─────────────────────────────────────
-    if expense > 0 and not expense_txns.empty:
-        top_ratio = expense_txns.groupby("category")["amount"].sum().max() / expense
+    if expense > 0 and not expense_cube.empty:
+        top_ratio = category_totals(cube).iloc[0] / expense
     else:
         top_ratio = 0
     concentration_penalty = min(MAX_CONCENTRATION_PENALTY, top_ratio * MAX_CONCENTRATION_PENALTY)
@@ -70,14 +75,17 @@ def calculate_financial_health_score(df: pd.DataFrame) -> tuple[int, dict]:
     return final_score, breakdown
 
 
-def monthly_health_trend(df: pd.DataFrame) -> pd.DataFrame:
+def monthly_health_trend(df: pd.DataFrame | None,
+                         cube: pd.DataFrame | None = None) -> pd.DataFrame:
     """
     Compute the health score for each calendar month in the dataset.
     Anomaly / large flags are taken from the already-computed dataset-wide columns.
     """
+    if cube is None:
+        cube = build_cube(df)
     records = []
-    for (year, month), group in df.groupby(["year", "month_number"]):
-        score, _ = calculate_financial_health_score(group)
+    for (year, month), group in cube.groupby(["year", "month_number"]):
+        score, _ = calculate_financial_health_score(None, cube=group)
         records.append({
             "year":       year,
             "month":      month,
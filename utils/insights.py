@@ -8,6 +8,8 @@ import pandas as pd
 import numpy as np
 import random
 
+from utils.aggregator import build_cube, expense_cells, type_total, category_totals, DateIndex
+
 
 # ─────────────────────────────────────────────────────────────
 # HELPERS (to avoid robotic repetition)
@@ -21,12 +23,18 @@ def pick(options):
 # MAIN FUNCTION
 # ─────────────────────────────────────────────────────────────
 
-def generate_insights(df: pd.DataFrame):
+def generate_insights(df: pd.DataFrame | None, cube: pd.DataFrame | None = None,
+                      date_index: DateIndex | None = None):
 
     insights = []
 
-    income = df[df["transaction_type"] == "Income"]["amount"].sum()
-    expense = df[df["transaction_type"] == "Expense"]["amount"].sum()
+    if cube is None:
+        cube = build_cube(df)
+    if date_index is None and df is not None:
+        date_index = DateIndex(df)
+
+    income = type_total(cube, "Income")
+    expense = type_total(cube, "Expense")
 
     if income == 0:
         return ["No income detected. Upload a complete statement for better analysis."]
@@ -76,11 +84,11 @@ def generate_insights(df: pd.DataFrame):
     # CATEGORY ANALYSIS
     # ─────────────────────────────────────────────────────────
 
-    expense_df = df[df["transaction_type"] == "Expense"]
+    expense_df = expense_cells(cube)
 
     if not expense_df.empty:
 
-        cat_totals = expense_df.groupby("category")["amount"].sum().sort_values(ascending=False)
+        cat_totals = category_totals(cube)
 
         top_cat = cat_totals.index[0]
         top_pct = cat_totals.iloc[0] / expense * 100
@@ -104,7 +112,7 @@ def generate_insights(df: pd.DataFrame):
 
     if not expense_df.empty:
 
-        merch = expense_df.groupby("merchant")["amount"].sum().sort_values(ascending=False)
+        merch = expense_df.groupby("merchant", observed=True)["amount"].sum().sort_values(ascending=False)
 
         top_merch = merch.index[0]
         top_amt = merch.iloc[0]
@@ -121,28 +129,26 @@ def generate_insights(df: pd.DataFrame):
     # ANOMALY + LARGE TRANSACTIONS
     # ─────────────────────────────────────────────────────────
 
-    if "is_anomaly" in df.columns:
-        count = int(df["is_anomaly"].sum())
-        if count > 0:
-            insights.append(
-                f"{count} unusual transactions detected. Worth a quick check."
-            )
+    count = int(cube["anomalies"].sum())
+    if count > 0:
+        insights.append(
+            f"{count} unusual transactions detected. Worth a quick check."
+        )
 
-    if "is_large" in df.columns:
-        count = int(df["is_large"].sum())
-        if count > 0:
-            insights.append(
-                f"{count} large transactions spotted — these may be one-time or high-impact expenses."
-            )
+    count = int(cube["large"].sum())
+    if count > 0:
+        insights.append(
+            f"{count} large transactions spotted — these may be one-time or high-impact expenses."
+        )
 
 
     # ─────────────────────────────────────────────────────────
     # SPENDING TREND
     # ─────────────────────────────────────────────────────────
 
-    if "year_month" in df.columns:
+    if not cube.empty:
 
-        monthly = df.groupby(["year_month", "transaction_type"])["amount"].sum().unstack(fill_value=0)
+        monthly = cube.groupby(["year_month", "transaction_type"], observed=True)["amount"].sum().unstack(fill_value=0)
 
         if len(monthly) >= 3 and "Expense" in monthly.columns:
 
@@ -154,6 +160,20 @@ def generate_insights(df: pd.DataFrame):
                     "Your spending has increased noticeably in recent months. Keep an eye on this trend."
                 )
 
+    if date_index is not None and len(date_index.days):
+
+        last = date_index.days[-1]
+
+        if date_index.days[0] <= last - 59:
+
+            recent = date_index.range_total(last - 29, last)
+            before = date_index.range_total(last - 59, last - 30)
+
+            if before > 0 and recent > before * 1.2:
+                insights.append(
+                    f"You spent ₹{recent:,.0f} in the last 30 days — {(recent / before - 1) * 100:.0f}% more than the 30 days before."
+                )
+
 
     # ─────────────────────────────────────────────────────────
     # INVESTMENT CHECK
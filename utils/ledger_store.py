@@ -0,0 +1,261 @@
+"""
+utils/ledger_store.py
+=====================
+Persistent transaction history for incremental (append) mode.
+
+The ledger is a directory of immutable Parquet parts, one per append,
+holding enriched rows (category, type, time features, is_anomaly) plus
+their row fingerprint. Appending a statement enriches and scores only
+the rows whose fingerprint is not stored yet and writes them as a new
+part, so a monthly update costs about one statement's worth of work.
+
+Anomaly flags come from a model saved per ledger (utils/model_store):
+new rows are only scored against it. When a refit is due, the refitted
+model rescores the whole history.
+
+is_large depends on the mean/std of the whole history, so it is not
+stored; callers recompute it on the returned ledger in one vectorized
+pass. Parts written under another schema version or categorization
+rules are re-enriched from their raw columns on load and rewritten.
+
+Reading, appending and clearing hold a lock file in the ledger
+directory, so two sessions never pick the same part number or rewrite
+the same parts at once. The directory also holds the ledger's random
+identity, which keys its saved model.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    LEDGER_STORE_DIR, LEDGER_SCHEMA_VERSION, LEDGER_LOCK_TIMEOUT, LEDGER_LOCK_STALE,
+    ANOMALY_PARTIAL_FIT_ROWS,
+)
+from utils.anomaly_detector import fit_anomaly_model, feature_drift
+from utils.categorizer import rules_fingerprint
+from utils.model_store import model_key, load_model, save_model, clear_model, refit_due
+from utils.multi_loader import row_fingerprint
+from utils.pipeline import enrich, flag_anomalies
+from utils.schema import compact
+
+_RAW_COLUMNS = ["date", "description", "is_credit", "amount", "balance", "source"]
+_PART_RE     = re.compile(r"^part-(\d{6})\.v(\d+)\.([0-9a-f]{12})\.parquet$")
+_LOCK_NAME   = "ledger.lock"
+_ID_NAME     = "ledger.id"
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _locked():
+    """
+    Hold the ledger's lock file for the duration of the block. Waits up
+    to LEDGER_LOCK_TIMEOUT seconds for another session, then raises
+    TimeoutError. A lock older than LEDGER_LOCK_STALE is taken over.
+    """
+    os.makedirs(LEDGER_STORE_DIR, exist_ok=True)
+    path     = os.path.join(LEDGER_STORE_DIR, _LOCK_NAME)
+    deadline = time.monotonic() + LEDGER_LOCK_TIMEOUT
+    while True:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > LEDGER_LOCK_STALE:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue                      # released while we looked
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"ledger is locked by another session ({path})")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.remove(path)
+
+
+def _rules_tag() -> str:
+    return rules_fingerprint()[:12]
+
+
+def _ledger_id() -> str:
+    """This ledger's identity, created with the first call after a clear."""
+    path = os.path.join(LEDGER_STORE_DIR, _ID_NAME)
+    try:
+        with open(path) as fh:
+            return fh.read().strip()
+    except FileNotFoundError:
+        ledger_id = uuid.uuid4().hex
+        with open(path, "w") as fh:
+            fh.write(ledger_id)
+        return ledger_id
+
+
+def _list_parts():
+    """[(seq, up_to_date, path)] in append order."""
+    try:
+        names = os.listdir(LEDGER_STORE_DIR)
+    except OSError:
+        return []
+
+    tag, parts = _rules_tag(), []
+    for name in names:
+        match = _PART_RE.match(name)
+        if match:
+            seq, version, rules = match.groups()
+            current = int(version) == LEDGER_SCHEMA_VERSION and rules == tag
+            parts.append((int(seq), current, os.path.join(LEDGER_STORE_DIR, name)))
+    return sorted(parts)
+
+
+def _write_part(seq: int, df: pd.DataFrame):
+    """Write part `seq` atomically under the current schema and rules."""
+    os.makedirs(LEDGER_STORE_DIR, exist_ok=True)
+    name = f"part-{seq:06d}.v{LEDGER_SCHEMA_VERSION}.{_rules_tag()}.parquet"
+    fd, tmp = tempfile.mkstemp(dir=LEDGER_STORE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, os.path.join(LEDGER_STORE_DIR, name))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return os.path.join(LEDGER_STORE_DIR, name)
+
+
+def _rewrite(ledger: pd.DataFrame, spans):
+    """Rewrite the parts covering `spans` [(seq, start, stop)] from `ledger`."""
+    paths = {seq: path for seq, _, path in _list_parts()}
+    for seq, start, stop in spans:
+        written = _write_part(seq, ledger.iloc[start:stop])
+        if paths.get(seq, written) != written:
+            os.remove(paths[seq])
+
+
+def _score(ledger: pd.DataFrame, rows: np.ndarray) -> bool:
+    """
+    is_anomaly for `rows` from the saved model. When a refit is due the
+    whole ledger is rescored and True is returned, so callers rewrite
+    every part.
+    """
+    key   = model_key(_ledger_id())
+    state = load_model(key)
+    n_exp = int((ledger["transaction_type"] == "Expense").sum())
+
+    reason = "no saved model" if state is None else \
+        refit_due(state, n_exp, feature_drift(state, ledger, rows))
+    if reason:
+        logger.info("Anomaly model: refitting (%s)", reason)
+        state = fit_anomaly_model(ledger, ANOMALY_PARTIAL_FIT_ROWS)
+        if state is not None:
+            save_model(key, state)
+    flag_anomalies(ledger, rows=None if reason else rows, state=state, copy=False)
+    return bool(reason)
+
+
+def _load_parts():
+    """
+    Stored rows in append order (with fingerprint), refreshing stale
+    parts, plus each part's (seq, start, stop) row span. (None, []) when
+    nothing is stored.
+    """
+    parts = _list_parts()
+    if not parts:
+        return None, []
+
+    frames, stale = [], []
+    for seq, current, path in parts:
+        df = pd.read_parquet(path)
+        if not current:
+            raw = df[[c for c in _RAW_COLUMNS if c in df.columns]]
+            df  = enrich(raw).assign(fingerprint=df["fingerprint"].to_numpy())
+            stale.append(len(frames))
+        frames.append(df)
+
+    offsets = np.concatenate([[0], np.cumsum([len(f) for f in frames])])
+    spans   = [(seq, offsets[i], offsets[i + 1]) for i, (seq, _, _) in enumerate(parts)]
+    ledger  = compact(pd.concat(frames, ignore_index=True))
+
+    if stale:
+        logger.info("Ledger: re-enriching %d part(s) written under older rules", len(stale))
+        rows = np.zeros(len(ledger), dtype=bool)
+        for i in stale:
+            rows[spans[i][1]:spans[i][2]] = True
+        refit = _score(ledger, rows)
+        _rewrite(ledger, spans if refit else [spans[i] for i in stale])
+
+    return ledger, spans
+
+
+def _finish(ledger: pd.DataFrame) -> pd.DataFrame:
+    return (ledger.drop(columns="fingerprint")
+            .sort_values("date", kind="stable")
+            .reset_index(drop=True))
+
+
+def load_ledger():
+    """The stored history sorted by date, or None when nothing is stored."""
+    with _locked():
+        ledger, _ = _load_parts()
+    return None if ledger is None else _finish(ledger)
+
+
+def append_to_ledger(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add a parsed statement (load_data output) to the stored history and
+    return the whole ledger. Rows already stored, by fingerprint, are
+    skipped; only the rest are enriched and scored for anomalies.
+    """
+    with _locked():
+        return _append(df)
+
+
+def _append(df: pd.DataFrame) -> pd.DataFrame:
+    history, spans = _load_parts()
+    keys    = row_fingerprint(df) if len(df) else np.empty(0, dtype=np.uint64)
+    known   = history["fingerprint"].to_numpy() if history is not None else keys[:0]
+    fresh   = ~pd.Series(keys).isin(known).to_numpy()
+
+    logger.info("Ledger: %d new rows, %d already stored", int(fresh.sum()), int((~fresh).sum()))
+    if not fresh.any():
+        return flag_anomalies(enrich(df), copy=False) if history is None else _finish(history)
+
+    new    = enrich(df[fresh]).assign(fingerprint=keys[fresh])
+    base   = 0 if history is None else len(history)
+    ledger = compact(pd.concat([history, new], ignore_index=True)) if base else new.reset_index(drop=True)
+
+    refit = _score(ledger, np.arange(len(ledger)) >= base)
+
+    seq = max((s for s, _, _ in _list_parts()), default=0) + 1
+    try:
+        _write_part(seq, ledger.iloc[base:])
+        if refit:
+            _rewrite(ledger, spans)
+    except (OSError, ImportError, ValueError) as exc:
+        logger.warning("Ledger: could not save new rows (%s)", exc)
+
+    return _finish(ledger)
+
+
+def ledger_version() -> tuple:
+    """Names of the stored parts; changes whenever the ledger does."""
+    return tuple(os.path.basename(path) for _, _, path in _list_parts())
+
+
+def clear_ledger():
+    """Delete every stored part, the ledger's anomaly model and its identity."""
+    with _locked():
+        for _, _, path in _list_parts():
+            os.remove(path)
+        clear_model(model_key(_ledger_id()))
+        os.remove(os.path.join(LEDGER_STORE_DIR, _ID_NAME))
@@ -0,0 +1,86 @@
+"""
+utils/model_store.py
+====================
+Fitted anomaly models saved per ledger.
+
+Each file holds the IsolationForest together with the feature mean/std
+it was trained under (see anomaly_detector.fit_anomaly_model), so new
+transactions are scored against the same model and the same scale as
+the history. refit_due() says when a saved model should be replaced:
+on a schedule, once the ledger has outgrown it, or when new rows drift.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+import sklearn
+
+from config import (
+    ANOMALY_MODEL_DIR, ANOMALY_MODEL_VERSION,
+    ANOMALY_REFIT_DAYS, ANOMALY_REFIT_GROWTH, ANOMALY_DRIFT_THRESHOLD,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def model_key(ledger_id: str) -> str:
+    """
+    Store key for the ledger with identity `ledger_id` (ledger_store keeps
+    it in the ledger directory), so a moved or copied ledger keeps its
+    model and a cleared one does not inherit it.
+    """
+    return hashlib.sha256(ledger_id.encode()).hexdigest()[:16]
+
+
+def _path(key: str) -> str:
+    return os.path.join(ANOMALY_MODEL_DIR, f"anomaly-{key}.pkl")
+
+
+def load_model(key: str) -> dict | None:
+    """The saved state for `key`, or None if missing, unreadable or from another version."""
+    try:
+        with open(_path(key), "rb") as fh:
+            saved = pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if saved.get("version") != (ANOMALY_MODEL_VERSION, sklearn.__version__):
+        return None
+    return saved["state"]
+
+
+def save_model(key: str, state: dict):
+    """Write `state` atomically; a failed write leaves the previous model in place."""
+    try:
+        os.makedirs(ANOMALY_MODEL_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=ANOMALY_MODEL_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump({"version": (ANOMALY_MODEL_VERSION, sklearn.__version__),
+                             "state": state}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, _path(key))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    except OSError as exc:
+        logger.warning("Anomaly model: could not save (%s)", exc)
+
+
+def clear_model(key: str):
+    if os.path.exists(_path(key)):
+        os.remove(_path(key))
+
+
+def refit_due(state: dict, n_expenses: int, drift: float) -> str | None:
+    """Why `state` should be refitted, or None to keep scoring with it."""
+    age = pd.Timestamp.now() - pd.Timestamp(state["fitted_at"])
+    if age > pd.Timedelta(days=ANOMALY_REFIT_DAYS):
+        return f"model is {age.days} days old"
+    if n_expenses > ANOMALY_REFIT_GROWTH * state["n_expenses"]:
+        return f"ledger grew from {state['n_expenses']} to {n_expenses} expenses"
+    if drift > ANOMALY_DRIFT_THRESHOLD:
+        return f"new rows drifted {drift:.2f} std from the fit"
+    return None
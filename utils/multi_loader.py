@@ -0,0 +1,100 @@
+"""
+utils/multi_loader.py
+=====================
+Load several statements at once and merge them into one ledger.
+
+Files are parsed concurrently, one load_data call per file in a process
+pool, so a batch of monthly PDFs takes about as long as the slowest one.
+Inside that pool each PDF's pages are extracted serially, so the page
+pool is not nested under it. Each row is tagged with its `source` file.
+Transactions that an earlier file already contributed (overlapping
+statement periods) are dropped using a hash index of row fingerprints.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from config import INGEST_WORKERS
+from utils.data_loader import load_data
+from utils.schema import compact
+from utils.statement_cache import load_data_cached
+
+
+def row_fingerprint(df: pd.DataFrame) -> np.ndarray:
+    """
+    uint64 hash of (date, direction, amount in paise, normalized narration).
+    Narrations are compared lower-cased with punctuation and runs of
+    whitespace collapsed, so reformatted exports of the same row match.
+    """
+    narration = (
+        df["description"].astype(str).str.lower()
+        .str.replace(r"[^a-z0-9]+", " ", regex=True)
+        .str.strip()
+    )
+    key = pd.DataFrame({
+        "date":      df["date"].dt.normalize(),
+        "is_credit": df["is_credit"].astype(bool),
+        "paise":     (df["amount"] * 100).round().astype("int64"),
+        "narration": narration,
+    })
+    return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+
+def _load_one(item):
+    file_bytes, file_name, use_cache, pdf_workers = item
+    try:
+        if use_cache:
+            return load_data_cached(file_bytes, file_name, pdf_workers)
+        fake_file      = io.BytesIO(file_bytes)
+        fake_file.name = file_name
+        return load_data(fake_file, pdf_workers)
+    except ValueError as exc:
+        raise ValueError(f"{file_name}: {exc}") from exc
+
+
+def merge_statements(frames, names):
+    """
+    Concatenate per-file ledgers in order, tagging each with `source`.
+    Rows whose fingerprint appeared in an earlier file are dropped;
+    repeats within one file are kept (they are separate transactions).
+    """
+    seen  = np.empty(0, dtype=np.uint64)
+    parts = []
+
+    for df, name in zip(frames, names):
+        if df.empty:
+            continue
+        keys  = row_fingerprint(df)
+        fresh = ~np.isin(keys, seen)
+        seen  = np.union1d(seen, keys)
+        parts.append(df[fresh].assign(source=name))
+
+    if not parts:
+        return compact(frames[0].assign(source=pd.Series(dtype=object)))
+    merged = pd.concat(parts, ignore_index=True)
+    return compact(merged.sort_values("date", kind="stable").reset_index(drop=True))
+
+
+def load_statements(files, workers=None, use_cache=True) -> pd.DataFrame:
+    """
+    Parse [(file_bytes, file_name), ...] concurrently and merge them.
+    A ValueError from any file is re-raised prefixed with its name.
+    """
+    files = list(files)
+    if not files:
+        raise ValueError("No files uploaded")
+
+    workers = min(workers or INGEST_WORKERS or os.cpu_count() or 1, len(files))
+
+    if workers <= 1:
+        frames = [_load_one((data, name, use_cache, None)) for data, name in files]
+    else:
+        items = [(data, name, use_cache, 1) for data, name in files]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_load_one, items))
+
+    return merge_statements(frames, [name for _, name in files])
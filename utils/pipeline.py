@@ -0,0 +1,58 @@
+"""
+utils/pipeline.py
+=================
+Copy-free driver for the row-level pipeline stages.
+
+apply_categorization, add_time_features, detect_anomalies and friends
+never modify their input, so chaining them copies the ledger once per
+stage. Here each stage's *_columns helper returns only the columns it
+adds, and they are attached to a single frame the pipeline owns.
+"""
+
+import pandas as pd
+
+from utils.categorizer import categorization_columns, transaction_type_columns
+from utils.aggregator import time_feature_columns
+from utils.anomaly_detector import anomaly_columns, large_transaction_columns
+
+
+def _attach(df: pd.DataFrame, columns: dict):
+    for name, values in columns.items():
+        df[name] = values
+
+
+def enrich(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    """Row-local stages: categorize, type, time features."""
+    if copy:
+        df = df.copy()
+    _attach(df, categorization_columns(df))
+    _attach(df, transaction_type_columns(df))
+    _attach(df, time_feature_columns(df))
+    return df
+
+
+def flag_anomalies(df: pd.DataFrame, rows=None, state: dict | None = None,
+                   copy: bool = True) -> pd.DataFrame:
+    if copy:
+        df = df.copy()
+    _attach(df, anomaly_columns(df, rows, state))
+    return df
+
+
+def flag_large(df: pd.DataFrame, copy: bool = True):
+    """`df` with is_large, plus the threshold used."""
+    if copy:
+        df = df.copy()
+    columns, threshold = large_transaction_columns(df)
+    _attach(df, columns)
+    return df, threshold
+
+
+def run_stages(df: pd.DataFrame):
+    """
+    Every row-level stage on `df` in place; the caller hands over
+    ownership (e.g. a freshly loaded ledger). Returns (df, threshold).
+    """
+    enrich(df, copy=False)
+    flag_anomalies(df, copy=False)
+    return flag_large(df, copy=False)
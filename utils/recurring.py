@@ -32,7 +32,7 @@ def detect_recurring(df: pd.DataFrame) -> pd.DataFrame:
 
     records = []
 
-    for merchant, group in expenses.groupby("merchant"):
+    for merchant, group in expenses.groupby("merchant", observed=True):
         if len(group) < RECURRING_MIN_OCCURRENCES:
             continue
 
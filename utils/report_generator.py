@@ -15,6 +15,8 @@ from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable,
 )
 
+from utils.aggregator import build_cube, expense_cells, type_total, category_totals
+
 # ── colour palette ────────────────────────────────────────────────────────────
 BLUE     = colors.HexColor("#2563EB")
 DARK     = colors.HexColor("#111827")
@@ -83,6 +85,7 @@ def generate_pdf_report(
     score: int,
     breakdown: dict,
     insights: list[str],
+    cube=None,
 ) -> io.BytesIO:
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
@@ -94,8 +97,10 @@ def generate_pdf_report(
     s     = _make_styles()
     elems = []
 
-    income   = df[df["transaction_type"] == "Income"]["amount"].sum()
-    expense  = df[df["transaction_type"] == "Expense"]["amount"].sum()
+    if cube is None:
+        cube = build_cube(df)
+    income   = type_total(cube, "Income")
+    expense  = type_total(cube, "Expense")
     savings  = income - expense
     sav_pct  = savings / income * 100 if income else 0
 
@@ -130,14 +135,10 @@ def generate_pdf_report(
     elems.append(Spacer(1, 0.3*cm))
 
     # ── Expenses by category ───────────────────────────────────────
-    expense_df = df[df["transaction_type"] == "Expense"]
+    expense_df = expense_cells(cube)
     if not expense_df.empty:
         elems.append(Paragraph("Expenses by Category", s["h2"]))
-        cat_totals = (
-            expense_df.groupby("category")["amount"].sum()
-            .sort_values(ascending=False)
-            .reset_index()
-        )
+        cat_totals = category_totals(cube).reset_index()
         cat_data = [["Category", "Amount (₹)", "% of Spend"]] + [
             [
                 r["category"],
@@ -155,7 +156,7 @@ def generate_pdf_report(
     if not expense_df.empty:
         elems.append(Paragraph("Top 10 Merchants by Spend", s["h2"]))
         top_merch = (
-            expense_df.groupby("merchant")["amount"].sum()
+            expense_df.groupby("merchant", observed=True)["amount"].sum()
             .sort_values(ascending=False)
             .head(10)
             .reset_index()
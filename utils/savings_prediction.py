@@ -8,11 +8,13 @@ import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from config import FORECAST_PERIODS, CONFIDENCE_MULTIPLIER
+from utils.aggregator import build_cube
 
 
 def predict_savings(
-    df: pd.DataFrame,
+    df: pd.DataFrame | None,
     periods: int | None = None,
+    cube: pd.DataFrame | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame] | None:
     """
     Returns (historical_df, forecast_df) or None if insufficient data.
@@ -22,9 +24,11 @@ def predict_savings(
     """
     if periods is None:
         periods = FORECAST_PERIODS
+    if cube is None:
+        cube = build_cube(df)
 
     pivot = (
-        df.groupby(["year", "month_number", "transaction_type"])["amount"]
+        cube.groupby(["year", "month_number", "transaction_type"], observed=True)["amount"]
         .sum()
         .unstack(fill_value=0)
         .reset_index()
@@ -0,0 +1,50 @@
+"""
+utils/schema.py
+===============
+Compact dtype layout of the pipeline DataFrame.
+
+Low-cardinality strings are pandas Categoricals, calendar fields are
+narrow ints and flags are real booleans. compact() is applied once to
+the loaded ledger; every stage that adds one of these columns builds it
+in this layout directly, so the frame stays compact through the utils.
+"""
+
+import numpy as np
+import pandas as pd
+
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December"]
+DAY_NAMES   = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+CATEGORY_COLUMNS = ["merchant", "category", "transaction_type", "year_month", "source"]
+ORDERED_COLUMNS  = {"month_name": MONTH_NAMES, "day_of_week": DAY_NAMES}
+INT_COLUMNS      = {"year": "int16", "month_number": "int8", "week": "int8", "day": "int8"}
+BOOL_COLUMNS     = ["is_credit", "is_large", "is_anomaly"]
+
+
+def broadcast_categorical(values, codes: np.ndarray) -> pd.Categorical:
+    """Per-distinct `values` spread to rows through factorize `codes`, as a Categorical."""
+    distinct = pd.Categorical(values)
+    return pd.Categorical.from_codes(distinct.codes[codes], distinct.categories)
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert whichever known columns `df` has to the compact layout, in place."""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = pd.Categorical(df[col])
+
+    for col, names in ORDERED_COLUMNS.items():
+        dtype = pd.CategoricalDtype(names, ordered=True)
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+
+    for col, dtype in INT_COLUMNS.items():
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+
+    for col in BOOL_COLUMNS:
+        if col in df.columns and df[col].dtype != bool:
+            df[col] = df[col].fillna(False).astype(bool)
+
+    return df
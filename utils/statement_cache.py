@@ -0,0 +1,102 @@
+"""
+utils/statement_cache.py
+========================
+Content-addressed on-disk cache of parsed statements.
+
+The output of load_data is stored as Parquet under the SHA-256 of the
+uploaded bytes, so a repeat upload, even from another session or
+process, skips PDF/CSV parsing entirely. The directory is kept under
+STATEMENT_CACHE_MAX_BYTES by evicting least-recently-used snapshots.
+Bumping STATEMENT_CACHE_SCHEMA_VERSION orphans (and purges) old ones.
+The app only uses it when "Keep history" is on; otherwise uploads stay
+in the session.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+
+import pandas as pd
+from config import (
+    STATEMENT_CACHE_ENABLED, STATEMENT_CACHE_DIR,
+    STATEMENT_CACHE_MAX_BYTES, STATEMENT_CACHE_SCHEMA_VERSION,
+)
+from utils.data_loader import load_data
+
+_SUFFIX = f".v{STATEMENT_CACHE_SCHEMA_VERSION}.parquet"
+
+
+def content_key(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(STATEMENT_CACHE_DIR, key + _SUFFIX)
+
+
+def get(key: str):
+    """Cached DataFrame for `key`, or None. A hit refreshes its recency."""
+    path = _path(key)
+    try:
+        df = pd.read_parquet(path)
+        os.utime(path)
+        return df
+    except (OSError, ImportError, ValueError):
+        return None
+
+
+def put(key: str, df: pd.DataFrame):
+    """Store `df` atomically, then enforce the disk quota."""
+    try:
+        os.makedirs(STATEMENT_CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=STATEMENT_CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        try:
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, _path(key))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        evict()
+    except (OSError, ImportError, ValueError):
+        pass
+
+
+def evict(max_bytes: int | None = None):
+    """Drop other-schema snapshots, then LRU snapshots beyond the quota."""
+    max_bytes = STATEMENT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    entries = []
+    for entry in os.scandir(STATEMENT_CACHE_DIR):
+        if not entry.name.endswith(".parquet"):
+            continue
+        if not entry.name.endswith(_SUFFIX):
+            os.remove(entry.path)
+            continue
+        st = entry.stat()
+        entries.append((st.st_mtime, st.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+
+
+def load_data_cached(file_bytes: bytes, file_name: str, pdf_workers=None) -> pd.DataFrame:
+    """load_data on the uploaded bytes, served from the snapshot cache when possible."""
+    key = content_key(file_bytes) if STATEMENT_CACHE_ENABLED else None
+    if key:
+        df = get(key)
+        if df is not None:
+            return df
+
+    fake_file      = io.BytesIO(file_bytes)
+    fake_file.name = file_name
+    df = load_data(fake_file, pdf_workers)
+
+    if key:
+        put(key, df)
+    return df
@@ -0,0 +1,51 @@
+"""
+utils/trigram_index.py
+======================
+Character-trigram inverted index for fuzzy look-up of short terms.
+
+Similarity is the Dice coefficient over padded trigram sets:
+    2 · |A ∩ B| / (|A| + |B|)
+"""
+
+from collections import defaultdict
+
+MAX_QUERY_CHARS = 32   # bounds the trigrams (and posting scans) per query
+
+
+def trigrams(term: str) -> frozenset:
+    padded = f"  {term} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """Immutable index over `terms`; look-ups return the term's position."""
+
+    def __init__(self, terms):
+        self.terms     = list(terms)
+        self._grams    = [trigrams(t) for t in self.terms]
+        self._postings = defaultdict(list)
+        for tid, grams in enumerate(self._grams):
+            for g in grams:
+                self._postings[g].append(tid)
+
+    def best_match(self, query: str, threshold: float):
+        """
+        (term_id, score) of the most similar term with score ≥ threshold,
+        or (None, 0.0). Ties go to the lower term_id.
+        """
+        q = trigrams(query[:MAX_QUERY_CHARS])
+
+        shared = defaultdict(int)
+        for g in q:
+            for tid in self._postings.get(g, ()):
+                shared[tid] += 1
+
+        best, best_score = None, 0.0
+        for tid, n in shared.items():
+            score = 2 * n / (len(q) + len(self._grams[tid]))
+            if score > best_score or (score == best_score and tid < best):
+                best, best_score = tid, score
+
+        if best is None or best_score < threshold:
+            return None, 0.0
+        return best, best_score